@@ -0,0 +1,356 @@
+"""
+address_parser.py — Offline normalisation of Indian postal addresses.
+
+  - Gazetteer: data/pincode_prefixes.tsv (three-digit sorting-district prefix
+    → district → state) plus two-digit postal circles for the state, loaded
+    once into sorted arrays and searched with bisect.
+  - Tokenizer: splits an address into comma/newline parts and tags each as
+    door number, street, locality, district, state or pincode.
+  - Confidence: how much of district/state/pincode was established, and
+    whether the sources agree. Parts that could not be tagged lower it a
+    little; a part that reads like conversation ("yes", "my name is",
+    "please hurry") lowers it below the floor, so the reply goes to the LLM
+    extractor, which strips such text. Callers use the LLM only below
+    ADDRESS_PARSE_MIN_CONFIDENCE.
+
+Parsing is deterministic — the same input always gives the same result.
+"""
+
+import os
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from typing import List, NamedTuple, Optional
+
+
+ADDRESS_PARSE_MIN_CONFIDENCE = float(os.getenv("ADDRESS_PARSE_MIN_CONFIDENCE", "0.6"))
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "pincode_prefixes.tsv")
+
+# First two digits of the pincode → state (postal circle). Prefixes that are
+# split between states are left out; the three-digit table covers the common ones.
+PIN_CIRCLES = {
+    11: "Delhi", 12: "Haryana", 13: "Haryana", 14: "Punjab", 15: "Punjab",
+    17: "Himachal Pradesh", 18: "Jammu and Kashmir", 19: "Jammu and Kashmir",
+    20: "Uttar Pradesh", 21: "Uttar Pradesh", 22: "Uttar Pradesh", 23: "Uttar Pradesh",
+    27: "Uttar Pradesh", 28: "Uttar Pradesh",
+    30: "Rajasthan", 31: "Rajasthan", 32: "Rajasthan", 33: "Rajasthan", 34: "Rajasthan",
+    36: "Gujarat", 37: "Gujarat", 38: "Gujarat", 39: "Gujarat",
+    41: "Maharashtra", 42: "Maharashtra", 43: "Maharashtra", 44: "Maharashtra",
+    45: "Madhya Pradesh", 46: "Madhya Pradesh", 47: "Madhya Pradesh", 48: "Madhya Pradesh",
+    49: "Chhattisgarh", 50: "Telangana",
+    51: "Andhra Pradesh", 52: "Andhra Pradesh", 53: "Andhra Pradesh",
+    56: "Karnataka", 57: "Karnataka", 58: "Karnataka", 59: "Karnataka",
+    60: "Tamil Nadu", 61: "Tamil Nadu", 62: "Tamil Nadu", 63: "Tamil Nadu", 64: "Tamil Nadu",
+    67: "Kerala", 68: "Kerala", 69: "Kerala",
+    70: "West Bengal", 71: "West Bengal", 72: "West Bengal",
+    75: "Odisha", 76: "Odisha", 77: "Odisha", 78: "Assam",
+    80: "Bihar", 84: "Bihar", 85: "Bihar",
+}
+
+STATE_ALIASES = {
+    "tn": "Tamil Nadu", "tamilnadu": "Tamil Nadu", "ka": "Karnataka", "kl": "Kerala",
+    "ap": "Andhra Pradesh", "ts": "Telangana", "tg": "Telangana", "mh": "Maharashtra",
+    "gj": "Gujarat", "wb": "West Bengal", "up": "Uttar Pradesh", "mp": "Madhya Pradesh",
+    "ncr": "Delhi", "new delhi": "Delhi", "orissa": "Odisha", "pondicherry": "Puducherry",
+    "puducherry": "Puducherry",
+}
+
+# Common / older names → district as spelled in the gazetteer.
+DISTRICT_ALIASES = {
+    "madras": "Chennai", "bangalore": "Bengaluru", "bengaluru urban": "Bengaluru",
+    "mysore": "Mysuru", "mangalore": "Dakshina Kannada", "mangaluru": "Dakshina Kannada",
+    "trichy": "Tiruchirappalli", "tiruchi": "Tiruchirappalli", "kovai": "Coimbatore",
+    "tuticorin": "Thoothukudi", "ooty": "Nilgiris", "the nilgiris": "Nilgiris",
+    "kanyakumari": "Kanniyakumari", "nagercoil": "Kanniyakumari", "tanjore": "Thanjavur",
+    "calicut": "Kozhikode", "cochin": "Ernakulam", "kochi": "Ernakulam",
+    "trivandrum": "Thiruvananthapuram", "quilon": "Kollam", "alleppey": "Alappuzha",
+    "bombay": "Mumbai", "poona": "Pune", "vizag": "Visakhapatnam", "vijayawada": "Krishna",
+    "tirupati": "Chittoor", "secunderabad": "Hyderabad", "calcutta": "Kolkata",
+    "gurgaon": "Gurugram", "belgaum": "Belagavi", "gulbarga": "Kalaburagi",
+    "bellary": "Ballari", "shimoga": "Shivamogga", "tumkur": "Tumakuru", "bijapur": "Vijayapura",
+    "hubli": "Dharwad", "allahabad": "Prayagraj", "banaras": "Varanasi", "bhubaneswar": "Khordha",
+    "guwahati": "Kamrup Metropolitan", "delhi": "New Delhi",
+}
+
+STREET_WORDS   = {"street", "st", "road", "rd", "salai", "main", "cross", "lane", "avenue", "ave",
+                  "veedhi", "theru", "marg", "gali", "highway", "extension", "extn"}
+LOCALITY_WORDS = {"nagar", "colony", "layout", "puram", "palayam", "pet", "pettai", "halli",
+                  "wadi", "pally", "palli", "patti", "kuppam", "sector", "block", "phase",
+                  "village", "town", "taluk", "post", "near", "opp", "opposite", "behind"}
+# Words that do not occur in addresses but do in replies around one.
+CHATTER_WORDS  = {"i", "im", "me", "my", "mine", "we", "our", "you", "your", "am", "is", "are", "was",
+                  "name", "live", "living", "stay", "staying", "reside", "address", "please", "pls",
+                  "kindly", "hurry", "urgent", "help", "thanks", "thank", "yes", "yeah", "sure", "ok",
+                  "okay", "sir", "madam", "hello", "hi"}
+
+_PINCODE_RE  = re.compile(r"(?<!\d)([1-9]\d{2})\s?(\d{3})(?!\d)")
+_DOOR_RE     = re.compile(r"^(?:(?:door|house|flat|plot|h)\.?\s*(?:no\.?)?|no\.?|#)?\s*\d+[A-Za-z]?(?:\s*/\s*\d+[A-Za-z]?)*$",
+                          re.IGNORECASE)
+_FILLER_RE   = re.compile(r"^\s*(?:my\s+(?:full\s+|residential\s+)*address\s+is|i\s+(?:live|stay|reside)\s+(?:at|in)"
+                          r"|address\s*[:\-]|it\s+is|this\s+is)\s*[:\-]?\s*", re.IGNORECASE)
+_SPLIT_RE    = re.compile(r"[,\n;]+")
+_WORDS_RE    = re.compile(r"[a-z0-9]+")
+_TRAILING_RE = re.compile(r"[\s,\-–—.]+$")
+
+
+# ============================================================
+# GAZETTEER
+# ============================================================
+
+class _Gazetteer:
+    """Array-backed pincode prefix index, loaded once per process."""
+
+    def __init__(self, path: str):
+        prefixes, districts, states = [], [], []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip() or line.startswith("#"):
+                    continue
+                prefix, district, state = line.rstrip("\n").split("\t")
+                prefixes.append(int(prefix))
+                districts.append(sys.intern(district))
+                states.append(sys.intern(state))
+
+        order           = sorted(range(len(prefixes)), key=prefixes.__getitem__)
+        self.prefixes   = array("H", (prefixes[i] for i in order))
+        self.districts  = tuple(districts[i] for i in order)
+        self.states     = tuple(states[i] for i in order)
+
+        self.district_state = {}
+        for d, s in zip(self.districts, self.states):
+            self.district_state.setdefault(d.lower(), (d, s))
+        for alias, d in DISTRICT_ALIASES.items():
+            if d.lower() in self.district_state:
+                self.district_state.setdefault(alias, self.district_state[d.lower()])
+
+        self.state_names = {s.lower(): s for s in set(self.states) | set(PIN_CIRCLES.values())}
+        self.state_names.update(STATE_ALIASES)
+
+    def lookup_pincode(self, pincode: str):
+        """(district, state) for a six-digit pincode; either may be ''."""
+        prefix = int(pincode[:3])
+        i      = bisect_left(self.prefixes, prefix)
+        if i < len(self.prefixes) and self.prefixes[i] == prefix:
+            return self.districts[i], self.states[i]
+        return "", PIN_CIRCLES.get(int(pincode[:2]), "")
+
+
+_gazetteer: Optional[_Gazetteer] = None
+
+
+def gazetteer() -> _Gazetteer:
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = _Gazetteer(GAZETTEER_PATH)
+    return _gazetteer
+
+
+# ============================================================
+# TOKENIZER
+# ============================================================
+
+class Part(NamedTuple):
+    text: str
+    kind: str       # door | street | locality | district | state | pincode | other
+
+
+class ParsedAddress(NamedTuple):
+    address:    str             # cleaned full address (filler stripped)
+    parts:      List[Part]
+    district:   str
+    state:      str
+    pincode:    str
+    confidence: float
+
+
+def _words(text: str) -> List[str]:
+    return _WORDS_RE.findall(text.lower())
+
+
+def _match_name(words: List[str], names: dict) -> str:
+    """Longest run of words (up to three) that is a known name, or ''."""
+    for size in (3, 2, 1):
+        for i in range(len(words) - size + 1):
+            key = " ".join(words[i:i + size])
+            if key in names:
+                return key
+    return ""
+
+
+def tokenize(address: str) -> List[Part]:
+    g     = gazetteer()
+    parts = []
+    for raw in _SPLIT_RE.split(address):
+        text = raw.strip().rstrip(".")
+        if not text:
+            continue
+        pin = _PINCODE_RE.search(text)
+        if pin:
+            rest = (text[:pin.start()] + text[pin.end():]).strip(" -")
+            if rest:
+                parts.extend(tokenize(rest))
+            parts.append(Part(pin.group(1) + pin.group(2), "pincode"))
+            continue
+
+        words = _words(text)
+        if _DOOR_RE.match(text):
+            kind = "door"
+        elif " ".join(words) in g.state_names:
+            kind = "state"
+        elif " ".join(words) in g.district_state:
+            kind = "district"
+        elif any(w in STREET_WORDS for w in words):
+            kind = "street"
+        elif any(w in LOCALITY_WORDS or w.endswith(tuple(LOCALITY_WORDS)) for w in words):
+            kind = "locality"
+        elif _match_name(words, g.state_names) and len(words) <= 3:
+            kind = "state"
+        else:
+            kind = "other"
+        parts.append(Part(text, kind))
+    return parts
+
+
+# ============================================================
+# PARSER
+# ============================================================
+
+def clean_address(text: str) -> str:
+    text = _FILLER_RE.sub("", text or "").strip()
+    return _TRAILING_RE.sub("", text).strip()
+
+
+def parse_address(text: str) -> ParsedAddress:
+    g       = gazetteer()
+    address = clean_address(text)
+    parts   = tokenize(address)
+
+    pincode = next((p.text for p in parts if p.kind == "pincode"), "")
+    pin_district, pin_state = g.lookup_pincode(pincode) if pincode else ("", "")
+
+    # District / state named in the text — last match wins (they usually come
+    # last) — and, for the score, untagged parts and conversational ones.
+    text_district = text_state = ""
+    untagged = 0
+    chatter  = False
+    for p in parts:
+        words   = _words(p.text)
+        chatter = chatter or not CHATTER_WORDS.isdisjoint(words)
+        named   = False
+        if p.kind in ("district", "other", "locality", "state"):
+            key   = _match_name(words, g.district_state)
+            named = bool(key)
+            if key and p.kind != "state":
+                text_district = g.district_state[key][0]
+        if p.kind in ("state", "other"):
+            key   = _match_name(words, g.state_names)
+            named = named or bool(key)
+            if key:
+                text_state = g.state_names[key]
+        untagged += p.kind == "other" and not named
+    # A trailing "Chennai 600040" or "Salem, TN" may share a part with another tag.
+    if not text_state:
+        key = _match_name(_words(address), g.state_names)
+        if key and len(key) > 2:
+            text_state = g.state_names[key]
+
+    district = text_district or pin_district
+    state    = text_state or (g.district_state[district.lower()][1] if text_district else "") or pin_state
+
+    confidence = 0.0
+    if pincode and (pin_district or pin_state):
+        confidence += 0.45
+    if text_district:
+        confidence += 0.35
+    elif pin_district:
+        confidence += 0.25
+    if text_state:
+        confidence += 0.2
+    elif state:
+        confidence += 0.2 if text_district else 0.15
+    if any(p.kind in ("door", "street") for p in parts):
+        confidence += 0.05
+    # Text around the address: untagged parts cost a little (village names
+    # are untagged too); conversation caps the score well below the floor.
+    confidence -= 0.1 * untagged
+    if chatter:
+        confidence = min(confidence, 0.3)
+    # Disagreement between the pincode and the place named in the text.
+    named_state = text_state or (g.district_state[text_district.lower()][1] if text_district else "")
+    if pin_state and named_state and pin_state != named_state:
+        confidence -= 0.5
+
+    return ParsedAddress(
+        address=address, parts=parts, district=district, state=state, pincode=pincode,
+        confidence=round(max(0.0, min(1.0, confidence)), 3),
+    )
+
+
+# ============================================================
+# HELPERS FOR DOCUMENT ASSEMBLY
+# ============================================================
+
+def split_address_lines(raw_addr: str) -> List[str]:
+    """Comma/newline separated address → display lines.
+
+    A standalone door number is kept on the same line as the next part, so
+    "7, Mariamman Koil Street" renders as one line, and a pincode is joined
+    to the part before it ("Salem - 636001")."""
+    if not raw_addr:
+        return []
+    raw_parts = [p.strip().rstrip(",").strip() for p in _SPLIT_RE.split(raw_addr)]
+    raw_parts = [p for p in raw_parts if p]
+    lines = []
+    i = 0
+    while i < len(raw_parts):
+        part = raw_parts[i]
+        if _DOOR_RE.match(part) and i + 1 < len(raw_parts):
+            lines.append(f"{part}, {raw_parts[i + 1]}")
+            i += 2
+            continue
+        if _PINCODE_RE.fullmatch(part) and lines:
+            lines[-1] = f"{lines[-1]} - {part}"
+        else:
+            lines.append(part)
+        i += 1
+    return lines
+
+
+def _norm(s: str) -> str:
+    return re.sub(r"[\s,\-–—.]+", "", s.lower())
+
+
+def address_mentions(address: str, value: str) -> bool:
+    """True when value (a district, state or pincode) already appears in address.
+
+    Pincodes compare on digits, names compare on whole words with known
+    aliases resolved — so "Bangalore" covers district "Bengaluru", but
+    "Salem" is not found inside "Salemnagar"."""
+    if not value or not address:
+        return True
+    digits = re.sub(r"\D", "", value)
+    if digits and len(digits) == len(_norm(value)):
+        return digits in re.sub(r"\D", "", address)
+
+    g        = gazetteer()
+    words    = _words(address)
+    target   = _words(value)
+    if not target:
+        return _norm(value) in _norm(address)
+    n = len(target)
+    if any(words[i:i + n] == target for i in range(len(words) - n + 1)):
+        return True
+
+    canonical = {v[0].lower() for k, v in g.district_state.items() if k == " ".join(target)}
+    canonical |= {g.state_names[" ".join(target)].lower()} if " ".join(target) in g.state_names else set()
+    for size in (3, 2, 1):
+        for i in range(len(words) - size + 1):
+            key = " ".join(words[i:i + size])
+            if key in g.district_state and g.district_state[key][0].lower() in canonical:
+                return True
+            if key in g.state_names and g.state_names[key].lower() in canonical:
+                return True
+    # Multi-word names may be written without spaces ("Anna Nagar" vs "Annanagar").
+    return n > 1 and _norm(value) in _norm(address)
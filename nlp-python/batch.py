@@ -0,0 +1,83 @@
+"""
+batch.py — Bulk intake: run many scripted conversations through process_message.
+
+Each conversation is a thread_id plus the user messages to send, in order.
+Turns within a conversation run sequentially (each depends on the previous
+state); conversations run concurrently up to a limit. Results are yielded as
+soon as each turn finishes, followed by one summary record with throughput in
+conversations and turns per minute.
+
+  BATCH_MAX_CONCURRENCY    upper bound on conversations in flight per request (default 16)
+  BATCH_MAX_CONVERSATIONS  conversations accepted per request (default 1000)
+"""
+
+import os
+import time
+import asyncio
+from typing import AsyncIterator, Dict, List
+
+from graph import process_message
+
+
+BATCH_MAX_CONCURRENCY   = int(os.getenv("BATCH_MAX_CONCURRENCY", "16"))
+BATCH_MAX_CONVERSATIONS = int(os.getenv("BATCH_MAX_CONVERSATIONS", "1000"))
+
+_DONE = object()
+
+
+async def run_batch(conversations: List[Dict], concurrency: int = BATCH_MAX_CONCURRENCY
+                    ) -> AsyncIterator[dict]:
+    """Yield {"thread_id", "turn", "latency_s", "result"} per turn, {"thread_id", "turn",
+    "error"} when a conversation fails (its remaining turns are skipped), then
+    {"summary": {...}}."""
+    concurrency = max(1, min(concurrency, BATCH_MAX_CONCURRENCY))
+    queue       = asyncio.Queue()
+    sem         = asyncio.Semaphore(concurrency)
+    start       = time.perf_counter()
+
+    async def one(conv: Dict):
+        thread_id = conv["thread_id"]
+        async with sem:
+            for turn, message in enumerate(conv["messages"], 1):
+                t0 = time.perf_counter()
+                try:
+                    result = await process_message(thread_id, message)
+                except Exception as e:
+                    await queue.put({"thread_id": thread_id, "turn": turn,
+                                     "error": f"{type(e).__name__}: {e}"})
+                    break
+                await queue.put({"thread_id": thread_id, "turn": turn,
+                                 "latency_s": round(time.perf_counter() - t0, 3), "result": result})
+        await queue.put(_DONE)
+
+    tasks     = [asyncio.ensure_future(one(c)) for c in conversations]
+    remaining = len(tasks)
+    turns = errors = documents = 0
+    try:
+        while remaining:
+            item = await queue.get()
+            if item is _DONE:
+                remaining -= 1
+                continue
+            if "error" in item:
+                errors += 1
+            else:
+                turns += 1
+                documents += bool(item["result"].get("is_document"))
+            yield item
+    finally:
+        for t in tasks:
+            t.cancel()
+
+    elapsed = time.perf_counter() - start
+    minutes = elapsed / 60 if elapsed else 1
+    yield {"summary": {
+        "conversations":            len(conversations),
+        "turns":                    turns,
+        "documents":                documents,
+        "failed_conversations":     errors,
+        "concurrency":              concurrency,
+        "elapsed_s":                round(elapsed, 3),
+        "conversations_per_minute": round(len(conversations) / minutes, 2),
+        "turns_per_minute":         round(turns / minutes, 2),
+    }}
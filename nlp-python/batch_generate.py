@@ -0,0 +1,154 @@
+"""
+batch_generate.py — Generate documents offline from a JSONL file of facts.
+
+Each input line is {"id": ..., "intent": ..., "facts": {...}, "language": "ta"}
+("id" optional — the line number is used instead; "language" defaults to en).
+Each output line is
+
+    {"id", "ok", "latency_s", "llm": {calls, provider_calls, cache_hits, by_prompt_type},
+     "result": <agenerate_bilingual_document output>}   or   {"id", "ok": false, "error"}
+
+Documents are generated by a pool of async workers. Output lines are flushed
+as each document finishes, so the output file doubles as the resume
+checkpoint: with --resume, ids that already have an "ok" line are skipped and
+new lines are appended (failed ones are retried).
+
+Usage (from nlp-python/):
+    python batch_generate.py facts.jsonl documents.jsonl --workers 8
+    python batch_generate.py facts.jsonl documents.jsonl --resume
+    LLM_PROVIDER=stub STUB_LLM_LATENCY_MS=300 python batch_generate.py facts.jsonl out.jsonl
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+
+from bilingual_generator import agenerate_bilingual_document
+from llm_usage import track_llm_usage
+
+
+def read_jobs(path: str) -> list:
+    jobs = []
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            jobs.append({
+                "id":       str(record.get("id", f"line-{lineno}")),
+                "intent":   record.get("intent") or "Legal Issue",
+                "facts":    record.get("facts") or {},
+                "language": record.get("language") or "en",
+            })
+    return jobs
+
+
+def completed_ids(path: str) -> set:
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue    # partial line from an interrupted run
+            if record.get("ok"):
+                done.add(str(record.get("id")))
+    return done
+
+
+async def generate_one(job: dict) -> dict:
+    start = time.perf_counter()
+    with track_llm_usage() as usage:
+        try:
+            result = await agenerate_bilingual_document(job["intent"], job["facts"], job["language"])
+            record = {"id": job["id"], "ok": True, "result": result}
+        except Exception as e:
+            record = {"id": job["id"], "ok": False, "error": f"{type(e).__name__}: {e}"}
+    record["latency_s"] = round(time.perf_counter() - start, 3)
+    record["llm"]       = usage.as_dict()
+    return record
+
+
+async def run(jobs: list, out, workers: int) -> list:
+    queue = asyncio.Queue()
+    for job in jobs:
+        queue.put_nowait(job)
+    records = []
+
+    async def worker():
+        while True:
+            try:
+                job = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            record = await generate_one(job)
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            records.append(record)
+            status = "ok" if record["ok"] else f"FAILED ({record['error']})"
+            print(f"[batch_generate] {record['id']}: {status} in {record['latency_s']}s, "
+                  f"{record['llm']['provider_calls']} LLM calls", file=sys.stderr)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, workers))))
+    return records
+
+
+def _percentile(values: list, pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def summarise(records: list, elapsed: float, skipped: int) -> dict:
+    ok        = [r for r in records if r["ok"]]
+    latencies = [r["latency_s"] for r in ok] or [0.0]
+    calls     = [r["llm"]["provider_calls"] for r in ok] or [0]
+    return {
+        "documents":                len(records),
+        "ok":                       len(ok),
+        "failed":                   len(records) - len(ok),
+        "skipped_already_done":     skipped,
+        "elapsed_s":                round(elapsed, 3),
+        "documents_per_minute":     round(len(ok) / (elapsed / 60), 2) if elapsed else 0.0,
+        "latency_p50_s":            _percentile(latencies, 50),
+        "latency_p95_s":            _percentile(latencies, 95),
+        "latency_max_s":            max(latencies),
+        "llm_calls_per_document":   round(statistics.mean(calls), 2),
+        "cache_hits":               sum(r["llm"]["cache_hits"] for r in records),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate documents from a JSONL file of facts.")
+    parser.add_argument("input",  help="JSONL of {id, intent, facts, language}")
+    parser.add_argument("output", help="JSONL results; also the resume checkpoint")
+    parser.add_argument("--workers", type=int, default=4, help="documents generated concurrently")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip ids already completed in OUTPUT and append to it")
+    parser.add_argument("--limit", type=int, default=0, help="process at most N pending documents")
+    args = parser.parse_args(argv)
+
+    jobs    = read_jobs(args.input)
+    done    = completed_ids(args.output) if args.resume else set()
+    pending = [j for j in jobs if j["id"] not in done]
+    skipped = len(jobs) - len(pending)
+    if args.limit:
+        pending = pending[:args.limit]
+
+    start = time.perf_counter()
+    with open(args.output, "a" if args.resume else "w", encoding="utf-8") as out:
+        records = asyncio.run(run(pending, out, args.workers))
+    summary = summarise(records, time.perf_counter() - start, skipped)
+
+    print(json.dumps(summary, indent=2))
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
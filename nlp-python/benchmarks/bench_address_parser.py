@@ -0,0 +1,87 @@
+"""
+bench_address_parser.py — Checks and timing for address_parser.parse_address.
+
+Each case says whether the reply may be used as-is (confidence at or above
+ADDRESS_PARSE_MIN_CONFIDENCE, no LLM call on an English address turn) and,
+if so, the district / state / pincode expected. Replies that wrap the
+address in conversation must fall below the floor: the confident path stores
+the text verbatim as user_full_address, and it is printed in the letter.
+
+Exits with status 1 if any case fails.
+
+Usage (from nlp-python/):
+    python benchmarks/bench_address_parser.py
+    python benchmarks/bench_address_parser.py --json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+
+from address_parser import parse_address, ADDRESS_PARSE_MIN_CONFIDENCE
+
+
+# (reply, parsed locally?, district, state, pincode)
+CASES = [
+    ("7, Mariamman Koil Street, Salem - 636001",                 True,  "Salem",      "Tamil Nadu",  "636001"),
+    ("My address is 7, Mariamman Koil Street, Salem - 636001",   True,  "Salem",      "Tamil Nadu",  "636001"),
+    ("I live at 45 MG Road, Bangalore 560001",                   True,  "Bengaluru",  "Karnataka",   "560001"),
+    ("7, Gandhi Street, Anna Nagar, Chennai, Tamil Nadu 600040", True,  "Chennai",    "Tamil Nadu",  "600040"),
+    ("Plot 3, Sector 14, Gurgaon, Haryana 122001",               True,  "Gurugram",   "Haryana",     "122001"),
+    ("Door No. 5/2, Nehru Street, Kottayam, Kerala 686001",      True,  "Kottayam",   "Kerala",      "686001"),
+    ("12, Kottur, Pollachi, Coimbatore 642001",                  True,  "Coimbatore", "Tamil Nadu",  "642001"),
+    ("12 Gandhi St Madurai 625001",                              True,  "Madurai",    "Tamil Nadu",  "625001"),
+    # Conversation around the address — left to the LLM extractor.
+    ("Yes, my address is 7, Mariamman Koil Street, Salem - 636001",     False, "", "", ""),
+    ("Sure. I stay at 45 MG Road, Bangalore 560001. Please hurry",      False, "", "", ""),
+    ("My name is Ravi and I live at 12 Gandhi Street, Madurai 625001",  False, "", "", ""),
+    ("Ok sir, 3 Nehru Street, Kottayam 686001",                         False, "", "", ""),
+    ("12 Gandhi Street, Madurai 625001. Thank you",                     False, "", "", ""),
+    # Not enough to go on.
+    ("Near the bus stand",                                              False, "", "", ""),
+    ("7, Gandhi Street, Salem, Kerala 636001",                          False, "", "", ""),
+]
+
+
+def check() -> list:
+    failures = []
+    for text, local, district, state, pincode in CASES:
+        r     = parse_address(text)
+        got   = r.confidence >= ADDRESS_PARSE_MIN_CONFIDENCE
+        wrong = got != local or (local and (r.district, r.state, r.pincode) != (district, state, pincode))
+        if wrong:
+            failures.append(f"{text!r}: confidence {r.confidence}, "
+                            f"{r.district!r}/{r.state!r}/{r.pincode!r}")
+    return failures
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--number", type=int, default=2000, help="parses per case for timing")
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    failures = check()
+    start    = time.perf_counter()
+    for _ in range(args.number):
+        for text, *_ in CASES:
+            parse_address(text)
+    per_parse = (time.perf_counter() - start) / (args.number * len(CASES)) * 1e6
+
+    if args.json:
+        print(json.dumps({"cases": len(CASES), "failures": failures, "parse_us": round(per_parse, 2)}))
+    else:
+        print(f"{len(CASES) - len(failures)}/{len(CASES)} cases pass "
+              f"(floor {ADDRESS_PARSE_MIN_CONFIDENCE}); parse_address: {per_parse:.2f} us")
+        for f in failures:
+            print(f"  FAIL {f}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+bench_batch.py — Bulk intake throughput of /process/batch, in conversations per minute.
+
+Submits N complete scripted conversations (complaint → interview answers →
+YES → document) in one batch request, with the shared LLM served by the stub
+provider at a fixed latency, and reads the NDJSON stream back. Run at several
+concurrency limits to size BATCH_MAX_CONCURRENCY for a provider's rate limit.
+
+Usage (from nlp-python/):
+    python benchmarks/bench_batch.py --conversations 40 --latency-ms 200 --levels 1 8 32
+"""
+
+import os
+import sys
+import json
+import uuid
+import asyncio
+import logging
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ["LLM_PROVIDER"] = "stub"
+
+import httpx
+
+
+OPENINGS = [
+    "My landlord is not returning my security deposit of Rs. 40000 after I vacated.",
+    "Someone stole my motorcycle from outside my house last night.",
+    "My employer has not paid my salary for the last three months.",
+    "I bought a washing machine online and it is defective, the seller refuses a refund.",
+]
+ANSWERS = [
+    "It happened on 12/03/2025 around 9 pm.",
+    "Near the bus stand, Anna Nagar, Chennai.",
+    "Rs. 40000",
+    "Mr. Ramesh Kumar",
+    "I have receipts and WhatsApp messages.",
+    "I informed them in writing twice but got no reply.",
+    "S. Karthik",
+    "7, Gandhi Street, Anna Nagar, Chennai, Tamil Nadu 600040",
+]
+
+
+def scripted_conversations(n: int, answers: int) -> list:
+    return [{
+        "thread_id": f"batch-{uuid.uuid4()}",
+        "messages":  [OPENINGS[i % len(OPENINGS)]]
+                     + [ANSWERS[j % len(ANSWERS)] for j in range(answers)]
+                     + ["YES"],
+    } for i in range(n)]
+
+
+async def run_level(client: httpx.AsyncClient, args, concurrency: int) -> dict:
+    body = {"conversations": scripted_conversations(args.conversations, args.answers),
+            "concurrency":   concurrency}
+    summary = {}
+    async with client.stream("POST", "/process/batch", json=body) as resp:
+        resp.raise_for_status()
+        async for line in resp.aiter_lines():
+            if line:
+                item = json.loads(line)
+                summary = item.get("summary", summary)
+    return summary
+
+
+async def run(args):
+    from main import app
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("main").setLevel(logging.WARNING)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        results = [await run_level(client, args, c) for c in args.levels]
+
+    print(f"stub latency: {args.latency_ms} ms, {args.conversations} conversations "
+          f"of {args.answers + 2} turns")
+    print(f"{'conc':>6} {'elapsed_s':>10} {'conv/min':>10} {'turns/min':>10} {'docs':>6} {'failed':>7}")
+    for r in results:
+        print(f"{r['concurrency']:>6} {r['elapsed_s']:>10} {r['conversations_per_minute']:>10} "
+              f"{r['turns_per_minute']:>10} {r['documents']:>6} {r['failed_conversations']:>7}")
+    if args.json:
+        print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--conversations", type=int, default=40)
+    parser.add_argument("--answers", type=int, default=len(ANSWERS),
+                        help="interview answers per conversation before YES")
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--json", action="store_true", help="also print raw results as JSON")
+    args = parser.parse_args()
+    os.environ["STUB_LLM_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["BATCH_MAX_CONCURRENCY"] = str(max(args.levels))
+    asyncio.run(run(args))
@@ -0,0 +1,120 @@
+"""
+bench_checkpoint_size.py — Checkpoint payload size per turn under each message retention policy.
+
+Runs the same long conversation (interview answers with a YES every 12 turns,
+so it passes through confirmation and document generation and keeps going)
+once per MESSAGE_RETENTION policy against an in-memory checkpointer that
+records, for every checkpoint write, the serialised bytes it stores
+(checkpoint + changed channel blobs — what AsyncPostgresSaver writes), the
+share of that taken by the messages channel, and the time spent serialising
+and storing it. The LLM is the stub
+provider with no latency, so the numbers only reflect state handling.
+
+Usage (from nlp-python/):
+    python benchmarks/bench_checkpoint_size.py --turns 60 --answer-chars 400
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ["LLM_PROVIDER"]      = "stub"
+os.environ["LLM_CACHE_ENABLED"] = "0"
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+
+class MeasuringSaver(InMemorySaver):
+    def __init__(self):
+        super().__init__()
+        self.put_log = []   # (bytes, messages channel bytes, seconds) per checkpoint write
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        start  = time.perf_counter()
+        result = self.put(config, checkpoint, metadata, new_versions)
+        elapsed = time.perf_counter() - start
+
+        thread_id = config["configurable"]["thread_id"]
+        ns        = config["configurable"]["checkpoint_ns"]
+        size      = sum(len(b) for _, b in self.storage[thread_id][ns][checkpoint["id"]][:2])
+        blobs     = {k: len(self.blobs[(thread_id, ns, k, v)][1]) for k, v in new_versions.items()}
+        self.put_log.append((size + sum(blobs.values()), blobs.get("messages", 0), elapsed))
+        return result
+
+
+def _answers(turns: int, answer_chars: int):
+    filler = ("The details are as described earlier and I can provide more information "
+              "if required. ") * (answer_chars // 80 + 1)
+    yield "My landlord is not returning my security deposit of Rs. 50000 after I vacated the house."
+    for i in range(1, turns):
+        yield f"Answer {i}: {filler[:answer_chars]}"
+
+
+async def run_policy(graph, policy: str, turns: int, answer_chars: int) -> dict:
+    graph.MESSAGE_RETENTION = policy
+    saver  = MeasuringSaver()
+    app    = graph.workflow.compile(checkpointer=saver)
+    config = {"configurable": {"thread_id": f"bench-{policy}"}}
+
+    per_turn = []
+    for i, text in enumerate(_answers(turns, answer_chars)):
+        if i and i % 12 == 0:
+            text = "YES"  # reach confirmation / document, then keep talking
+        mark = len(saver.put_log)
+        await app.ainvoke({"messages": [HumanMessage(content=text)]}, config=config)
+        turn_writes = saver.put_log[mark:]
+        per_turn.append({
+            "turn":           i + 1,
+            "max_bytes":      max(b for b, _, _ in turn_writes),
+            "messages_bytes": max(m for _, m, _ in turn_writes),
+            "write_ms":       round(sum(t for _, _, t in turn_writes) * 1000, 3),
+            "messages_kept":  len((await app.aget_state(config)).values.get("messages", [])),
+        })
+
+    first, last = per_turn[:5], per_turn[-5:]
+    return {
+        "policy":               policy,
+        "turns":                turns,
+        "bytes_first_5_turns":  round(statistics.mean(t["max_bytes"] for t in first)),
+        "bytes_last_5_turns":   round(statistics.mean(t["max_bytes"] for t in last)),
+        "msg_bytes_first_5":    round(statistics.mean(t["messages_bytes"] for t in first)),
+        "msg_bytes_last_5":     round(statistics.mean(t["messages_bytes"] for t in last)),
+        "write_ms_first_5":     round(statistics.mean(t["write_ms"] for t in first), 3),
+        "write_ms_last_5":      round(statistics.mean(t["write_ms"] for t in last), 3),
+        "messages_kept_at_end": per_turn[-1]["messages_kept"],
+        "per_turn":             per_turn,
+    }
+
+
+async def run(args):
+    import graph
+
+    results = [await run_policy(graph, p, args.turns, args.answer_chars) for p in args.policies]
+
+    print(f"{'policy':<26} {'bytes t1-5':>11} {'bytes last5':>12} {'msg bytes t1-5':>15} "
+          f"{'msg bytes last5':>16} {'write ms t1-5':>14} {'write ms last5':>15} {'msgs kept':>10}")
+    for r in results:
+        print(f"{r['policy']:<26} {r['bytes_first_5_turns']:>11} {r['bytes_last_5_turns']:>12} "
+              f"{r['msg_bytes_first_5']:>15} {r['msg_bytes_last_5']:>16} "
+              f"{r['write_ms_first_5']:>14} {r['write_ms_last_5']:>15} {r['messages_kept_at_end']:>10}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--turns", type=int, default=60)
+    parser.add_argument("--answer-chars", type=int, default=400)
+    parser.add_argument("--policies", nargs="+",
+                        default=["none", "last_n", "drop_after_classification", "summarise"])
+    parser.add_argument("--json", default="", help="also write per-turn results to this file")
+    args = parser.parse_args()
+    asyncio.run(run(args))
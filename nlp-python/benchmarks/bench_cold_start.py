@@ -0,0 +1,111 @@
+"""
+bench_cold_start.py — Import time and time to first request for a fresh service process.
+
+Each run starts a new interpreter, so nothing is warm:
+
+  import_s         `import main` in a fresh process
+  ready_s          process launch → uvicorn answers GET /stats
+  first_request_s  launch → first POST /process (classification turn) answered
+
+Runs against the stub provider by default so no API key is needed; point
+DB_URL at an unreachable host to measure the in-memory fallback path, or at a
+real database to include the pool connection.
+
+Usage (from nlp-python/):
+    python benchmarks/bench_cold_start.py --runs 5
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import statistics
+import subprocess
+
+import httpx
+
+HERE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+
+
+def _env(args) -> dict:
+    env = dict(os.environ)
+    env.setdefault("LLM_PROVIDER", "stub")
+    env.setdefault("STUB_LLM_LATENCY_MS", str(args.latency_ms))
+    return env
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_import(args) -> float:
+    out = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], cwd=HERE, env=_env(args),
+                         capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def measure_server(args) -> tuple:
+    port  = _free_port()
+    start = time.perf_counter()
+    proc  = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=HERE, env=_env(args), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        with httpx.Client(timeout=60) as client:
+            while True:
+                try:
+                    client.get(f"{base}/stats").raise_for_status()
+                    break
+                except httpx.TransportError:
+                    if proc.poll() is not None or time.perf_counter() - start > args.timeout:
+                        raise RuntimeError("service did not start")
+                    time.sleep(0.01)
+            ready = time.perf_counter() - start
+
+            client.post(f"{base}/process", json={
+                "thread_id": "cold-start",
+                "message":   "Someone stole my motorcycle from outside my house last night.",
+            }).raise_for_status()
+            first = time.perf_counter() - start
+    finally:
+        proc.terminate()
+        proc.wait()
+    return ready, first
+
+
+def summarise(values) -> dict:
+    return {"median": round(statistics.median(values), 3), "min": round(min(values), 3),
+            "max": round(max(values), 3)}
+
+
+def main(args):
+    imports, readies, firsts = [], [], []
+    for _ in range(args.runs):
+        imports.append(measure_import(args))
+        ready, first = measure_server(args)
+        readies.append(ready)
+        firsts.append(first)
+
+    report = {
+        "runs":            args.runs,
+        "import_s":        summarise(imports),
+        "ready_s":         summarise(readies),
+        "first_request_s": summarise(firsts),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="stub LLM latency per call")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for startup")
+    main(parser.parse_args())
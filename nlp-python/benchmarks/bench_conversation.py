@@ -0,0 +1,284 @@
+"""
+bench_conversation.py — End-to-end latency and cost of full conversations through graph_app.
+
+Replays one scripted conversation per category handled by
+classify_and_plan_node: the complaint, an answer to every interview-plan
+question (case questions, location, evidence, name, address), YES at the
+confirmation summary, and document generation. The compiled graph is driven
+directly (ainvoke per turn, as process_message does) against an in-memory
+checkpointer that measures what it stores, with the shared LLM served by the
+stub provider at a fixed latency plus seeded jitter.
+
+Reported:
+  per node          p50 / p95 / p99 wall time over every execution of the node
+  per turn          p50 / p95 / p99 wall time of a whole turn
+  per conversation  turns, LLM calls (and calls by prompt type), checkpoint bytes
+  process           conversations per minute, peak RSS
+
+--json writes the full result, including the settings it ran with, for
+tracking regressions between commits.
+
+Usage (from nlp-python/):
+    python benchmarks/bench_conversation.py --latency-ms 200 --jitter-ms 50 --repeat 3 --json conv.json
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import asyncio
+import resource
+import argparse
+import platform
+from collections import Counter, defaultdict
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+sys.path.insert(0, HERE)
+os.environ["LLM_PROVIDER"] = "stub"
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.messages import HumanMessage
+
+from bench_checkpoint_size import MeasuringSaver
+
+
+# category → opening message (one per category in the classify_and_plan_node prompt)
+OPENINGS = {
+    "Theft / Robbery":             "Someone stole my motorcycle from outside my house last night.",
+    "Assault":                     "My neighbour attacked me with a stick and I was injured.",
+    "Cyber crime":                 "I lost Rs. 25000 in a UPI fraud after sharing an OTP on a fake link.",
+    "Consumer complaint":          "I bought a washing machine online, it is defective and the seller refuses a refund.",
+    "Salary / Employment dispute": "My employer has not paid my salary for the last three months.",
+    "Property dispute":            "My neighbour has encroached on my plot and moved the boundary wall.",
+    "Landlord / Tenant dispute":   "My landlord is not returning my security deposit of Rs. 40000 after I vacated.",
+    "Harassment / Threat":         "A man keeps calling to threaten me and demands money.",
+    "Cheating / Fraud":            "I was cheated by a fake job agent who took Rs. 60000 from me.",
+    "Family / Matrimonial":        "My husband left home a year ago and pays no maintenance for our child.",
+    "Banking issue":               "The bank debited an EMI twice from my account and will not reverse it.",
+    "RTI Application":             "I want to file an RTI to get information from the government office about my pension file.",
+    "Insurance dispute":           "The insurer rejected my health insurance claim without a proper reason.",
+    "Other civil complaint":       "The municipal drain near my house has overflowed for weeks and nobody responds.",
+}
+
+# interview key → answer; anything else gets a generic case answer
+ANSWERS = {
+    "user_full_name":      "S. Karthik",
+    "user_full_address":   "7, Gandhi Street, Anna Nagar, Chennai, Tamil Nadu 600040",
+    "evidence_available":  "I have receipts, photographs and WhatsApp messages.",
+    "police_station_name": "Anna Nagar Police Station, Chennai",
+    "other_party_name":    "Mr. Ramesh Kumar",
+}
+GENERIC_ANSWER = "It happened on 12/03/2025 around 9 pm near the bus stand, Anna Nagar, Chennai; the amount involved is Rs. 40000."
+MAX_TURNS      = 40
+
+
+class NodeTimer(AsyncCallbackHandler):
+    """Wall time of each graph node run, keyed by node name."""
+
+    def __init__(self):
+        self.started = {}
+        self.times   = defaultdict(list)
+
+    async def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None,
+                             tags=None, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        # Runnables inside a node inherit its metadata; only time the node itself.
+        if node and kwargs.get("name") == node:
+            self.started[run_id] = (node, time.perf_counter())
+
+    async def on_chain_end(self, outputs, *, run_id, parent_run_id=None, tags=None, **kwargs):
+        started = self.started.pop(run_id, None)
+        if started:
+            node, t0 = started
+            self.times[node].append(time.perf_counter() - t0)
+
+    async def on_chain_error(self, error, *, run_id, parent_run_id=None, tags=None, **kwargs):
+        self.started.pop(run_id, None)
+
+
+class ThreadMeasuringSaver(MeasuringSaver):
+    """MeasuringSaver that also attributes checkpoint bytes to threads."""
+
+    def __init__(self):
+        super().__init__()
+        self.thread_writes = defaultdict(list)
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        result = await super().aput(config, checkpoint, metadata, new_versions)
+        self.thread_writes[config["configurable"]["thread_id"]].append(self.put_log[-1][0])
+        return result
+
+
+def _percentiles(values: list) -> dict:
+    values = sorted(values)
+    if not values:
+        return {"count": 0}
+
+    def pct(p):
+        return round(values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))] * 1000, 2)
+
+    return {"count": len(values), "p50_ms": pct(50), "p95_ms": pct(95), "p99_ms": pct(99),
+            "max_ms": round(values[-1] * 1000, 2)}
+
+
+def _next_answer(state: dict) -> str:
+    answered = set(state.get("answered_keys", []))
+    pending  = [s["key"] for s in state.get("interview_plan", []) if s["key"] not in answered]
+    return ANSWERS.get(pending[0], GENERIC_ANSWER) if pending else GENERIC_ANSWER
+
+
+async def run_conversation(graph, app, saver: ThreadMeasuringSaver, timer: NodeTimer,
+                           category: str, opening: str) -> dict:
+    from llm_usage import track_llm_usage
+
+    thread_id = f"bench-{uuid.uuid4()}"
+    config    = {"configurable": {"thread_id": thread_id}, "callbacks": [timer]}
+    turn_s    = []
+    text      = opening
+    response  = {}
+    start     = time.perf_counter()
+    with track_llm_usage() as usage:
+        for _ in range(MAX_TURNS):
+            t0    = time.perf_counter()
+            state = await app.ainvoke({"messages": [HumanMessage(content=text)]}, config=config,
+                                      durability=graph.CHECKPOINT_DURABILITY)
+            turn_s.append(time.perf_counter() - t0)
+            response = graph._build_response(state)
+            if response["is_document"]:
+                break
+            text = "YES" if response["is_confirmation"] else _next_answer(state)
+
+    writes = saver.thread_writes.get(thread_id, [])
+    return {
+        "category":             category,
+        "classified_as":        state.get("category", ""),
+        "completed":            response.get("is_document", False),
+        "turns":                len(turn_s),
+        "elapsed_s":            round(time.perf_counter() - start, 3),
+        "turn_s":               turn_s,
+        "llm":                  usage.as_dict(),
+        "checkpoint_writes":    len(writes),
+        "checkpoint_bytes":     sum(writes),
+        "checkpoint_max_bytes": max(writes, default=0),
+    }
+
+
+def _rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if platform.system() == "Darwin" else 1024), 1)
+
+
+async def run(args) -> dict:
+    import graph
+
+    saver = ThreadMeasuringSaver()
+    app   = graph.workflow.compile(checkpointer=saver)
+    timer = NodeTimer()
+    rss_before = _rss_mb()
+
+    jobs = [(c, o) for _ in range(args.repeat) for c, o in OPENINGS.items()
+            if not args.categories or c in args.categories]
+    sem  = asyncio.Semaphore(max(1, args.concurrency))
+
+    async def one(category, opening):
+        async with sem:
+            return await run_conversation(graph, app, saver, timer, category, opening)
+
+    start   = time.perf_counter()
+    convs   = await asyncio.gather(*(one(c, o) for c, o in jobs))
+    elapsed = time.perf_counter() - start
+
+    by_category = {}
+    for category in dict.fromkeys(c["category"] for c in convs):
+        rows = [c for c in convs if c["category"] == category]
+        by_category[category] = {
+            "classified_as":    rows[0]["classified_as"],
+            "completed":        all(r["completed"] for r in rows),
+            "turns":            rows[0]["turns"],
+            "llm_calls":        rows[0]["llm"]["calls"],
+            "checkpoint_bytes": rows[0]["checkpoint_bytes"],
+            "elapsed_s":        _percentiles([r["elapsed_s"] for r in rows]),
+        }
+
+    llm_by_type = Counter()
+    for c in convs:
+        llm_by_type.update(c["llm"]["by_prompt_type"])
+    n = len(convs)
+    return {
+        "settings": {
+            "latency_ms":  args.latency_ms,
+            "jitter_ms":   args.jitter_ms,
+            "seed":        args.seed,
+            "repeat":      args.repeat,
+            "concurrency": args.concurrency,
+            "llm_cache":   os.environ.get("LLM_CACHE_ENABLED", "1"),
+            "retention":   graph.MESSAGE_RETENTION,
+            "durability":  graph.CHECKPOINT_DURABILITY,
+            "python":      platform.python_version(),
+        },
+        "conversations":                n,
+        "completed":                    sum(c["completed"] for c in convs),
+        "elapsed_s":                    round(elapsed, 3),
+        "conversations_per_minute":     round(n / (elapsed / 60), 2),
+        "turns_per_conversation":       round(sum(c["turns"] for c in convs) / n, 2),
+        "llm_calls_per_conversation":   round(sum(c["llm"]["calls"] for c in convs) / n, 2),
+        "llm_provider_calls_per_conversation":
+                                        round(sum(c["llm"]["provider_calls"] for c in convs) / n, 2),
+        "llm_calls_by_prompt_type":     {k: round(v / n, 2) for k, v in sorted(llm_by_type.items())},
+        "checkpoint_bytes_per_conversation": round(sum(c["checkpoint_bytes"] for c in convs) / n),
+        "checkpoint_max_bytes":         max(c["checkpoint_max_bytes"] for c in convs),
+        "rss_mb_before":                rss_before,
+        "peak_rss_mb":                  _rss_mb(),
+        "nodes":                        {k: _percentiles(v) for k, v in sorted(timer.times.items())},
+        "turns":                        _percentiles([t for c in convs for t in c["turn_s"]]),
+        "categories":                   by_category,
+    }
+
+
+def report(r: dict) -> None:
+    s = r["settings"]
+    print(f"stub latency {s['latency_ms']} ms ± {s['jitter_ms']} ms, {r['conversations']} conversations "
+          f"({r['completed']} reached a document), concurrency {s['concurrency']}")
+    print(f"\n{'node':<20} {'count':>6} {'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9} {'max_ms':>9}")
+    for name, p in list(r["nodes"].items()) + [("(whole turn)", r["turns"])]:
+        print(f"{name:<20} {p['count']:>6} {p['p50_ms']:>9} {p['p95_ms']:>9} {p['p99_ms']:>9} {p['max_ms']:>9}")
+
+    print(f"\n{'category':<30} {'turns':>6} {'llm':>5} {'ckpt_bytes':>11} {'p50_s':>8}  classified as")
+    for name, c in r["categories"].items():
+        flag = "" if c["completed"] else "  (NO DOCUMENT)"
+        print(f"{name:<30} {c['turns']:>6} {c['llm_calls']:>5} {c['checkpoint_bytes']:>11} "
+              f"{c['elapsed_s']['p50_ms'] / 1000:>8.2f}  {c['classified_as']}{flag}")
+
+    print(f"\nconversations/min            {r['conversations_per_minute']}")
+    print(f"LLM calls / conversation     {r['llm_calls_per_conversation']} "
+          f"({r['llm_provider_calls_per_conversation']} reached the provider)")
+    print(f"checkpoint bytes / conv      {r['checkpoint_bytes_per_conversation']} "
+          f"(largest single checkpoint {r['checkpoint_max_bytes']})")
+    print(f"peak RSS                     {r['peak_rss_mb']} MB (after imports {r['rss_mb_before']} MB)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="conversations per category")
+    parser.add_argument("--concurrency", type=int, default=1, help="conversations in flight")
+    parser.add_argument("--categories", nargs="*", default=[], help="only these categories")
+    parser.add_argument("--cache", action="store_true",
+                        help="keep the LLM response cache on (off by default so every call is counted)")
+    parser.add_argument("--json", default="", help="also write the full result to this file")
+    args = parser.parse_args()
+    os.environ["STUB_LLM_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["STUB_LLM_JITTER_MS"]  = str(args.jitter_ms)
+    os.environ["STUB_LLM_SEED"]       = str(args.seed)
+    os.environ["LLM_CACHE_ENABLED"]   = "1" if args.cache else "0"
+
+    result = asyncio.run(run(args))
+    report(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,320 @@
+"""
+bench_doc_templates.py — Document assembly from templates vs the list-appending code it replaced.
+
+Both layouts are assembled for a grid of inputs (English, Tamil and Hindi
+labels; with and without laws, documents, disclaimer, other party, phone and
+address) with the previous _assemble_petition / _assemble_demand_letter
+(kept below as reference) and with the current ones that render
+data/templates; outputs are compared first. Then the cost of one document,
+of rendering alone once the values are prepared, and of loading the
+templates and resolving them for three languages.
+
+Usage (from nlp-python/):
+    python benchmarks/bench_doc_templates.py --number 5000
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import timeit
+import argparse
+import itertools
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("LLM_PROVIDER", "stub")
+
+from address_parser import split_address_lines
+from bilingual_generator import _assemble_demand_letter, _assemble_petition, _layout_values, get_applicable_laws
+from doc_templates import TEMPLATES, load_templates
+from reference_data import reference
+
+
+BODY = ("On 12/03/2026 my two-wheeler TN 09 AB 1234 was stolen from outside my house.\n\n"
+        "I searched the area and asked my neighbours, but could not find it.\n\n\n"
+        "I request you to register my complaint and take action against the thief.")
+DOCS = "1. RC book copy\n2. Insurance policy\n\n3. Photo of the vehicle"
+NO_DOCS = "1. Relevant documents and evidence will be submitted when required."
+FACTS = {"incident_description": "scooter stolen from outside my house, the thief threatened me",
+         "stolen_items": "Honda Activa"}
+
+
+# ============================================================
+# REFERENCE — the code the templates replaced (bilingual_generator.py)
+# ============================================================
+
+def ref_assemble_petition(scalars: dict, body_paragraphs: str, documents_list: str,
+                       authority: str, authority_location: str, today_str: str,
+                       doc_type: str, facts: dict,
+                       disclaimer: str = "", reference_number: str = "") -> str:
+    ref = reference()
+    lbl = ref.labels(scalars.get("user_language", "en"))
+
+    name     = scalars.get("full_name",    "")
+    address  = scalars.get("full_address", "")
+    phone    = scalars.get("phone",        "")
+    subject  = scalars.get("subject",      "")
+    district_raw = scalars.get("district_raw", "")
+    state_raw    = scalars.get("state_raw",    "")
+
+    # Format date with the regional day name where the reference data has one
+    today = datetime.now()
+    day_name = ref.day_name(scalars.get("user_language", "en"), today.strftime('%A'))
+    date_str = today.strftime(f'%d/%m/%Y ({day_name})')
+
+    auth_loc   = authority_location if authority_location else "India"
+    addr_clean = re.sub(r'[\s,\-\u2013\u2014]+$', '', address).strip() if address else ""
+
+    applicable_laws = get_applicable_laws(doc_type, facts)
+    addr_lines      = split_address_lines(addr_clean)
+
+    parts = []
+    parts.append(f"{lbl['date']} {date_str}")
+    parts.append("")
+
+    parts.append(lbl['from'])
+    if name:
+        parts.append(name.strip().rstrip(','))
+    for line in addr_lines:
+        parts.append(line)
+    parts.append("")
+
+    parts.append(lbl['to'])
+    if authority:
+        parts.append(authority.strip().rstrip(','))
+    if auth_loc:
+        auth_loc_normalized = auth_loc.strip().rstrip(',')
+        if '\n' in auth_loc_normalized:
+            loc_lines = [l.strip().rstrip(',') for l in auth_loc_normalized.split('\n') if l.strip()]
+        elif auth_loc_normalized.count(',') >= 2:
+            loc_lines = [p.strip().rstrip(',') for p in auth_loc_normalized.split(',') if p.strip()]
+        else:
+            loc_lines = [auth_loc_normalized]
+        for loc_line in loc_lines:
+            if loc_line and loc_line != authority.strip():
+                parts.append(loc_line)
+    parts.append("")
+    parts.append(f"{lbl['sub']} {subject}")
+    parts.append("")
+    parts.append(lbl['respected'])
+    parts.append("")
+
+    paragraphs = [p.strip() for p in re.split(r'\n{2,}', body_paragraphs) if p.strip()]
+    parts.append("\n\n".join(paragraphs))
+    parts.append("")
+
+    if applicable_laws:
+        parts.append(lbl['legal_provs'])
+        for law in applicable_laws:
+            parts.append(f"  \u2022 {law}")
+        parts.append("")
+
+    parts.append(lbl['attachments'])
+    for line in documents_list.splitlines():
+        stripped = re.sub(r'^\d+\.\s*', '', line.strip())
+        if stripped:
+            parts.append(f"  \u2022 {stripped}")
+    parts.append("")
+    parts.append(lbl['thank_you'])
+    parts.append("")
+    parts.append(lbl['faithfully'])
+    parts.append("")
+    parts.append("")
+    parts.append("________________________")
+    parts.append(lbl['signature'])
+    parts.append("")
+    if name:
+        parts.append(f"{lbl['name']} {name}")
+    if phone:
+        parts.append(f"{lbl['contact']} {phone}")
+    place = district_raw or state_raw or ""
+    if place:
+        parts.append(f"{lbl['place']} {place}")
+    parts.append(f"{lbl['date']} {today_str}")
+    if disclaimer:
+        parts.append("")
+        parts.append("DISCLAIMER")
+        parts.append("")
+        parts.append(disclaimer)
+
+    return "\n".join(parts).strip()
+
+
+# ---------------------------------------------------------------------------
+# STEP 4B - Assemble demand letter to other party
+# ---------------------------------------------------------------------------
+def ref_assemble_demand_letter(scalars: dict, body_paragraphs: str, documents_list: str,
+                            other_party: str, other_party_location: str,
+                            today_str: str, doc_type: str, facts: dict,
+                            disclaimer: str = "", reference_number: str = "") -> str:
+    ref = reference()
+    lbl = ref.labels(scalars.get("user_language", "en"))
+
+    name     = scalars.get("full_name",    "")
+    address  = scalars.get("full_address", "")
+    phone    = scalars.get("phone",        "")
+    subject  = scalars.get("subject",      "")
+    district_raw = scalars.get("district_raw", "")
+    state_raw    = scalars.get("state_raw",    "")
+
+    # Format date with the regional day name where the reference data has one
+    today = datetime.now()
+    day_name = ref.day_name(scalars.get("user_language", "en"), today.strftime('%A'))
+    date_str = today.strftime(f'%d/%m/%Y ({day_name})')
+
+    addr_clean = re.sub(r'[\s,\-\u2013\u2014]+$', '', address).strip() if address else ""
+    salutation = f"{lbl['dear']} {other_party}," if other_party else lbl['respected']
+
+    applicable_laws = get_applicable_laws(doc_type, facts)
+    addr_lines      = split_address_lines(addr_clean)
+
+    parts = []
+    parts.append(f"{lbl['date']} {date_str}")
+    parts.append("")
+
+    parts.append(lbl['from'])
+    if name:
+        parts.append(name.strip().rstrip(','))
+    for line in addr_lines:
+        parts.append(line)
+    parts.append("")
+
+    parts.append(lbl['to'])
+    if other_party:
+        parts.append(other_party.strip().rstrip(','))
+    if other_party_location:
+        for p in other_party_location.split(','):
+            loc_part = p.strip().rstrip(',')
+            if loc_part:
+                parts.append(loc_part)
+    parts.append("")
+    parts.append(f"{lbl['sub']} {subject}")
+    parts.append("")
+    parts.append(salutation)
+    parts.append("")
+
+    paragraphs = [p.strip() for p in re.split(r'\n{2,}', body_paragraphs) if p.strip()]
+    parts.append("\n\n".join(paragraphs))
+    parts.append("")
+
+    if applicable_laws:
+        parts.append(lbl['legal_provs'])
+        for law in applicable_laws:
+            parts.append(f"  \u2022 {law}")
+        parts.append("")
+
+    has_real_docs = any(
+        line.strip() and not line.strip().lower().startswith("relevant documents and evidence will be submitted")
+        for line in documents_list.splitlines() if re.match(r'^\d+\.', line.strip())
+    )
+    if has_real_docs:
+        parts.append(lbl['enclosures'])
+        for line in documents_list.splitlines():
+            stripped = re.sub(r'^\d+\.\s*', '', line.strip())
+            if stripped:
+                parts.append(f"  \u2022 {stripped}")
+        parts.append("")
+
+    parts.append(lbl['thank_you'])
+    parts.append("")
+    parts.append(lbl['faithfully'])
+    parts.append("")
+    parts.append("")
+    parts.append("________________________")
+    parts.append(lbl['signature'])
+    parts.append("")
+    if name:
+        parts.append(f"{lbl['name']} {name}")
+    if phone:
+        parts.append(f"{lbl['contact']} {phone}")
+    place = district_raw or state_raw or ""
+    if place:
+        parts.append(f"{lbl['place']} {place}")
+    parts.append(f"{lbl['date']} {today_str}")
+    if disclaimer:
+        parts.append("")
+        parts.append("DISCLAIMER")
+        parts.append("")
+        parts.append(disclaimer)
+
+    return "\n".join(parts).strip()
+
+
+
+# ============================================================
+# BENCHMARK
+# ============================================================
+
+def cases():
+    for lang, doc_type, phone, address, docs, disclaimer, party in itertools.product(
+            ("en", "ta", "hi"), ("police_complaint_fir", "legal_notice", "general_petition"),
+            ("9876543210", ""), ("7, Gandhi Street, Anna Nagar, Chennai, 600040", ""),
+            (DOCS, NO_DOCS), ("", "This document was prepared with automated help."),
+            (("R. Kumar, ", "12 Lake Road, Salem, Tamil Nadu"), ("", ""))):
+        scalars = {"user_language": lang, "full_name": "S. Meena,", "full_address": address,
+                   "phone": phone, "subject": "Complaint regarding theft of two-wheeler",
+                   "district_raw": "Chennai" if address else "", "state_raw": "Tamil Nadu"}
+        yield (scalars, BODY, docs, party[0], party[1] or "Anna Nagar Police Station, Chennai, Tamil Nadu",
+               "17/10/2026", doc_type, FACTS, disclaimer)
+
+
+def compare() -> int:
+    checked = 0
+    for scalars, body, docs, party, location, today, doc_type, facts, disclaimer in cases():
+        for ref_fn, fn in ((ref_assemble_petition, _assemble_petition),
+                           (ref_assemble_demand_letter, _assemble_demand_letter)):
+            args = (scalars, body, docs, party or "The Station House Officer", location,
+                    today, doc_type, facts)
+            before, after = ref_fn(*args, disclaimer=disclaimer), fn(*args, disclaimer=disclaimer)
+            if before != after:
+                raise SystemExit(f"{fn.__name__} differs for {scalars['user_language']}/{doc_type}:\n"
+                                 f"--- before\n{before}\n--- after\n{after}")
+            checked += 1
+    return checked
+
+
+def _us(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def run(args):
+    checked = compare()
+    print(f"{checked} documents, outputs identical")
+
+    scalars, body, docs, party, location, today, doc_type, facts, _ = next(cases())
+    scalars = dict(scalars, user_language="ta")
+    petition = (scalars, body, docs, "The Station House Officer", location, today, doc_type, facts)
+    letter   = (scalars, body, docs, "R. Kumar", "12 Lake Road, Salem", today, doc_type, facts)
+    values   = _layout_values(scalars, body, docs, "The Station House Officer", today, doc_type, facts, "")
+    values["recipient_lines"] = ["Anna Nagar Police Station", "Chennai"]
+
+    timings = {
+        "petition: before":          _us(lambda: ref_assemble_petition(*petition), args.number),
+        "petition: after":           _us(lambda: _assemble_petition(*petition), args.number),
+        "demand letter: before":     _us(lambda: ref_assemble_demand_letter(*letter), args.number),
+        "demand letter: after":      _us(lambda: _assemble_demand_letter(*letter), args.number),
+        "render only (petition, ta)": _us(lambda: TEMPLATES["petition"].render("ta", values), args.number),
+    }
+    for name, us in timings.items():
+        print(f"{name:<28} {us:>8.2f} us")
+
+    start = time.perf_counter()
+    for _ in range(20):
+        for template in load_templates().values():
+            for lang in ("en", "ta", "hi"):
+                template._resolve(reference(), lang)
+    compile_ms = (time.perf_counter() - start) / 20 * 1e3
+    print(f"load + resolve all templates for 3 languages: {compile_ms:.2f} ms")
+
+    if args.json:
+        print(json.dumps({"documents_compared": checked, "compile_ms": round(compile_ms, 3),
+                          "timings_us": {k: round(v, 2) for k, v in timings.items()}}))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=5000, help="documents per timing")
+    parser.add_argument("--json", action="store_true", help="also print raw results as JSON")
+    run(parser.parse_args())
@@ -0,0 +1,93 @@
+"""
+bench_language_detect.py — Local language detection vs. the LLM-only path.
+
+Runs detect_language_node over language_corpus.jsonl three ways:
+  local     language_detect.detect_language only
+  hybrid    the node as shipped (local first, LLM below the confidence floor)
+  llm-only  the node with the local path disabled (previous behaviour)
+
+Reports accuracy, LLM calls and per-message latency for each mode. Uses the
+configured LLM_PROVIDER; without one set it runs against the stub provider
+with STUB_LLM_LATENCY_MS (default 400 ms), whose language reply only looks at
+the script, so its romanised accuracy is not meaningful.
+
+Usage (from nlp-python/):
+    python benchmarks/bench_language_detect.py
+    LLM_PROVIDER=groq python benchmarks/bench_language_detect.py
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import statistics
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+os.environ.setdefault("LLM_PROVIDER", "stub")
+os.environ.setdefault("STUB_LLM_LATENCY_MS", "400")
+os.environ["LLM_CACHE_ENABLED"] = "0"
+
+from langchain_core.messages import HumanMessage
+
+import graph
+from language_detect import detect_language
+
+
+def load_corpus(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarise(name: str, rows: list) -> dict:
+    latencies = sorted(r["latency_ms"] for r in rows)
+    return {
+        "mode":        name,
+        "accuracy":    round(sum(r["predicted"] == r["lang"] for r in rows) / len(rows), 3),
+        "llm_calls":   sum(r["method"] == "llm" for r in rows),
+        "mean_ms":     round(statistics.mean(latencies), 3),
+        "p95_ms":      round(latencies[int(0.95 * (len(latencies) - 1))], 3),
+        "errors":      [f"{r['lang']}→{r['predicted']}: {r['text'][:40]}" for r in rows
+                        if r["predicted"] != r["lang"]],
+    }
+
+
+async def run_node(corpus: list, min_confidence: float) -> list:
+    graph.LANG_DETECT_MIN_CONFIDENCE = min_confidence
+    rows = []
+    for item in corpus:
+        start = time.perf_counter()
+        out   = await graph.detect_language_node({"messages": [HumanMessage(content=item["text"])]})
+        rows.append(dict(item, predicted=out["primary_language"], method=out["language_detection"],
+                         latency_ms=(time.perf_counter() - start) * 1000))
+    return rows
+
+
+async def main():
+    corpus   = load_corpus(os.path.join(HERE, "language_corpus.jsonl"))
+    floor    = graph.LANG_DETECT_MIN_CONFIDENCE
+
+    local = []
+    for item in corpus:
+        start = time.perf_counter()
+        d     = detect_language(item["text"])
+        local.append(dict(item, predicted=d.language, method=d.method,
+                          latency_ms=(time.perf_counter() - start) * 1000))
+
+    hybrid   = await run_node(corpus, floor)
+    llm_only = await run_node(corpus, 1.01)
+
+    print(f"corpus: {len(corpus)} messages, provider: {os.environ['LLM_PROVIDER']}, "
+          f"confidence floor: {floor}")
+    print(f"{'mode':<10} {'accuracy':>9} {'llm_calls':>10} {'mean_ms':>10} {'p95_ms':>10}")
+    results = [summarise("local", local), summarise("hybrid", hybrid), summarise("llm-only", llm_only)]
+    for r in results:
+        print(f"{r['mode']:<10} {r['accuracy']:>9} {r['llm_calls']:>10} {r['mean_ms']:>10} {r['p95_ms']:>10}")
+    for r in results:
+        for e in r["errors"]:
+            print(f"  [{r['mode']}] {e}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
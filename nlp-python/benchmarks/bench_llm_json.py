@@ -0,0 +1,171 @@
+"""
+bench_llm_json.py — How many defective LLM replies survive parsing, before and after llm_json.py.
+
+A corpus of replies with the defects seen from chat models (fences, prose
+after the object, trailing commas, single quotes, Python literals, unquoted
+keys, truncation, a bad optional block, a wrong required value) is run
+through the parsing that used to be done (greedy regex + json.loads) and
+through llm_json.parse_reply with the prompt's schema. Before, "fallback"
+means the caller threw the reply away and used its defaults, and "parsed"
+only means json.loads succeeded: a missing plan or an unknown doc_type went
+through unchecked. Then the re-ask path is driven through the stub model
+with a broken-then-fixed classification reply, and the per-reply parsing cost
+is timed for clean and repaired replies.
+
+Usage (from nlp-python/):
+    python benchmarks/bench_llm_json.py
+"""
+
+import os
+import re
+import sys
+import json
+import asyncio
+import timeit
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("LLM_PROVIDER", "stub")
+os.environ["LLM_CACHE_ENABLED"] = "0"
+
+PLAN = ('[{"key": "incident_date_time", "label": "Date and Time", "question": "When did it happen?"}, '
+        '{"key": "stolen_items", "label": "Stolen Items", "question": "What was stolen?"}]')
+
+# (prompt_type, defect, reply)
+CORPUS = [
+    ("classification", "clean",
+     '{"category": "Theft / Robbery", "policy_action": "allow", "policy_message": "", '
+     '"initial_facts": {}, "interview_plan": ' + PLAN + '}'),
+    ("classification", "fenced + prose after",
+     'Here is the plan:\n```json\n{"category": "Theft / Robbery", "interview_plan": ' + PLAN + '}\n```\n'
+     'Let me know if you need {anything} else.'),
+    ("classification", "trailing commas",
+     '{"category": "Theft / Robbery", "initial_facts": {}, "interview_plan": ' + PLAN[:-1] + ',],}'),
+    ("classification", "single quotes + True/None",
+     PLAN.join(["{'category': 'Theft / Robbery', 'initial_facts': {'vehicle': None, 'insured': True}, "
+                "'interview_plan': ", "}"])),
+    ("classification", "truncated mid-plan",
+     '{"category": "Theft / Robbery", "interview_plan": ' + PLAN[:-1] + ', {"key": "loss_am'),
+    ("classification", "one plan item without question",
+     '{"category": "Theft / Robbery", "interview_plan": ' + PLAN[:-1] + ', {"key": "suspect"}]}'),
+    ("classification", "no plan (re-ask)",
+     '{"category": "Theft / Robbery", "policy_action": "allow"}'),
+    ("extraction", "clean",
+     '{"extracted": {"user_full_address": "7, Gandhi Street, Chennai 600040"}, '
+     '"address": {"district": "Chennai", "state": "Tamil Nadu", "pincode": "600040"}}'),
+    ("extraction", "null in address block",
+     '{"extracted": {"user_full_address": "7, Gandhi Street, Chennai"}, '
+     '"address": {"district": "Chennai", "state": null, "pincode": null}}'),
+    ("extraction", "unquoted keys",
+     '{extracted: {incident_location: "Anna Nagar bus stand"}}'),
+    ("extraction", "two objects",
+     '{"extracted": {"stolen_items": "Honda Activa"}}\n{"note": "scooter"}'),
+    ("doc_classification", "clean",
+     '{"doc_type": "legal_notice", "authority": "", "other_party": "R. Kumar", "ref_prefix": "LN"}'),
+    ("doc_classification", "doc type in words",
+     '{"doc_type": "Legal Notice", "other_party": "R. Kumar", "ref_prefix": "LN"}'),
+    ("doc_classification", "unknown doc type (re-ask)",
+     '{"doc_type": "fir", "authority": "The Station House Officer"}'),
+    ("subject", "curly quotes",
+     '{“subject”: “Complaint regarding theft of two-wheeler”}'),
+    ("next_steps", "clean",
+     '["File the complaint at the police station.", "Keep the RC book safe."]'),
+    ("next_steps", "prose + empty item",
+     'Steps:\n["File the complaint at the police station.", "", "Keep the RC book safe."]\nGood luck!'),
+    ("address_parse", "number pincode",
+     '{"district": "Salem", "state": "Tamil Nadu", "pincode": 636001}'),
+]
+
+
+def ref_parse(raw: str, array: bool):
+    """The regex + json.loads parsing the call sites used before."""
+    raw = raw.strip()
+    raw = re.sub(r'^```(?:json)?\s*', '', raw, flags=re.MULTILINE)
+    raw = re.sub(r'\s*```\s*$',       '', raw, flags=re.MULTILINE)
+    match = re.search(r'\[.*\]' if array else r'\{.*\}', raw, re.DOTALL)
+    if match:
+        raw = match.group(0)
+    return json.loads(raw)
+
+
+def run_corpus():
+    from llm_json import REPLY_SCHEMAS, _expects_array, parse_reply
+
+    rows = []
+    for prompt_type, defect, raw in CORPUS:
+        schema = REPLY_SCHEMAS[prompt_type]
+        try:
+            ref_parse(raw, _expects_array(schema))
+            before = "parsed"
+        except ValueError:
+            before = "fallback"
+        try:
+            after = parse_reply(raw, schema)[1]
+        except ValueError:
+            after = "re-ask"
+        rows.append({"prompt_type": prompt_type, "defect": defect, "before": before, "after": after})
+    return rows
+
+
+async def run_reask(tmpdir: str) -> dict:
+    """Broken first reply, fixed second: what the caller gets and what it cost."""
+    path = os.path.join(tmpdir, "fixtures.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"classification": [CORPUS[6][2], CORPUS[0][2]]}, f)
+    os.environ["STUB_LLM_FIXTURES"] = path
+
+    from langchain_core.messages import HumanMessage, SystemMessage
+    from llm_json import ainvoke_json
+    from llm_usage import track_llm_usage
+
+    messages = [SystemMessage(content="Legal intake planner. Valid JSON only. No markdown."),
+                HumanMessage(content='USER MESSAGE: "My scooter was stolen"')]
+    with track_llm_usage() as usage:
+        data = await ainvoke_json(messages)
+    return {"calls": usage.as_dict()["calls"], "plan_questions": len(data["interview_plan"])}
+
+
+def _us(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def run(args):
+    from llm_json import ClassificationReply, parse_reply
+    from text_utils import extract_json
+
+    rows = run_corpus()
+    print(f"{'prompt_type':<20} {'defect':<32} {'before':<10} {'after':<10}")
+    for r in rows:
+        print(f"{r['prompt_type']:<20} {r['defect']:<32} {r['before']:<10} {r['after']:<10}")
+    parsed_before = sum(r["before"] == "parsed" for r in rows)
+    usable_after  = sum(r["after"] != "re-ask" for r in rows)
+    print(f"\nparsed before: {parsed_before}/{len(rows)}; "
+          f"valid without another call after: {usable_after}/{len(rows)}, the rest re-asked")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        reask = asyncio.run(run_reask(tmpdir))
+    print(f"re-ask on a reply without a plan: {reask['calls']} LLM calls, "
+          f"{reask['plan_questions']} planned questions (before: 1 call and an empty interview plan)")
+
+    clean, broken = CORPUS[0][2], CORPUS[3][2]
+    timings = {
+        "clean: regex + json.loads":  _us(lambda: ref_parse(clean, False), args.number),
+        "clean: extract_json":        _us(lambda: extract_json(clean), args.number),
+        "clean: parse_reply":         _us(lambda: parse_reply(clean, ClassificationReply), args.number),
+        "repaired: parse_reply":      _us(lambda: parse_reply(broken, ClassificationReply), args.number),
+    }
+    print()
+    for name, us in timings.items():
+        print(f"{name:<30} {us:>8.2f} us")
+
+    if args.json:
+        print(json.dumps({"corpus": rows, "reask": reask,
+                          "timings_us": {k: round(v, 2) for k, v in timings.items()}}))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=5000, help="calls per timing")
+    parser.add_argument("--json", action="store_true", help="also print raw results as JSON")
+    run(parser.parse_args())
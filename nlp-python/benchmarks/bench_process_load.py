@@ -0,0 +1,108 @@
+"""
+bench_process_load.py — Concurrency scaling of the /process endpoint.
+
+Drives first turns (language detection → classification/plan → first question)
+through the FastAPI app in-process, with the shared LLM served by the stub provider
+(LLM_PROVIDER=stub) at a fixed latency. With a non-blocking request path, throughput should
+grow roughly linearly with the number of conversations in flight.
+
+Every request sends a different message and the LLM response cache is off, so
+each turn pays for its LLM calls; the calls per turn are counted (llm_usage),
+not assumed.
+
+Usage (from nlp-python/):
+    python benchmarks/bench_process_load.py --latency-ms 200 --levels 1 10 50 100 200
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import asyncio
+import itertools
+import logging
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ["LLM_PROVIDER"]      = "stub"
+os.environ["LLM_CACHE_ENABLED"] = "0"
+
+import httpx
+
+OPENINGS = [
+    "Someone stole my motorcycle from outside my house",
+    "The shop refuses to replace the defective phone I bought",
+    "My landlord is not returning my security deposit",
+    "My employer has not paid my salary for two months",
+    "Money was debited from my bank account without my knowledge",
+]
+_request_no = itertools.count(1)
+
+
+def unique_message() -> str:
+    n = next(_request_no)
+    return f"{OPENINGS[n % len(OPENINGS)]}, on {n % 28 + 1} March around {n % 12 + 1} pm (case {n})."
+
+
+async def run_level(client: httpx.AsyncClient, concurrency: int) -> dict:
+    from llm_usage import track_llm_usage
+
+    latencies = []
+
+    async def one_conversation():
+        start = time.perf_counter()
+        resp  = await client.post("/process", json={
+            "thread_id": f"bench-{uuid.uuid4()}",
+            "message":   unique_message(),
+        })
+        resp.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with track_llm_usage() as usage:
+        await asyncio.gather(*(one_conversation() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    calls   = usage.as_dict()
+
+    return {
+        "concurrency":    concurrency,
+        "elapsed_s":      round(elapsed, 3),
+        "turns_per_s":    round(concurrency / elapsed, 2),
+        "p50_latency_s":  round(statistics.median(latencies), 3),
+        "max_latency_s":  round(max(latencies), 3),
+        "llm_calls_per_turn":      round(calls["calls"] / concurrency, 2),
+        "provider_calls_per_turn": round(calls["provider_calls"] / concurrency, 2),
+    }
+
+
+async def run(args):
+    # Imported here so the STUB_LLM_* settings below are in place first.
+    from main import app
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("main").setLevel(logging.WARNING)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # Warm up: builds the checkpointer and compiled graph.
+        await run_level(client, 1)
+        results = [await run_level(client, c) for c in args.levels]
+
+    print(f"stub latency: {args.latency_ms} ms, LLM response cache off")
+    print(f"{'conc':>6} {'elapsed_s':>10} {'turns/s':>9} {'p50_s':>8} {'max_s':>8} {'LLM calls/turn':>15}")
+    for r in results:
+        print(f"{r['concurrency']:>6} {r['elapsed_s']:>10} {r['turns_per_s']:>9} "
+              f"{r['p50_latency_s']:>8} {r['max_latency_s']:>8} {r['llm_calls_per_turn']:>15}")
+    if args.json:
+        print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 10, 50, 100, 200])
+    parser.add_argument("--json", action="store_true", help="also print raw results as JSON")
+    args = parser.parse_args()
+    os.environ["STUB_LLM_LATENCY_MS"] = str(args.latency_ms)
+    asyncio.run(run(args))
@@ -0,0 +1,210 @@
+"""
+bench_reference_data.py — Category questions from reference_data.py vs the branches they replaced.
+
+The turn-1 plan additions (authority questions for the category, the evidence
+question, the personal questions) are built for every category with the
+previous if/elif code (kept below as reference) and with the loaded
+reference data; outputs are compared first. Then the per-turn cost, the cost
+of loading data/reference.json, of reference() and of the per-turn reload
+check (check_reference) between file checks.
+
+Usage (from nlp-python/):
+    python benchmarks/bench_reference_data.py --number 20000
+"""
+
+import os
+import sys
+import json
+import time
+import timeit
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from reference_data import REFERENCE_PATH, check_reference, load_reference, reference
+
+
+CATEGORIES = [
+    "Theft / Robbery", "Assault", "Cyber crime", "Consumer complaint", "Salary / Employment dispute",
+    "Property dispute", "Landlord / Tenant dispute", "Harassment / Threat", "Cheating / Fraud",
+    "Family / Matrimonial", "Banking issue", "RTI Application", "Insurance dispute",
+    "Other civil complaint", "Workplace Complaints", "Something unexpected",
+]
+
+REF_PERSONAL_KEYS = [
+    {"key": "user_full_name",    "label": "Your Full Name",                "question": "What is your full name?"},
+    {"key": "user_full_address", "label": "Your Full Residential Address", "question": "What is your full residential address?"},
+]
+
+
+# ============================================================
+# REFERENCE — the code reference_data.py replaced (graph.py)
+# ============================================================
+
+def ref_evidence_question(category: str) -> dict:
+
+    base_q = "What evidence do you have to support this complaint?"
+
+    # Category-specific examples
+    if category == "Consumer complaint":
+        examples = "purchase receipt, invoice, warranty card, product photos, defect photos, email/SMS with seller, packaging"
+    elif category in ["Theft / Robbery", "Assault", "Harassment / Threat"]:
+        examples = "witness statements, CCTV footage if available, photographs of injuries or scene, medical reports if injured, FIR copy if already filed"
+    elif category == "Cyber crime":
+        examples = "screenshots of fraudulent messages, bank transaction details, account statements, email headers, chat logs, UPI transaction receipts"
+    elif category in ["Salary / Employment dispute", "Workplace Complaints"]:
+        examples = "appointment letter, salary slips, bank statements showing salary, employment contract, email correspondence with employer"
+    elif category == "Banking issue":
+        examples = "bank statements, transaction SMS, passbook entries, loan agreement, email/letter from bank, cheque copies"
+    elif category == "Insurance dispute":
+        examples = "insurance policy copy, premium payment receipts, claim forms, rejection letter, correspondence with insurance company"
+    elif category in ["Property dispute", "Landlord / Tenant dispute"]:
+        examples = "sale deed, rental agreement, rent receipts, property tax receipts, possession documents, photographs"
+    elif category == "RTI Application":
+        examples = "previous correspondence with department if any, copies of earlier applications, proof of fees paid"
+    elif category == "Cheating / Fraud":
+        examples = "written agreement, payment receipts, bank transfer details, WhatsApp/SMS conversations, witness statements"
+    else:
+        examples = "receipts, written agreements, photographs, email/SMS correspondence, witness contact information"
+
+    return {
+        "key": "evidence_available",
+        "label": "Evidence Available",
+        "question": f"{base_q} For this type of case, relevant evidence includes: {examples}."
+    }
+
+
+def ref_authority_questions(category: str) -> list:
+    plan = []
+    # For criminal complaints → ask for police station
+    if category in [
+        "Theft / Robbery", 
+        "Assault", 
+        "Harassment / Threat", 
+        "Cheating / Fraud",
+        "Cyber crime"
+    ]:
+        plan.append({
+            "key": "police_station_name",
+            "label": "Police Station Jurisdiction",
+            "question": "Which police station has jurisdiction over your area? If unsure, please mention your locality name. (Example: Anna Nagar Police Station, Chennai OR just 'Anna Nagar, Chennai')"
+        })
+
+    # For consumer complaints → ask for seller details and forum location
+    elif category == "Consumer complaint":
+        plan.append({
+            "key": "seller_name_location",
+            "label": "Seller/Company Name and Location",
+            "question": "What is the complete name and location of the seller or company you are complaining about? (Example: XYZ Electronics, T. Nagar, Chennai)"
+        })
+        plan.append({
+            "key": "consumer_forum_district",
+            "label": "Your District for Consumer Forum",
+            "question": "Which district do you live in? Consumer complaints are typically filed in your district's consumer forum. (Example: Salem District, Tamil Nadu)"
+        })
+
+    # For banking complaints → ask for branch details
+    elif category == "Banking issue":
+        plan.append({
+            "key": "bank_branch_details",
+            "label": "Bank Branch Name and Location",
+            "question": "Which bank branch are you dealing with? Please provide the complete branch name and location. (Example: State Bank of India, Main Branch, T. Nagar, Chennai - 600017)"
+        })
+
+    # For insurance complaints → ask for office/branch
+    elif category == "Insurance dispute":
+        plan.append({
+            "key": "insurance_office_location",
+            "label": "Insurance Company Office",
+            "question": "Which insurance company office or branch are you dealing with? Provide the office name and location. (Example: LIC Branch Office, Anna Salai, Chennai)"
+        })
+
+    # For employment/workplace → ask for employer details
+    elif category == "Salary / Employment dispute":
+        plan.append({
+            "key": "employer_name_address",
+            "label": "Employer Name and Office Address",
+            "question": "What is your employer's full company name and complete office address?"
+        })
+
+    # For property disputes → ask for property location
+    elif category == "Property dispute":
+        plan.append({
+            "key": "property_exact_location",
+            "label": "Property Location",
+            "question": "What is the exact location/address of the disputed property? Include survey numbers if available."
+        })
+
+    # For landlord/tenant → ask for property address and landlord name
+    elif category == "Landlord / Tenant dispute":
+        plan.append({
+            "key": "rental_property_address",
+            "label": "Rental Property Address",
+            "question": "What is the complete address of the rental property in question?"
+        })
+        plan.append({
+            "key": "other_party_name",
+            "label": "Landlord / Other Party Name",
+            "question": "What is the full name of the landlord (or the other party in this dispute)?"
+        })
+
+    # For property disputes → ask for the other party name (builder, neighbour, etc.)
+    elif category == "Property dispute":
+        plan.append({
+            "key": "other_party_name",
+            "label": "Builder / Other Party Name",
+            "question": "What is the full name of the builder or the other party involved in this dispute? (e.g., ABC Builders Pvt. Ltd.)"
+        })
+
+    # For RTI applications → ask for department/office
+    elif category == "RTI Application":
+        plan.append({
+            "key": "rti_department_name",
+            "label": "Government Department/Office",
+            "question": "Which government department or office are you seeking information from? Provide the complete name. (Example: Revenue Department, Collectorate Office, Salem District)"
+        })
+    return plan
+
+
+def ref_plan_additions(category: str) -> list:
+    return ref_authority_questions(category) + [ref_evidence_question(category)] + REF_PERSONAL_KEYS
+
+
+def new_plan_additions(category: str) -> list:
+    ref = reference()
+    return ref.authority_questions(category) + [ref.evidence_question(category)] + ref.personal_questions()
+
+
+# ============================================================
+# RUN
+# ============================================================
+
+def _us(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def run(args):
+    for category in CATEGORIES:
+        assert ref_plan_additions(category) == new_plan_additions(category), category
+
+    before = _us(lambda: [ref_plan_additions(c) for c in CATEGORIES], args.number) / len(CATEGORIES)
+    after  = _us(lambda: [new_plan_additions(c) for c in CATEGORIES], args.number) / len(CATEGORIES)
+    hot    = _us(reference, args.number * 10)
+    check  = _us(check_reference, args.number * 10)
+    load   = _us(lambda: load_reference(REFERENCE_PATH), 200) / 1000
+
+    print(f"{len(CATEGORIES)} categories, outputs identical")
+    print(f"plan additions per turn: before {before:.2f} us, after {after:.2f} us ({before / after:.2f}x)")
+    print(f"reference(): {hot:.3f} us, check_reference() between file checks: {check:.3f} us")
+    print(f"load + freeze data/reference.json: {load:.2f} ms")
+
+    if args.json:
+        print(json.dumps({"before_us": round(before, 2), "after_us": round(after, 2),
+                          "reference_us": round(hot, 3), "load_ms": round(load, 2)}))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="calls per timing")
+    parser.add_argument("--json", action="store_true", help="also print raw results as JSON")
+    run(parser.parse_args())
@@ -0,0 +1,303 @@
+"""
+bench_statutes.py — get_applicable_laws from the compiled statute table vs the if/elif chain it replaced.
+
+Thousands of synthetic fact sets (narrative filler with trigger keywords mixed
+in, seeded) are run through:
+
+  if/elif chain     the previous get_applicable_laws (kept below as reference)
+  compiled table    statutes.StatuteTable.applicable on data/statutes.json
+  one-pass regex    all keywords of a doc type in one lookahead alternation,
+                    i.e. a single scan of the text, for comparison
+
+Outputs are compared first. The table is then grown --scale times (synthetic
+triggers and laws per doc type) to compare the compiled index with checking
+each law's keywords separately, which is what the if/elif chain amounts to as
+statutes are added. Finally the table is hot-reloaded from a temporary copy.
+
+Usage (from nlp-python/):
+    python benchmarks/bench_statutes.py --fact-sets 5000 --scale 10
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import statutes
+from statutes import StatuteTable, load_statutes, reload_statutes, statute_table
+from text_utils import KeywordMatcher
+
+
+FILLER = ("the on at of to and my a was in for with from by we he she they it after before "
+          "since about amount paid received payment date month year office street near road "
+          "copy letter notice called asked told said never returned again still only please "
+          "rupees documents details number account person company shop owner family").split()
+
+TABLE        = load_statutes()
+LAW_TRIGGERS = {d: KeywordMatcher(t) for d, t in TABLE.triggers.items() if t}
+
+
+# ============================================================
+# REFERENCE — the implementation statutes.py replaced
+# ============================================================
+
+def ref_applicable_laws(doc_type: str, facts: dict) -> list:
+    """get_applicable_laws before statutes.py (if/elif chain, one KeywordMatcher per doc type)."""
+    applicable_laws = []
+    facts_text = " ".join(str(v) for v in facts.values() if v)
+    hits       = LAW_TRIGGERS[doc_type].groups(facts_text) if doc_type in LAW_TRIGGERS else set()
+
+    if doc_type == "police_complaint_fir":
+        applicable_laws.append("Code of Criminal Procedure 1973, Section 154 - Registration of FIR")
+        if "theft" in hits:
+            applicable_laws.append("Indian Penal Code 1860, Section 379 - Punishment for theft")
+            if "dwelling" in hits:
+                applicable_laws.append("Indian Penal Code 1860, Section 380 - Theft in dwelling house")
+        if "assault" in hits:
+            applicable_laws.append("Indian Penal Code 1860, Section 323 - Voluntarily causing hurt")
+        if "cheating" in hits:
+            applicable_laws.append("Indian Penal Code 1860, Section 420 - Cheating")
+        if "modesty" in hits:
+            applicable_laws.append("Indian Penal Code 1860, Section 354 - Outraging modesty")
+            applicable_laws.append("Indian Penal Code 1860, Section 509 - Insulting modesty of a woman")
+        if "intimidation" in hits:
+            applicable_laws.append("Indian Penal Code 1860, Section 506 - Criminal intimidation")
+
+    elif doc_type == "cyber_fraud_complaint":
+        applicable_laws.append("Information Technology Act 2000, Section 66C - Identity theft")
+        applicable_laws.append("Information Technology Act 2000, Section 66D - Cheating by personation")
+        applicable_laws.append("Indian Penal Code 1860, Section 420 - Cheating")
+
+    elif doc_type == "consumer_complaint":
+        applicable_laws.append("Consumer Protection Act 2019, Section 35 - Consumer disputes redressal")
+        applicable_laws.append("Consumer Protection Act 2019, Section 2(7) - Definition of consumer")
+        if "defect" in hits:
+            applicable_laws.append("Consumer Protection Act 2019, Section 2(10) - Definition of defect")
+        if "unfair_trade" in hits:
+            applicable_laws.append("Consumer Protection Act 2019, Section 2(47) - Unfair trade practice")
+
+    elif doc_type == "legal_notice":
+        if "tenancy" in hits:
+            applicable_laws.append("Transfer of Property Act 1882")
+            applicable_laws.append("Specific Relief Act 1963, Section 9 - Specific performance")
+        if "contract" in hits:
+            applicable_laws.append("Indian Contract Act 1872, Section 73 - Compensation for breach")
+        if "debt" in hits:
+            applicable_laws.append("Civil Procedure Code 1908, Order 37 - Summary Procedure")
+
+    elif doc_type == "workplace_complaint":
+        applicable_laws.append("Industrial Disputes Act 1947, Section 2(s) - Definition of workman")
+        if "wages" in hits:
+            applicable_laws.append("Payment of Wages Act 1936, Section 5 - Time of payment")
+        if "termination" in hits:
+            applicable_laws.append("Industrial Disputes Act 1947, Section 25F - Retrenchment conditions")
+        if "harassment" in hits:
+            applicable_laws.append("Sexual Harassment of Women at Workplace Act 2013")
+
+    elif doc_type == "banking_complaint":
+        applicable_laws.append("Banking Regulation Act 1949")
+        applicable_laws.append("Reserve Bank of India Act 1934")
+        if "unauthorised" in hits:
+            applicable_laws.append("Payment and Settlement Systems Act 2007")
+
+    elif doc_type == "insurance_complaint":
+        applicable_laws.append("Insurance Act 1938")
+        applicable_laws.append("Insurance Regulatory and Development Authority Act 1999")
+        if "rejection" in hits:
+            applicable_laws.append("IRDAI (Protection of Policyholders' Interests) Regulations 2017")
+
+    elif doc_type == "rti_application":
+        applicable_laws.append("Right to Information Act 2005, Section 6 - Request for information")
+        applicable_laws.append("Right to Information Act 2005, Section 7 - Disposal of request")
+
+    elif doc_type == "property_dispute":
+        applicable_laws.append("Transfer of Property Act 1882")
+        applicable_laws.append("Indian Easements Act 1882")
+        if "encroachment" in hits:
+            applicable_laws.append("Specific Relief Act 1963, Section 38 - Perpetual injunction")
+
+    elif doc_type == "family_petition":
+        if "maintenance" in hits:
+            applicable_laws.append("Code of Criminal Procedure 1973, Section 125 - Maintenance")
+            applicable_laws.append("Hindu Marriage Act 1955, Section 24 - Maintenance pendente lite")
+        if "divorce" in hits:
+            applicable_laws.append("Hindu Marriage Act 1955, Section 13 - Divorce")
+
+    seen = set()
+    return [law for law in applicable_laws if not (law in seen or seen.add(law))]
+
+def one_pass_regex(table: StatuteTable, raw: dict):
+    """Per doc type: a lookahead alternation, longest keyword first, so one scan
+    finds the longest keyword at each position; shorter keywords that are
+    prefixes of it are credited through the prefix table."""
+    compiled = {}
+    for doc_type, triggers in table.triggers.items():
+        kws = sorted({k for ks in triggers.values() for k in ks}, key=len, reverse=True)
+        if not kws:
+            continue
+        labels = {k: {t for t, ks in triggers.items() for k2 in ks if k.startswith(k2)} for k in kws}
+        compiled[doc_type] = (re.compile("(?=(" + "|".join(map(re.escape, kws)) + "))"), labels)
+    laws = {d: [(law["cite"], set(law.get("if", []))) for law in spec["laws"]]
+            for d, spec in raw["doc_types"].items()}
+
+    def applicable(doc_type: str, facts: dict) -> list:
+        hits = set()
+        if doc_type in compiled:
+            rx, labels = compiled[doc_type]
+            for m in rx.finditer(" ".join(str(v) for v in facts.values() if v).lower()):
+                hits |= labels[m.group(1)]
+        seen = set()
+        return [c for c, need in laws.get(doc_type, []) if need <= hits and not (c in seen or seen.add(c))]
+    return applicable
+
+
+# ============================================================
+# WORKLOAD
+# ============================================================
+
+def make_fact_sets(table: StatuteTable, n: int, seed: int) -> list:
+    rng       = random.Random(seed)
+    doc_types = sorted(table.triggers)
+    all_kws   = sorted({k for t in table.triggers.values() for ks in t.values() for k in ks})
+    sets      = []
+    for _ in range(n):
+        doc_type = rng.choice(doc_types)
+        own      = [k for ks in table.triggers[doc_type].values() for k in ks] or all_kws
+        facts    = {}
+        for i in range(rng.randint(5, 8)):
+            words = [rng.choice(FILLER) for _ in range(rng.randint(6, 20))]
+            if rng.random() < 0.25:
+                words.insert(rng.randrange(len(words) + 1), rng.choice(own))
+            if rng.random() < 0.05:
+                words.insert(rng.randrange(len(words) + 1), rng.choice(all_kws).upper())
+            facts[f"field_{i}"] = " ".join(words)
+        sets.append((doc_type, facts))
+    return sets
+
+
+def scaled_table(base: StatuteTable, scale: int, seed: int) -> dict:
+    """data/statutes.json plus (scale - 1) times as many synthetic triggers and laws."""
+    rng = random.Random(seed)
+    raw = json.load(open(base.source, encoding="utf-8"))
+    for doc_type, spec in raw["doc_types"].items():
+        n_new = max(1, len(spec.get("triggers") or {"_": 0})) * (scale - 1)
+        spec.setdefault("triggers", {})
+        for i in range(n_new):
+            name = f"synthetic_{i}"
+            spec["triggers"][name] = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz")
+                                              for _ in range(rng.randint(5, 9))) for _ in range(4)]
+            spec["laws"].append({"cite": f"Synthetic Act, Section {i}", "if": [name]})
+            spec["laws"].append({"cite": f"Synthetic Act, Section {i}A", "if": [name, rng.choice(list(spec["triggers"]))]})
+    return raw
+
+
+def per_law_scan(raw: dict):
+    """Each law checks its own triggers' keywords against the text (no shared index)."""
+    laws = {d: [(law["cite"], [[k.lower() for k in spec["triggers"][t]] for t in law.get("if", [])])
+                for law in spec["laws"]] for d, spec in raw["doc_types"].items()}
+
+    def applicable(doc_type: str, facts: dict) -> list:
+        text = " ".join(str(v) for v in facts.values() if v).lower()
+        seen = set()
+        return [c for c, groups in laws.get(doc_type, [])
+                if all(any(k in text for k in g) for g in groups) and not (c in seen or seen.add(c))]
+    return applicable
+
+
+# ============================================================
+# RUN
+# ============================================================
+
+def _time_all(fn, sets, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for doc_type, facts in sets:
+            fn(doc_type, facts)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _ms(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(args):
+    sets   = make_fact_sets(TABLE, args.fact_sets, args.seed)
+    raw    = json.load(open(TABLE.source, encoding="utf-8"))
+    regex  = one_pass_regex(TABLE, raw)
+    for doc_type, facts in sets:
+        expected = ref_applicable_laws(doc_type, facts)
+        assert TABLE.applicable(doc_type, facts) == expected, (doc_type, facts)
+        assert regex(doc_type, facts) == expected, (doc_type, facts)
+
+    raw_big = scaled_table(TABLE, args.scale, args.seed)
+    big     = StatuteTable(raw_big)
+    naive   = per_law_scan(raw_big)
+    big_rx  = one_pass_regex(big, raw_big)
+    for doc_type, facts in sets:
+        assert big.applicable(doc_type, facts) == naive(doc_type, facts) == big_rx(doc_type, facts)
+
+    n = len(sets)
+    rows = [
+        ("if/elif chain",                ref_applicable_laws, sets),
+        ("compiled table",               TABLE.applicable,    sets),
+        ("one-pass regex",               regex,               sets),
+        (f"x{args.scale} per-law scan",  naive,               sets),
+        (f"x{args.scale} compiled table", big.applicable,     sets),
+        (f"x{args.scale} one-pass regex", big_rx,             sets),
+    ]
+    n_laws  = sum(len(s["laws"]) for s in raw["doc_types"].values())
+    big_law = sum(len(s["laws"]) for s in raw_big["doc_types"].values())
+    print(f"{n} fact sets; table {n_laws} laws, x{args.scale} table {big_law} laws\n")
+    print(f"{'variant':<26} {'total_ms':>10} {'us_per_set':>11}")
+    results = []
+    for name, fn, workload in rows:
+        t = _time_all(fn, workload)
+        results.append({"variant": name, "total_ms": round(t * 1000, 1), "us_per_set": round(t / n * 1e6, 2)})
+        print(f"{name:<26} {t * 1000:>10.1f} {t / n * 1e6:>11.2f}")
+
+    compile_ms     = _ms(lambda: load_statutes(TABLE.source))
+    compile_big_ms = _ms(lambda: StatuteTable(raw_big))
+    print(f"\nload + compile: {compile_ms:.2f} ms (x{args.scale}: {compile_big_ms:.2f} ms)")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "statutes.json")
+        json.dump(raw, open(path, "w", encoding="utf-8"))
+        statutes.STATUTES.path = path
+        before = reload_statutes().version
+        raw["version"] = "bench-reload"
+        raw["doc_types"]["rti_application"]["laws"].append({"cite": "Bench Act, Section 1"})
+        json.dump(raw, open(path, "w", encoding="utf-8"))
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+        start   = time.perf_counter()
+        after   = reload_statutes()
+        reload_ms = (time.perf_counter() - start) * 1000
+        assert after.applicable("rti_application", {})[-1] == "Bench Act, Section 1"
+        hot = _ms(lambda: [statute_table() for _ in range(10000)]) / 10000 * 1000
+    print(f"hot reload {before!r} -> {after.version!r}: {reload_ms:.2f} ms; "
+          f"statute_table() between checks: {hot:.3f} us")
+
+    if args.json:
+        print(json.dumps({"results": results, "compile_ms": round(compile_ms, 2),
+                          "compile_scaled_ms": round(compile_big_ms, 2), "reload_ms": round(reload_ms, 2)}))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fact-sets", type=int, default=5000, help="synthetic fact sets")
+    parser.add_argument("--scale", type=int, default=10, help="growth factor for the synthetic table")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="also print raw results as JSON")
+    run(parser.parse_args())
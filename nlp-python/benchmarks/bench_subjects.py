@@ -0,0 +1,113 @@
+"""
+bench_subjects.py — Composed subject lines vs the LLM subject call they replaced.
+
+First the composed subject for every category handled by the stub (with the
+doc_type the stub classifies it as), in English, Tamil and Hindi, with and
+without another party, plus the cost of composing one. Then whole documents
+through agenerate_bilingual_document with the stub LLM at a fixed latency:
+English, Tamil and Telugu (no subject phrases, so its subject always comes
+from the LLM), with SUBJECT_LLM_REFINE off (the default) and on — "on"
+makes the same subject calls as before composed subjects — reporting LLM
+calls and wall time per document.
+
+Usage (from nlp-python/):
+    python benchmarks/bench_subjects.py --latency-ms 200 --runs 5
+"""
+
+import os
+import sys
+import json
+import time
+import timeit
+import asyncio
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ["LLM_PROVIDER"]      = "stub"
+os.environ["LLM_CACHE_ENABLED"] = "0"
+
+LANGUAGES = ("en", "ta", "hi")
+
+FACTS = {
+    "incident_date_time":   "12 March 2026, around 9 pm",
+    "incident_location":    "outside my house, Anna Nagar",
+    "incident_description": "my Honda Activa scooter was stolen",
+    "stolen_items":         "Honda Activa TN 09 AB 1234",
+    "evidence_available":   "RC book, insurance policy, photo of the vehicle",
+    "user_full_name":       "S. Meena",
+    "user_full_address":    "7, Gandhi Street, Anna Nagar, Chennai, Tamil Nadu 600040",
+    "user_phone":           "9876543210",
+}
+INTENT = "Theft / Robbery — my scooter was stolen from outside my house last night"
+
+
+def subject_table() -> list:
+    from reference_data import reference
+    from stub_llm import CATEGORY_SCRIPTS
+
+    ref, rows = reference(), []
+    for category, (_, doc_type, _) in CATEGORY_SCRIPTS.items():
+        for lang in LANGUAGES:
+            for party in ("", "R. Kumar"):
+                subject = ref.subject(lang, doc_type, category, party)
+                rows.append({"category": category, "doc_type": doc_type, "lang": lang,
+                             "other_party": party, "subject": subject, "words": len(subject.split())})
+    return rows
+
+
+async def run_documents(lang: str, refine: bool, runs: int) -> dict:
+    import bilingual_generator
+    from llm_usage import track_llm_usage
+
+    bilingual_generator.SUBJECT_LLM_REFINE = refine
+    calls, wall = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        with track_llm_usage() as usage:
+            result = await bilingual_generator.agenerate_bilingual_document(INTENT, FACTS, lang)
+        wall.append((time.perf_counter() - start) * 1e3)
+        calls.append(usage.as_dict()["calls"])
+    subject = next(line for line in result["user_language_content"].splitlines()
+                   if line.startswith(("Sub:", "பொருள்:", "विषय:")))
+    return {"lang": lang, "refine": refine, "llm_calls": statistics.mean(calls),
+            "p50_ms": round(statistics.median(wall), 1), "subject": subject}
+
+
+def run(args):
+    os.environ["STUB_LLM_LATENCY_MS"] = str(args.latency_ms)
+    from reference_data import SUBJECT_MAX_WORDS, reference
+
+    rows = subject_table()
+    print(f"{'category':<30} {'lang':<4} {'words':>5}  subject")
+    for r in rows:
+        if r["lang"] == "en" or args.all:
+            print(f"{r['category']:<30} {r['lang']:<4} {r['words']:>5}  {r['subject']}")
+    print(f"{len(rows)} subjects, longest {max(r['words'] for r in rows)} words "
+          f"(max {SUBJECT_MAX_WORDS})")
+
+    ref = reference()
+    compose_us = min(timeit.repeat(lambda: ref.subject("ta", "legal_notice", "Landlord / Tenant dispute", "R. Kumar"),
+                                   number=20000, repeat=5)) / 20000 * 1e6
+    print(f"compose one subject: {compose_us:.2f} us\n")
+
+    docs = [asyncio.run(run_documents(lang, refine, args.runs))
+            for lang in ("en", "ta", "te") for refine in (True, False)]
+    print(f"stub latency {args.latency_ms} ms, {args.runs} documents each")
+    print(f"{'lang':<5} {'subject LLM':<12} {'LLM calls':>9} {'p50_ms':>8}  subject line")
+    for d in docs:
+        print(f"{d['lang']:<5} {'refine' if d['refine'] else 'off':<12} {d['llm_calls']:>9.1f} "
+              f"{d['p50_ms']:>8.1f}  {d['subject']}")
+
+    if args.json:
+        print(json.dumps({"subjects": rows, "compose_us": round(compose_us, 3), "documents": docs},
+                         ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--runs", type=int, default=5, help="documents per configuration")
+    parser.add_argument("--all", action="store_true", help="print Tamil and Hindi subjects too")
+    parser.add_argument("--json", action="store_true", help="also print raw results as JSON")
+    run(parser.parse_args())
@@ -0,0 +1,259 @@
+"""
+bench_text_utils.py — Per-call cost of the text helpers before and after text_utils.py.
+
+Each helper is timed against the implementation it replaced (kept below as
+the reference): strip_markdown and parse_llm_json on typical LLM replies,
+phone redaction on a letter body, and the law-trigger and evidence keyword
+checks on realistic fact dictionaries, one per document type. Outputs are
+compared first, so a speedup never comes from a behaviour change. For the
+law triggers a pure-Python Aho–Corasick automaton (one pass over the text
+for all keywords) is timed as well, for comparison with KeywordMatcher.
+
+Usage (from nlp-python/):
+    python benchmarks/bench_text_utils.py --number 20000
+"""
+
+import os
+import re
+import sys
+import json
+import timeit
+import argparse
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("LLM_PROVIDER", "stub")
+
+from text_utils import KeywordMatcher, parse_llm_json, redact_phone_numbers, strip_markdown
+from bilingual_generator import BODY_EVIDENCE_KEYWORDS, EVIDENCE_KEYS
+from statutes import load_statutes
+
+# Law-trigger keywords per document type as KeywordMatchers, the form they had
+# before the statute table moved to data/statutes.json.
+LAW_TRIGGERS = {d: KeywordMatcher(t) for d, t in load_statutes().triggers.items() if t}
+
+
+FACT_SETS = {
+    "police_complaint_fir": {
+        "incident_date_time":  "12/03/2025 around 9 pm",
+        "incident_location":   "Near the bus stand, Anna Nagar, Chennai",
+        "stolen_items":        "Honda Activa scooter TN 09 AB 1234 worth Rs. 65000 and a helmet",
+        "police_station_name": "Anna Nagar Police Station",
+        "evidence_available":  "I have the RC book, purchase invoice, insurance papers and CCTV footage "
+                               "from the shop opposite my house",
+        "evidence_details":    "Two neighbours are witnesses, they saw the men ride off towards the main road",
+        "user_full_name":      "S. Karthik",
+        "user_full_address":   "7, Gandhi Street, Anna Nagar, Chennai, Tamil Nadu 600040",
+    },
+    "legal_notice": {
+        "tenancy_period":          "June 2021 to May 2024",
+        "deposit_amount":          "Rs. 40000",
+        "vacated_date":            "31/05/2024",
+        "rental_property_address": "Flat 3B, Lake View Apartments, Velachery, Chennai 600042",
+        "other_party_name":        "Mr. Ramesh Kumar",
+        "evidence_available":      "Rental agreement, bank transfer receipts for rent and deposit, "
+                                   "WhatsApp messages asking for the refund",
+        "user_full_name":          "Priya Raman",
+        "user_full_address":       "12, 2nd Cross Street, Adyar, Chennai, Tamil Nadu 600020",
+    },
+    "workplace_complaint": {
+        "designation_joining":   "Senior accountant since 01/04/2019",
+        "unpaid_months":         "January, February and March 2025",
+        "amount_due":            "Rs. 1,35,000",
+        "employer_name_address": "Sri Lakshmi Textiles Pvt Ltd, Tiruppur",
+        "evidence_available":    "Appointment letter, salary slips up to December and bank statement",
+        "user_full_name":        "M. Suresh",
+        "user_full_address":     "45, Kamaraj Nagar, Tiruppur, Tamil Nadu 641604",
+    },
+    "consumer_complaint": {
+        "product_name":            "Front-load washing machine bought from an online seller",
+        "purchase_date_price":     "10/01/2025 for Rs. 32,990",
+        "defect_description":      "Drum stopped spinning within two weeks, not working since",
+        "seller_name_location":    "XYZ Electronics, T. Nagar, Chennai",
+        "evidence_available":      "Invoice, warranty card, photos and email complaints to the seller",
+        "user_full_name":          "Anitha Devi",
+        "user_full_address":       "3, Mettu Street, Salem, Tamil Nadu 636001",
+    },
+    "family_petition": {
+        "marriage_date":      "14/02/2015",
+        "separation_details": "My husband left home in March 2023 and pays nothing for our son",
+        "relief_sought":      "Monthly maintenance for me and my son",
+        "evidence_available": "Marriage certificate and school fee receipts",
+        "user_full_name":     "K. Meena",
+        "user_full_address":  "88, Periyar Road, Madurai, Tamil Nadu 625001",
+    },
+}
+
+REPLY_MARKDOWN = ("**Thank you** for the details.\n\n## Next question\n"
+                  "Please tell me __when__ the incident happened and where. ```")
+REPLY_JSON     = ('```json\n{"extracted": {"incident_date_time": "12/03/2025 around 9 pm"}, '
+                  '"address": {"district": "Chennai", "state": "Tamil Nadu", "pincode": "600040"}}\n```')
+LETTER_BODY    = ("I am writing about the deposit of Rs. 40000 paid on 01/06/2021. Despite calls to "
+                  "9876543210 and +91 9123456780, and to the office at 044-24567890, nothing was paid. "
+                  "I have suffered financial loss and mental distress.\n\n") * 3
+
+
+# ============================================================
+# REFERENCE — the implementations text_utils.py replaced
+# ============================================================
+
+def ref_strip_markdown(text: str) -> str:
+    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
+    text = re.sub(r'__(.+?)__',     r'\1', text)
+    text = re.sub(r'#{1,6}\s+',     '',    text)
+    return text.replace("```", "").strip()
+
+
+def ref_parse_llm_json(raw: str) -> dict:
+    raw = raw.strip()
+    raw = re.sub(r'^```(?:json)?\s*', '', raw, flags=re.MULTILINE)
+    raw = re.sub(r'\s*```\s*$',       '', raw, flags=re.MULTILINE)
+    match = re.search(r'\{.*\}', raw, re.DOTALL)
+    if match:
+        raw = match.group(0)
+    return json.loads(raw)
+
+
+def ref_redact(text: str) -> str:
+    text = re.sub(r'\b(?:\+91[\s\-]?)?[6-9]\d{9}\b', '[number redacted]', text)
+    return re.sub(r'\b0\d{2,4}[\s\-]?\d{6,8}\b', '[number redacted]', text)
+
+
+REF_DOC_KEYWORDS = ["receipt", "bill", "sms", "screenshot", "photo", "video",
+                    "cctv", "statement", "certificate", "agreement", "contract",
+                    "report", "invoice", "bank", "email", "whatsapp", "message",
+                    "proof", "record", "document", "evidence"]
+
+
+def ref_evidence(facts: dict) -> list:
+    parts = []
+    for k in EVIDENCE_KEYS:
+        v = str(facts.get(k, "")).strip()
+        if v and (any(kw in v.lower() for kw in REF_DOC_KEYWORDS) or len(v) < 50):
+            parts.append(v)
+    return parts
+
+
+def new_evidence(facts: dict) -> list:
+    parts = []
+    for k in EVIDENCE_KEYS:
+        v = str(facts.get(k, "")).strip()
+        if v and (len(v) < 50 or BODY_EVIDENCE_KEYWORDS.search(v)):
+            parts.append(v)
+    return parts
+
+
+def ref_law_triggers(doc_type: str, facts: dict) -> set:
+    """As get_applicable_laws used to: lowercase while joining, one any() per trigger."""
+    text    = " ".join(str(v).lower() for v in facts.values() if v)
+    matcher = LAW_TRIGGERS.get(doc_type)
+    return {label for label, kws in (matcher.by_label.items() if matcher else ())
+            if any(k in text for k in kws)}
+
+
+def new_law_triggers(doc_type: str, facts: dict) -> set:
+    text = " ".join(str(v) for v in facts.values() if v)
+    return LAW_TRIGGERS[doc_type].groups(text) if doc_type in LAW_TRIGGERS else set()
+
+
+class AhoCorasick:
+    """Textbook automaton: all keyword occurrences in one pass over the text."""
+
+    def __init__(self, words):
+        self.goto, self.fail, self.out = [{}], [0], [set()]
+        for w in words:
+            s = 0
+            for ch in w:
+                if ch not in self.goto[s]:
+                    self.goto.append({}); self.fail.append(0); self.out.append(set())
+                    self.goto[s][ch] = len(self.goto) - 1
+                s = self.goto[s][ch]
+            self.out[s].add(w)
+        queue = deque(self.goto[0].values())
+        while queue:
+            r = queue.popleft()
+            for ch, s in self.goto[r].items():
+                queue.append(s)
+                f = self.fail[r]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                nxt = self.goto[f].get(ch, 0)
+                self.fail[s] = nxt if nxt != s else 0
+                self.out[s] |= self.out[self.fail[s]]
+
+    def findall(self, text: str) -> set:
+        s, found = 0, set()
+        goto, fail, out = self.goto, self.fail, self.out
+        for ch in text.lower():
+            while s and ch not in goto[s]:
+                s = fail[s]
+            s = goto[s].get(ch, 0)
+            if out[s]:
+                found |= out[s]
+        return found
+
+
+def _labels_by_keyword(matcher: KeywordMatcher) -> dict:
+    out = {}
+    for label, kws in matcher.by_label.items():
+        for k in kws:
+            out.setdefault(k, set()).add(label)
+    return out
+
+
+AC_LAW_TRIGGERS = {d: (AhoCorasick(m.keywords), _labels_by_keyword(m)) for d, m in LAW_TRIGGERS.items()}
+
+
+def ac_law_triggers(doc_type: str, facts: dict) -> set:
+    automaton, labels = AC_LAW_TRIGGERS[doc_type]
+    text = " ".join(str(v) for v in facts.values() if v)
+    return {label for word in automaton.findall(text) for label in labels[word]}
+
+
+# ============================================================
+# RUN
+# ============================================================
+
+def _us(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def run(args):
+    for doc_type, facts in FACT_SETS.items():
+        assert ref_law_triggers(doc_type, facts) == new_law_triggers(doc_type, facts) \
+            == ac_law_triggers(doc_type, facts)
+        assert ref_evidence(facts) == new_evidence(facts)
+    assert ref_strip_markdown(REPLY_MARKDOWN) == strip_markdown(REPLY_MARKDOWN)
+    assert ref_parse_llm_json(REPLY_JSON) == parse_llm_json(REPLY_JSON)
+    assert ref_redact(LETTER_BODY) == redact_phone_numbers(LETTER_BODY)
+
+    facts_all = list(FACT_SETS.values())
+    cases = [
+        ("strip_markdown",      lambda: ref_strip_markdown(REPLY_MARKDOWN), lambda: strip_markdown(REPLY_MARKDOWN), None),
+        ("parse_llm_json",      lambda: ref_parse_llm_json(REPLY_JSON),     lambda: parse_llm_json(REPLY_JSON),     None),
+        ("redact phones",       lambda: ref_redact(LETTER_BODY),            lambda: redact_phone_numbers(LETTER_BODY), None),
+        ("evidence filter x5",  lambda: [ref_evidence(f) for f in facts_all],
+                                lambda: [new_evidence(f) for f in facts_all], None),
+        ("law triggers x5",     lambda: [ref_law_triggers(d, f) for d, f in FACT_SETS.items()],
+                                lambda: [new_law_triggers(d, f) for d, f in FACT_SETS.items()],
+                                lambda: [ac_law_triggers(d, f) for d, f in FACT_SETS.items()]),
+    ]
+
+    results = []
+    print(f"{'helper':<22} {'before_us':>10} {'after_us':>10} {'speedup':>8} {'aho_corasick_us':>16}")
+    for name, before, after, ac in cases:
+        b, a = _us(before, args.number), _us(after, args.number)
+        c    = _us(ac, args.number) if ac else None
+        results.append({"helper": name, "before_us": round(b, 2), "after_us": round(a, 2),
+                        "speedup": round(b / a, 2), "aho_corasick_us": round(c, 2) if c else None})
+        print(f"{name:<22} {b:>10.2f} {a:>10.2f} {b / a:>7.2f}x {(f'{c:.2f}' if c else '-'):>16}")
+
+    if args.json:
+        print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="calls per timing")
+    parser.add_argument("--json", action="store_true", help="also print raw results as JSON")
+    run(parser.parse_args())
@@ -0,0 +1,308 @@
+"""
+calibrate_readiness.py — Calibration report: local readiness score (readiness.py) vs LLM scores.
+
+The sample is either read from a JSONL file (--sample; one case per line:
+category, intent, facts, interview_plan, answered_keys, llm_score) or
+collected now by asking the configured LLM the readiness prompt the service
+used before (kept below as reference) for a grid of scripted cases: every
+category of the stub scripts × six kinds of evidence answer × full, partial
+and half plan coverage. --save writes the collected sample for later runs.
+
+First, without any LLM: every category with the interview done and each
+answer in RUBRIC_CASES, which must land in the rubric band next to it (the
+exit status is 1 if one does not). Then, against the LLM scores: error (MAE, RMSE, bias), Pearson and Spearman correlation, how
+often both scores fall in the same rubric band (0–29, 30–59, 60–89, 90–100)
+with the confusion matrix, the same for the old `len(facts) * 10` fallback,
+and per category the mean scores and the evidence weight that fits the
+sample best by least squares next to the one in CATEGORY_WEIGHTS.
+    python benchmarks/calibrate_readiness.py --rubric-only
+
+With LLM_PROVIDER=stub the "LLM" scores are the stub's fact count formula,
+so the numbers only check the pipeline; calibrate against the real model.
+
+Usage (from nlp-python/):
+    LLM_PROVIDER=groq python benchmarks/calibrate_readiness.py --save readiness_sample.jsonl
+    python benchmarks/calibrate_readiness.py --sample readiness_sample.jsonl --json
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import timeit
+import asyncio
+import argparse
+import statistics
+from collections import Counter, defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("LLM_CACHE_ENABLED", "0")
+
+from readiness import CATEGORY_WEIGHTS, DEFAULT_WEIGHTS, assess, coverage_credit
+
+EVIDENCE_VARIANTS = [
+    "Purchase invoice, bank statement showing the payment, and the written agreement.",
+    "I have screenshots of the WhatsApp messages and the SMS alerts.",
+    "Photos of the scene and a medical report from the government hospital.",
+    "My neighbour saw everything and can speak for me.",
+    "No, I do not have anything in writing.",
+    "I have no documentary evidence at this time",
+    "",
+]
+CASE_ANSWER = "It happened on 12/03/2025 around 9 pm near the bus stand, Anna Nagar, Chennai; the amount involved is Rs. 40000."
+PERSONAL = {"user_full_name": "S. Karthik",
+            "user_full_address": "7, Gandhi Street, Anna Nagar, Chennai, Tamil Nadu 600040"}
+
+BANDS = ((0, 29), (30, 59), (60, 89), (90, 100))
+
+# Evidence answer → rubric band it must score in, for every category, once the
+# interview is done. The fourth is the wording graph.py suggests to users
+# without evidence.
+RUBRIC_CASES = [
+    ("Purchase invoice, bank statement showing the payment, and the written agreement.", 3),
+    ("I have screenshots of the WhatsApp messages and the SMS alerts.",                    2),
+    ("Receipt and photos of the damage.",                                                  2),
+    ("My neighbour saw everything and can speak for me.",                                  1),
+    ("I have no documentary evidence at this time",                                        0),
+    ("I don't have any documents.",                                                        0),
+    ("nil",                                                                                0),
+    ("",                                                                                   0),
+]
+
+
+# ============================================================
+# REFERENCE — the LLM scoring the local score replaced (bilingual_generator.py)
+# ============================================================
+
+def ref_readiness_prompt(intent: str, facts: dict) -> str:
+    facts_text = "\n".join(f"  {k.replace('_', ' ').title()}: {v}" for k, v in facts.items())
+    return (
+        f"Score the evidence readiness of this Indian legal complaint from 0 to 100.\n\n"
+        f"Legal issue: {intent}\nFacts:\n{facts_text}\n\n"
+        "Scoring:\n"
+        "- 90-100: Strong documentary evidence\n"
+        "- 60-89:  Some evidence but gaps\n"
+        "- 30-59:  Limited evidence, mostly verbal\n"
+        "- 0-29:   No evidence at all\n\n"
+        "Return ONLY an integer. No text."
+    )
+
+
+def ref_fallback(facts: dict) -> int:
+    return min(100, len(facts) * 10)
+
+
+# ============================================================
+# SAMPLE
+# ============================================================
+
+def scripted_cases() -> list:
+    from stub_llm import CATEGORY_SCRIPTS
+
+    cases = []
+    for category, (_, _, plan) in CATEGORY_SCRIPTS.items():
+        plan_steps = [{"key": k, "label": label, "question": q} for k, label, q in plan]
+        plan_steps.append({"key": "evidence_available", "label": "Evidence Available",
+                           "question": "What evidence do you have?"})
+        for evidence in EVIDENCE_VARIANTS:
+            for answered_share in (1.0, 0.75, 0.5):
+                n_case = max(1, round(len(plan) * answered_share)) if answered_share < 1 else len(plan)
+                facts  = {k: CASE_ANSWER for k, _, _ in plan[:n_case]}
+                if evidence:
+                    facts["evidence_available"] = evidence
+                facts.update(PERSONAL)
+                cases.append({
+                    "category":       category,
+                    "intent":         f"{category} — {plan[0][2]}",
+                    "facts":          facts,
+                    "interview_plan": plan_steps,
+                    "answered_keys":  [k for k in facts if k in {s["key"] for s in plan_steps}],
+                })
+    return cases
+
+
+async def collect(cases: list, concurrency: int) -> list:
+    from langchain_core.messages import HumanMessage
+    from llm_provider import llm
+
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(case):
+        async with gate:
+            start = time.perf_counter()
+            resp  = await llm.ainvoke([HumanMessage(content=ref_readiness_prompt(case["intent"], case["facts"]))])
+            match = re.search(r"\d+", resp.content)
+            return dict(case, llm_score=max(0, min(100, int(match.group()))) if match else None,
+                        llm_ms=round((time.perf_counter() - start) * 1e3, 1))
+
+    rows = await asyncio.gather(*(one(c) for c in cases))
+    return [r for r in rows if r["llm_score"] is not None]
+
+
+# ============================================================
+# REPORT
+# ============================================================
+
+def _band(score: int) -> int:
+    return next(i for i, (lo, hi) in enumerate(BANDS) if lo <= score <= hi)
+
+
+def _ranks(values: list) -> list:
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2
+        i = j + 1
+    return ranks
+
+
+def _correlation(x: list, y: list) -> float:
+    try:
+        return statistics.correlation(x, y)
+    except statistics.StatisticsError:      # constant input
+        return float("nan")
+
+
+def compare(local: list, llm: list) -> dict:
+    diffs = [a - b for a, b in zip(local, llm)]
+    return {
+        "mae":            round(statistics.mean(abs(d) for d in diffs), 2),
+        "rmse":           round(math.sqrt(statistics.mean(d * d for d in diffs)), 2),
+        "bias":           round(statistics.mean(diffs), 2),
+        "pearson":        round(_correlation(local, llm), 3),
+        "spearman":       round(_correlation(_ranks(local), _ranks(llm)), 3),
+        "band_agreement": round(sum(_band(a) == _band(b) for a, b in zip(local, llm)) / len(llm), 3),
+    }
+
+
+def fitted_evidence_weight(parts: list, llm: list) -> float:
+    """w minimising Σ(y − (w·E + (1−w)·C'))², C' = coverage_credit(C, E), clamped to [0, 1]."""
+    parts = [(e, coverage_credit(c, e)) for e, c in parts]
+    num = sum((y / 100 - c) * (e - c) for (e, c), y in zip(parts, llm))
+    den = sum((e - c) ** 2 for e, c in parts)
+    return round(min(1.0, max(0.0, num / den)), 2) if den else float("nan")
+
+
+def rubric_check() -> list:
+    case_facts = {f"case_fact_{i}": CASE_ANSWER for i in range(6)}
+    rows = []
+    for category in CATEGORY_WEIGHTS:
+        for answer, band in RUBRIC_CASES:
+            facts = dict(case_facts, evidence_available=answer, **PERSONAL)
+            score = assess(category, facts).score
+            rows.append({"category": category, "answer": answer, "band": band,
+                         "score": score, "ok": _band(score) == band})
+    return rows
+
+
+def print_rubric(rows: list) -> None:
+    labels = [f"{lo}-{hi}" for lo, hi in BANDS]
+    answers = list(dict.fromkeys(r["answer"] for r in rows))
+    print("rubric check (interview done): score per category, * = outside the band")
+    for i, (answer, band) in enumerate(RUBRIC_CASES, 1):
+        print(f"  {i}. [{labels[band]:>6}] {answer or '(no evidence answer)'}")
+    print(f"{'category':<30}" + "".join(f"{i:>6}" for i in range(1, len(answers) + 1)))
+    for category in CATEGORY_WEIGHTS:
+        cells = [r for r in rows if r["category"] == category]
+        print(f"{category:<30}" + "".join(f"{r['score']:>5}{' ' if r['ok'] else '*'}" for r in cells))
+    print(f"{sum(r['ok'] for r in rows)}/{len(rows)} in band\n")
+
+
+def report(rows: list) -> dict:
+    assessed = [assess(r["category"], r["facts"], r.get("interview_plan"), r.get("answered_keys")) for r in rows]
+    local    = [a.score for a in assessed]
+    llm      = [r["llm_score"] for r in rows]
+    fallback = [ref_fallback(r["facts"]) for r in rows]
+
+    result = {"cases": len(rows), "local": compare(local, llm), "old_fallback": compare(fallback, llm),
+              "confusion": Counter((_band(b), _band(a)) for a, b in zip(local, llm)), "categories": {}}
+
+    by_category = defaultdict(list)
+    for row, a in zip(rows, assessed):
+        by_category[row["category"]].append((row, a))
+    for category, items in sorted(by_category.items()):
+        y = [row["llm_score"] for row, _ in items]
+        result["categories"][category] = {
+            "n":              len(items),
+            "llm_mean":       round(statistics.mean(y), 1),
+            "local_mean":     round(statistics.mean(a.score for _, a in items), 1),
+            "mae":            round(statistics.mean(abs(a.score - row["llm_score"]) for row, a in items), 1),
+            "evidence_weight": CATEGORY_WEIGHTS.get(category, DEFAULT_WEIGHTS).evidence,
+            "fitted_weight":  fitted_evidence_weight([(a.evidence, a.coverage) for _, a in items], y),
+        }
+
+    row = rows[0]
+    result["local_us"] = round(min(timeit.repeat(
+        lambda: assess(row["category"], row["facts"], row.get("interview_plan"), row.get("answered_keys")),
+        number=5000, repeat=5)) / 5000 * 1e6, 2)
+    llm_ms = [r["llm_ms"] for r in rows if r.get("llm_ms") is not None]
+    result["llm_ms_p50"] = round(statistics.median(llm_ms), 1) if llm_ms else None
+    return result
+
+
+def print_report(result: dict) -> None:
+    print(f"{result['cases']} cases")
+    print(f"{'':<14} {'MAE':>6} {'RMSE':>6} {'bias':>6} {'pearson':>8} {'spearman':>9} {'same band':>10}")
+    for name in ("local", "old_fallback"):
+        m = result[name]
+        print(f"{name:<14} {m['mae']:>6} {m['rmse']:>6} {m['bias']:>6} {m['pearson']:>8} "
+              f"{m['spearman']:>9} {m['band_agreement']:>10.0%}")
+
+    labels = [f"{lo}-{hi}" for lo, hi in BANDS]
+    print("\nbands (rows: LLM, columns: local)")
+    print(f"{'':>8}" + "".join(f"{l:>8}" for l in labels))
+    for i, l in enumerate(labels):
+        print(f"{l:>8}" + "".join(f"{result['confusion'].get((i, j), 0):>8}" for j in range(len(BANDS))))
+
+    print(f"\n{'category':<30} {'n':>3} {'llm':>6} {'local':>6} {'MAE':>6} {'w_evid':>7} {'fitted':>7}")
+    for category, c in result["categories"].items():
+        print(f"{category:<30} {c['n']:>3} {c['llm_mean']:>6} {c['local_mean']:>6} {c['mae']:>6} "
+              f"{c['evidence_weight']:>7} {c['fitted_weight']:>7}")
+
+    llm = f", LLM call p50 {result['llm_ms_p50']} ms" if result["llm_ms_p50"] is not None else ""
+    print(f"\nlocal score: {result['local_us']} us per document{llm}")
+
+
+def run(args):
+    rubric = rubric_check()
+    print_rubric(rubric)
+    if args.rubric_only:
+        if args.json:
+            print(json.dumps({"rubric": rubric}))
+        return all(r["ok"] for r in rubric)
+
+    if args.sample:
+        with open(args.sample, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    else:
+        rows = asyncio.run(collect(scripted_cases(), args.concurrency))
+        if args.save:
+            with open(args.save, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in rows)
+    if os.getenv("LLM_PROVIDER") == "stub" and not args.sample:
+        print("LLM_PROVIDER=stub: LLM scores are the stub's formula; this checks the pipeline only\n")
+
+    result = report(rows)
+    print_report(result)
+    if args.json:
+        result["confusion"] = {f"{k[0]}->{k[1]}": v for k, v in sorted(result["confusion"].items())}
+        result["rubric"] = rubric
+        print(json.dumps(result))
+    return all(r["ok"] for r in rubric)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sample", help="JSONL file of cases with llm_score (skips collection)")
+    parser.add_argument("--save", help="write the collected sample to this JSONL file")
+    parser.add_argument("--concurrency", type=int, default=8, help="LLM calls in flight while collecting")
+    parser.add_argument("--rubric-only", action="store_true", help="only check the rubric bands (no LLM)")
+    parser.add_argument("--json", action="store_true", help="also print raw results as JSON")
+    sys.exit(0 if run(parser.parse_args()) else 1)
@@ -60,6 +60,9 @@ MODE B - "demand_letter_to_party" (sent directly to other party)
     [Phone]
     DISCLAIMER
 
+Both layouts are templates in data/templates (petition.txt, demand_letter.txt),
+compiled once by doc_templates.py.
+
 Rules for all modes:
   - Date always at the very TOP before From
   - First person throughout ("I", "my", "me") - never third person
@@ -69,56 +72,33 @@ Rules for all modes:
   - No disclaimer in document
 """
 
+import os
 import json
 import re
+import asyncio
 from datetime import date, datetime
+from typing import Callable, Optional
 from llm_provider import llm
 from langchain_core.messages import HumanMessage, SystemMessage
+from step_executor import Step, run_steps
+from address_parser import address_mentions, split_address_lines
+from telemetry import record_document_steps, record_fallback
+from text_utils import KeywordMatcher, redact_phone_numbers, strip_markdown
+from llm_json import ainvoke_json
+from statutes import statute_table
+from reference_data import reference
+from doc_templates import TEMPLATES
+from readiness import EVIDENCE_KEYS, readiness_score
 
 
-LANGUAGE_NAMES = {
-    "en": "English", "hi": "Hindi",  "ta": "Tamil",
-    "te": "Telugu",  "kn": "Kannada","ml": "Malayalam",
-    "mr": "Marathi", "bn": "Bengali","gu": "Gujarati",
-}
+# Max number of pipeline steps (LLM calls) in flight for one document.
+PIPELINE_CONCURRENCY = int(os.getenv("DOC_PIPELINE_CONCURRENCY", "4"))
 
-DOC_LABELS = {
-    "en": {
-        "date": "Date:", "from": "From:", "to": "To:", "sub": "Sub:",
-        "respected": "Respected Sir/Madam,", "thank_you": "Thank you.",
-        "faithfully": "Yours faithfully,", "signature": "(Signature)",
-        "name": "Name:", "contact": "Contact:", "place": "Place:",
-        "legal_provs": "Applicable Legal Provisions:",
-        "enclosures": "Enclosures:",
-        "attachments": "Relevant documents attached:",
-        "dear": "Dear",
-    },
-    "ta": {
-        "date": "தேதி:", "from": "அனுப்புநர்:", "to": "பெறுநர்:", "sub": "பொருள்:",
-        "respected": "மதிப்பிற்குரிய ஐயா/அம்மா,", "thank_you": "நன்றி.",
-        "faithfully": "இப்படிக்கு,", "signature": "(கையெழுத்து)",
-        "name": "பெயர்:", "contact": "தொடர்பு எண்:", "place": "இடம்:",
-        "legal_provs": "பொருந்தக்கூடிய சட்ட விதிகள்:",
-        "enclosures": "இணைப்புகள்:",
-        "attachments": "இணைக்கப்பட்டுள்ள ஆவணங்கள்:",
-        "dear": "மதிப்பிற்குரிய",
-    },
-    "hi": {
-        "date": "दिनांक:", "from": "प्रेषक:", "to": "सेवा में:", "sub": "विषय:",
-        "respected": "आदरणीय महोदय/महोदया,", "thank_you": "धन्यवाद।",
-        "faithfully": "भवदीय,", "signature": "(हस्ताक्षर)",
-        "name": "नाम:", "contact": "संपर्क:", "place": "स्थान:",
-        "legal_provs": "लागू कानूनी प्रावधान:",
-        "enclosures": "संलग्नक:",
-        "attachments": "संलग्न दस्तावेज:",
-        "dear": "प्रिय",
-    }
-}
+# Subject lines are composed from data/reference.json; set to 1 to also have
+# the LLM refine them (one more call per copy of the document). Languages with
+# no subject phrases there always get theirs from the LLM.
+SUBJECT_LLM_REFINE = os.getenv("SUBJECT_LLM_REFINE", "0") == "1"
 
-TAMIL_DAYS = {
-    "Monday": "திங்கள்", "Tuesday": "செவ்வாய்", "Wednesday": "புதன்",
-    "Thursday": "வியாழன்", "Friday": "வெள்ளி", "Saturday": "சனி", "Sunday": "ஞாயிறு"
-}
 
 # Doc types that go DIRECTLY to the other party (not an authority)
 DEMAND_LETTER_TYPES = {
@@ -126,42 +106,11 @@ DEMAND_LETTER_TYPES = {
     "family_petition",   # maintenance demand to spouse/family member
 }
 
-DISCLAIMER_EN = (
-    "This document has been automatically generated based solely on information provided by the user. "
-    "It is intended for informational and documentation purposes only and does not constitute legal advice. "
-    "Users are strongly advised to review or verify this document with a qualified legal professional "
-    "before official submission."
-)
-
-DISCLAIMER_TRANSLATIONS = {
-    "ta": (
-        "இந்த ஆவணம் பயனர் வழங்கிய தகவல்களின் அடிப்படையில் மட்டுமே தானாக உருவாக்கப்பட்டது. "
-        "இது தகவல் மற்றும் ஆவணத் தயாரிப்பு நோக்கத்திற்காக மட்டுமே வழங்கப்படுகிறது. "
-        "இது சட்ட ஆலோசனையாக கருதப்படக்கூடாது. "
-        "அதிகாரப்பூர்வமாக சமர்ப்பிப்பதற்கு முன் தகுதியான சட்ட நிபுணரால் சரிபார்க்கப்பட வேண்டும்."
-    ),
-    "hi": (
-        "यह दस्तावेज़ उपयोगकर्ता द्वारा प्रदान की गई जानकारी के आधार पर स्वचालित रूप से तैयार किया गया है। "
-        "यह केवल सूचना और दस्तावेज़ीकरण उद्देश्यों के लिए है और कानूनी सलाह नहीं है। "
-        "आधिकारिक प्रस्तुति से पहले किसी योग्य कानूनी पेशेवर से समीक्षा कराने की सलाह दी जाती है।"
-    ),
-    "te": (
-        "ఈ పత్రం వినియోగదారు అందించిన సమాచారం ఆధారంగా స్వయంచాలకంగా రూపొందించబడింది. "
-        "ఇది సమాచార మరియు డాక్యుమెంటేషన్ ప్రయోజనాల కోసం మాత్రమే — చట్టపరమైన సలహా కాదు."
-    ),
-    "kn": (
-        "ಈ ದಾಖಲೆಯನ್ನು ಬಳಕೆದಾರರು ಒದಗಿಸಿದ ಮಾಹಿತಿಯ ಆಧಾರದ ಮೇಲೆ ಸ್ವಯಂಚಾಲಿತವಾಗಿ ರಚಿಸಲಾಗಿದೆ. "
-        "ಇದು ಕೇವಲ ಮಾಹಿತಿ ಮತ್ತು ದಾಖಲಾತಿ ಉದ್ದೇಶಗಳಿಗಾಗಿ ಮಾತ್ರ — ಕಾನೂನು ಸಲಹೆ ಅಲ್ಲ."
-    ),
-    "ml": (
-        "ഈ രേഖ ഉപയോക്താവ് നൽകിയ വിവരങ്ങളുടെ അടിസ്ഥാനത്തിൽ സ്വയംചാലകമായി സൃഷ്ടിക്കപ്പെട്ടതാണ്. "
-        "ഇത് വിവരണ, ഡോക്യുമെന്റേഷൻ ആവശ്യങ്ങൾക്ക് മാത്രമുള്ളതാണ് — നിയമ ഉപദേശമല്ല."
-    ),
-}
-
 
+# Language names, document labels, day names and disclaimers live in
+# data/reference.json (see reference_data.py).
 def get_disclaimer(lang: str) -> str:
-    return DISCLAIMER_TRANSLATIONS.get(lang, DISCLAIMER_EN)
+    return reference().disclaimer(lang)
 
 
 def is_real_value(v) -> bool:
@@ -187,39 +136,17 @@ def _facts_text(clean: dict) -> str:
 
 
 def _strip_md(text: str) -> str:
-    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
-    text = re.sub(r'__(.+?)__',     r'\1', text)
-    text = re.sub(r'#{1,6}\s*',     '',    text)
-    return text.replace("```", "").strip()
-
-
-def _parse_json(raw: str) -> dict:
-    raw = raw.strip()
-    raw = re.sub(r'^```(?:json)?\s*', '', raw, flags=re.MULTILINE)
-    raw = re.sub(r'\s*```\s*$',       '', raw, flags=re.MULTILINE)
-    m = re.search(r'\{.*\}', raw, re.DOTALL)
-    if m:
-        raw = m.group(0)
-    return json.loads(raw)
-
-
-def _norm(s: str) -> str:
-    """Normalise for overlap detection: lowercase, strip spaces/dashes/commas."""
-    s = s.lower()
-    s = re.sub(r'[\s,\-\u2013\u2014]+', '', s)
-    return s
+    return strip_markdown(text, all_hashes=True)
 
 
 def _already_in(text: str, value: str) -> bool:
-    if not value or not text:
-        return True
-    return _norm(value) in _norm(text)
+    return address_mentions(text, value)
 
 
 # ---------------------------------------------------------------------------
 # STEP 1 - Classify intent
 # ---------------------------------------------------------------------------
-def _classify_intent(intent: str, facts: dict) -> dict:
+async def _classify_intent(intent: str, facts: dict) -> dict:
     clean = _clean_facts(facts)
     prompt = f"""You are an Indian legal document classifier with deep knowledge of Indian law.
 Carefully read the legal issue and facts, then make the CORRECT classification.
@@ -266,12 +193,11 @@ Return valid JSON only - no markdown:
 }}
 """
     try:
-        resp = llm.invoke([
+        data = await ainvoke_json([
             SystemMessage(content="Indian legal classifier. Return JSON only, no markdown."),
             HumanMessage(content=prompt)
         ])
-        data = _parse_json(resp.content)
-        doc_type = str(data.get("doc_type", "general_petition")).strip()
+        doc_type = data["doc_type"]
         print(f"[_classify_intent] doc_type={doc_type}, reasoning={data.get('reasoning','')}")
 
         authority_location = ""
@@ -346,6 +272,7 @@ Return valid JSON only - no markdown:
         }
     except Exception as e:
         print(f"[_classify_intent] error: {e}")
+        record_fallback("doc_classification")
         return {
             "doc_type": "general_petition",
             "authority": "The Concerned Authority",
@@ -358,28 +285,10 @@ Return valid JSON only - no markdown:
 
 
 # ---------------------------------------------------------------------------
-# STEP 2 - Extract scalar header values
+# STEP 2 - Scalar header values and subject line
 # ---------------------------------------------------------------------------
-def _extract_scalars(intent: str, facts: dict, language: str) -> dict:
-    clean     = _clean_facts(facts)
-    lang_name = LANGUAGE_NAMES.get(language, "English")
-
-    subject = ""
-    try:
-        resp = llm.invoke([
-            SystemMessage(content="Subject line writer. JSON only."),
-            HumanMessage(content=(
-                f"Write a short subject line (max 10 words) for an Indian legal complaint.\n"
-                f"Language: {lang_name}\nLegal issue: {intent}\n"
-                f"Facts: {_facts_text(clean)}\n\n"
-                f'Return JSON only: {{"subject": "<one-line subject in {lang_name}>"}}'
-            ))
-        ])
-        subject = _parse_json(resp.content).get("subject", "").strip()
-    except Exception as e:
-        print(f"[_extract_scalars/subject] {e}")
-    if not subject:
-        subject = f"Complaint regarding {intent[:60]}"
+def _extract_scalars(facts: dict) -> dict:
+    clean = _clean_facts(facts)
 
     def fv(*keys, default=""):
         for k in keys:
@@ -404,32 +313,76 @@ def _extract_scalars(intent: str, facts: dict, language: str) -> dict:
         "district_raw":  district,
         "state_raw":     state,
         "phone":         phone,
-        "subject":       subject,
     }
 
 
+def _category(intent: str) -> str:
+    """The category the intent starts with ("Theft / Robbery — <user message>")."""
+    return intent.split(" — ", 1)[0].strip()
+
+
+def _compose_subject(intent: str, classification: dict, language: str) -> str:
+    """Subject line from the per-language phrases in data/reference.json: the
+    doc_type's phrase, the matter for the intent's category, and the other
+    party when the document names one."""
+    return reference().subject(language, classification["doc_type"], _category(intent),
+                               classification.get("other_party", ""))
+
+
+def _subject_by_llm(language: str) -> bool:
+    return SUBJECT_LLM_REFINE or not reference().has_subjects(language)
+
+
+async def _refine_subject(intent: str, facts: dict, language: str, draft: str) -> str:
+    """Let the LLM make the composed subject more specific (SUBJECT_LLM_REFINE=1),
+    or write it in a language without subject phrases from the English draft."""
+    lang_name = reference().language_name(language)
+    try:
+        data = await ainvoke_json([
+            SystemMessage(content="Subject line writer. JSON only."),
+            HumanMessage(content=(
+                f"Write a short subject line (max 10 words) for an Indian legal complaint.\n"
+                f"Language: {lang_name}\nLegal issue: {intent}\n"
+                f"Facts: {_facts_text(_clean_facts(facts))}\n"
+                f"Draft: {draft}\n\n"
+                f"Keep the draft's meaning; make it specific to the facts.\n"
+                f'Return JSON only: {{"subject": "<one-line subject in {lang_name}>"}}'
+            ))
+        ])
+        return data["subject"] or draft
+    except Exception as e:
+        print(f"[_refine_subject] {e}")
+        record_fallback("subject")
+        return draft
+
+
 # ---------------------------------------------------------------------------
 # STEP 3 - Generate body + evidence list
 # ---------------------------------------------------------------------------
-def _generate_body(intent: str, facts: dict, language: str,
-                   is_demand_letter: bool = False,
-                   other_party: str = "") -> tuple:
-    lang_name = LANGUAGE_NAMES.get(language, "English")
+# Evidence fact keys are shared with the readiness score (readiness.py). Long
+# evidence answers are only passed on when they name a kind of document; this
+# list is narrower than the readiness weights (no policy / medical / witness),
+# so the body keeps what it has always been given.
+BODY_EVIDENCE_KEYWORDS = KeywordMatcher([
+    "receipt", "bill", "sms", "screenshot", "photo", "video",
+    "cctv", "statement", "certificate", "agreement", "contract",
+    "report", "invoice", "bank", "email", "whatsapp", "message",
+    "proof", "record", "document", "evidence",
+])
+
+
+async def _generate_body(intent: str, facts: dict, language: str,
+                         is_demand_letter: bool = False,
+                         other_party: str = "",
+                         on_token: Optional[Callable[[str], None]] = None) -> tuple:
+    lang_name = reference().language_name(language)
     clean     = _clean_facts(facts)
 
-    evidence_keys = ["evidence_available", "evidence_details",
-                     "documents_available", "proof_available"]
     evidence_raw_parts = []
-    for k in evidence_keys:
+    for k in EVIDENCE_KEYS:
         v = str(clean.get(k, "")).strip()
-        if v:
-            doc_keywords = ["receipt", "bill", "sms", "screenshot", "photo", "video",
-                            "cctv", "statement", "certificate", "agreement", "contract",
-                            "report", "invoice", "bank", "email", "whatsapp", "message",
-                            "proof", "record", "document", "evidence"]
-            has_doc_keyword = any(kw in v.lower() for kw in doc_keywords)
-            if has_doc_keyword or len(v) < 50:
-                evidence_raw_parts.append(v)
+        if v and (len(v) < 50 or BODY_EVIDENCE_KEYWORDS.search(v)):
+            evidence_raw_parts.append(v)
     evidence_raw = " | ".join(evidence_raw_parts).strip()
 
     if is_demand_letter:
@@ -491,14 +444,24 @@ Rules:
 - If no specific documents -> write: 1. Relevant documents and evidence will be submitted upon request.
 - NEVER list complaint narrative as evidence.
 """
+    messages = [
+        SystemMessage(content="Legal letter writer. Plain text only. No markdown."),
+        HumanMessage(content=prompt)
+    ]
     try:
-        resp = llm.invoke([
-            SystemMessage(content="Legal letter writer. Plain text only. No markdown."),
-            HumanMessage(content=prompt)
-        ])
-        raw = _strip_md(resp.content)
+        if on_token is None:
+            resp = await llm.ainvoke(messages)
+            raw  = _strip_md(resp.content)
+        else:
+            parts = []
+            async for chunk in llm.astream(messages):
+                if chunk.content:
+                    parts.append(chunk.content)
+                    on_token(chunk.content)
+            raw = _strip_md("".join(parts))
     except Exception as e:
         print(f"[_generate_body] error: {e}")
+        record_fallback("body")
         raw = ("I respectfully submit the following.\n\n"
                "I have suffered loss due to the matter described.\n\n"
                "I request immediate resolution of this matter.\n\n"
@@ -524,8 +487,7 @@ Rules:
     documents_list  = doc_part.strip() or "1. Relevant documents and evidence will be submitted upon request."
 
     # Strip phone numbers leaked into body
-    body_paragraphs = re.sub(r'\b(?:\+91[\s\-]?)?[6-9]\d{9}\b', '[number redacted]', body_paragraphs)
-    body_paragraphs = re.sub(r'\b0\d{2,4}[\s\-]?\d{6,8}\b', '[number redacted]', body_paragraphs)
+    body_paragraphs = redact_phone_numbers(body_paragraphs)
 
     return body_paragraphs, documents_list
 
@@ -534,405 +496,247 @@ Rules:
 # STEP 4A - Applicable laws
 # ---------------------------------------------------------------------------
 def get_applicable_laws(doc_type: str, facts: dict) -> list:
-    applicable_laws = []
-    facts_text = " ".join(str(v).lower() for v in facts.values() if v)
-
-    if doc_type == "police_complaint_fir":
-        applicable_laws.append("Code of Criminal Procedure 1973, Section 154 - Registration of FIR")
-        if any(k in facts_text for k in ["theft", "stolen", "robbery", "burglary", "stole"]):
-            applicable_laws.append("Indian Penal Code 1860, Section 379 - Punishment for theft")
-            if "house" in facts_text or "home" in facts_text:
-                applicable_laws.append("Indian Penal Code 1860, Section 380 - Theft in dwelling house")
-        if any(k in facts_text for k in ["assault", "attack", "beat", "hit", "violence", "hurt"]):
-            applicable_laws.append("Indian Penal Code 1860, Section 323 - Voluntarily causing hurt")
-        if any(k in facts_text for k in ["cheat", "fraud", "dishonest", "deceive"]):
-            applicable_laws.append("Indian Penal Code 1860, Section 420 - Cheating")
-        if any(k in facts_text for k in ["harass", "modesty", "woman", "female", "girl"]):
-            applicable_laws.append("Indian Penal Code 1860, Section 354 - Outraging modesty")
-            applicable_laws.append("Indian Penal Code 1860, Section 509 - Insulting modesty of a woman")
-        if any(k in facts_text for k in ["threat", "intimidate", "blackmail"]):
-            applicable_laws.append("Indian Penal Code 1860, Section 506 - Criminal intimidation")
-
-    elif doc_type == "cyber_fraud_complaint":
-        applicable_laws.append("Information Technology Act 2000, Section 66C - Identity theft")
-        applicable_laws.append("Information Technology Act 2000, Section 66D - Cheating by personation")
-        applicable_laws.append("Indian Penal Code 1860, Section 420 - Cheating")
-
-    elif doc_type == "consumer_complaint":
-        applicable_laws.append("Consumer Protection Act 2019, Section 35 - Consumer disputes redressal")
-        applicable_laws.append("Consumer Protection Act 2019, Section 2(7) - Definition of consumer")
-        if any(k in facts_text for k in ["defective", "defect", "faulty", "not working"]):
-            applicable_laws.append("Consumer Protection Act 2019, Section 2(10) - Definition of defect")
-        if any(k in facts_text for k in ["unfair", "misleading"]):
-            applicable_laws.append("Consumer Protection Act 2019, Section 2(47) - Unfair trade practice")
-
-    elif doc_type == "legal_notice":
-        if any(k in facts_text for k in ["property", "land", "house", "rent", "landlord", "tenant"]):
-            applicable_laws.append("Transfer of Property Act 1882")
-            applicable_laws.append("Specific Relief Act 1963, Section 9 - Specific performance")
-        if any(k in facts_text for k in ["contract", "agreement", "breach"]):
-            applicable_laws.append("Indian Contract Act 1872, Section 73 - Compensation for breach")
-        if any(k in facts_text for k in ["loan", "debt", "owe", "borrow", "repay"]):
-            applicable_laws.append("Civil Procedure Code 1908, Order 37 - Summary Procedure")
-
-    elif doc_type == "workplace_complaint":
-        applicable_laws.append("Industrial Disputes Act 1947, Section 2(s) - Definition of workman")
-        if any(k in facts_text for k in ["salary", "wage", "payment", "unpaid"]):
-            applicable_laws.append("Payment of Wages Act 1936, Section 5 - Time of payment")
-        if any(k in facts_text for k in ["terminate", "dismiss", "fire", "retrench"]):
-            applicable_laws.append("Industrial Disputes Act 1947, Section 25F - Retrenchment conditions")
-        if any(k in facts_text for k in ["harassment", "sexual", "misconduct"]):
-            applicable_laws.append("Sexual Harassment of Women at Workplace Act 2013")
-
-    elif doc_type == "banking_complaint":
-        applicable_laws.append("Banking Regulation Act 1949")
-        applicable_laws.append("Reserve Bank of India Act 1934")
-        if any(k in facts_text for k in ["unauthorized", "debit", "transaction", "fraud"]):
-            applicable_laws.append("Payment and Settlement Systems Act 2007")
-
-    elif doc_type == "insurance_complaint":
-        applicable_laws.append("Insurance Act 1938")
-        applicable_laws.append("Insurance Regulatory and Development Authority Act 1999")
-        if any(k in facts_text for k in ["claim", "reject", "denial"]):
-            applicable_laws.append("IRDAI (Protection of Policyholders' Interests) Regulations 2017")
-
-    elif doc_type == "rti_application":
-        applicable_laws.append("Right to Information Act 2005, Section 6 - Request for information")
-        applicable_laws.append("Right to Information Act 2005, Section 7 - Disposal of request")
-
-    elif doc_type == "property_dispute":
-        applicable_laws.append("Transfer of Property Act 1882")
-        applicable_laws.append("Indian Easements Act 1882")
-        if any(k in facts_text for k in ["encroachment", "boundary", "trespass"]):
-            applicable_laws.append("Specific Relief Act 1963, Section 38 - Perpetual injunction")
-
-    elif doc_type == "family_petition":
-        if any(k in facts_text for k in ["maintenance", "alimony", "spouse", "wife", "husband"]):
-            applicable_laws.append("Code of Criminal Procedure 1973, Section 125 - Maintenance")
-            applicable_laws.append("Hindu Marriage Act 1955, Section 24 - Maintenance pendente lite")
-        if any(k in facts_text for k in ["divorce", "separation"]):
-            applicable_laws.append("Hindu Marriage Act 1955, Section 13 - Divorce")
-
-    seen = set()
-    return [law for law in applicable_laws if not (law in seen or seen.add(law))]
+    """Laws to cite, from the statute table in data/statutes.json (see statutes.py)."""
+    return statute_table().applicable(doc_type, facts)
 
 
 # ---------------------------------------------------------------------------
-# Helper: split address into lines, merging number-only prefixes
+# STEP 4A/4B - Assemble the document from its template (data/templates)
 # ---------------------------------------------------------------------------
-def _split_address_lines(raw_addr: str) -> list:
-    """Split comma-separated address into clean lines.
-    Merges a standalone number prefix (e.g. "7") with the next part so
-    "7, Mariamman Koil Street" renders as one line, not two."""
-    if not raw_addr:
-        return []
-    raw_parts = [p.strip().rstrip(',').strip() for p in raw_addr.split(',')]
-    merged = []
-    i = 0
-    while i < len(raw_parts):
-        part = raw_parts[i]
-        # If this part is just a number or short plot prefix, merge with next part
-        if part and re.match(r'^\d+[A-Za-z]?$', part) and i + 1 < len(raw_parts):
-            merged.append(f"{part}, {raw_parts[i + 1]}")
-            i += 2
-        elif part:
-            merged.append(part)
-            i += 1
-        else:
-            i += 1
-    return merged
+_TRAILING_PUNCT = re.compile(r'[\s,\-\u2013\u2014]+$')
+_PARAGRAPH_GAP  = re.compile(r'\n{2,}')
+_LIST_NUMBER    = re.compile(r'^\d+\.\s*')
+_NUMBERED_LINE  = re.compile(r'^\d+\.')
+
+
+def _layout_values(scalars: dict, body_paragraphs: str, documents_list: str,
+                   recipient: str, today_str: str, doc_type: str, facts: dict,
+                   disclaimer: str) -> dict:
+    """Values shared by both layouts; the caller adds recipient_lines and its own."""
+    lang     = scalars.get("user_language", "en")
+    name     = scalars.get("full_name",    "")
+    address  = scalars.get("full_address", "")
+
+    # Format date with the regional day name where the reference data has one
+    today    = datetime.now()
+    day_name = reference().day_name(lang, today.strftime('%A'))
+
+    addr_clean = _TRAILING_PUNCT.sub('', address).strip() if address else ""
+    paragraphs = [p.strip() for p in _PARAGRAPH_GAP.split(body_paragraphs) if p.strip()]
+    documents  = [_LIST_NUMBER.sub('', line.strip()) for line in documents_list.splitlines()]
+
+    return {
+        "date":          today.strftime(f'%d/%m/%Y ({day_name})'),
+        "sender":        name.strip().rstrip(',') if name else "",
+        "address_lines": split_address_lines(addr_clean),
+        "recipient":     recipient.strip().rstrip(',') if recipient else "",
+        "subject":       scalars.get("subject", ""),
+        "body":          "\n\n".join(paragraphs),
+        "laws":          get_applicable_laws(doc_type, facts),
+        "documents":     [d for d in documents if d],
+        "name":          name,
+        "phone":         scalars.get("phone", ""),
+        "place":         scalars.get("district_raw", "") or scalars.get("state_raw", "") or "",
+        "today":         today_str,
+        "disclaimer":    disclaimer,
+    }
 
 
-# ---------------------------------------------------------------------------
-# STEP 4A - Assemble petition to authority
-# ---------------------------------------------------------------------------
 def _assemble_petition(scalars: dict, body_paragraphs: str, documents_list: str,
                        authority: str, authority_location: str, today_str: str,
                        doc_type: str, facts: dict,
                        disclaimer: str = "", reference_number: str = "") -> str:
-    lbl = DOC_LABELS.get(scalars.get("user_language", "en"), DOC_LABELS["en"])
-    if scalars.get("user_language") == "en": lbl = DOC_LABELS["en"] # fallback
+    values = _layout_values(scalars, body_paragraphs, documents_list, authority,
+                            today_str, doc_type, facts, disclaimer)
+
+    auth_loc = (authority_location or "India").strip().rstrip(',')
+    if '\n' in auth_loc:
+        loc_lines = [l.strip().rstrip(',') for l in auth_loc.split('\n') if l.strip()]
+    elif auth_loc.count(',') >= 2:
+        loc_lines = [p.strip().rstrip(',') for p in auth_loc.split(',') if p.strip()]
+    else:
+        loc_lines = [auth_loc]
+    values["recipient_lines"] = [l for l in loc_lines if l and l != authority.strip()]
 
-    name     = scalars.get("full_name",    "")
-    address  = scalars.get("full_address", "")
-    phone    = scalars.get("phone",        "")
-    subject  = scalars.get("subject",      "")
-    district_raw = scalars.get("district_raw", "")
-    state_raw    = scalars.get("state_raw",    "")
-
-    # Format date with regional day name if Tamil
-    today = datetime.now()
-    day_name = today.strftime('%A')
-    if scalars.get("user_language") == "ta":
-        day_name = TAMIL_DAYS.get(day_name, day_name)
-    date_str = today.strftime(f'%d/%m/%Y ({day_name})')
-
-    auth_loc   = authority_location if authority_location else "India"
-    addr_clean = re.sub(r'[\s,\-\u2013\u2014]+$', '', address).strip() if address else ""
-
-    applicable_laws = get_applicable_laws(doc_type, facts)
-    addr_lines      = _split_address_lines(addr_clean)
-
-    parts = []
-    parts.append(f"{lbl['date']} {date_str}")
-    parts.append("")
-
-    parts.append(lbl['from'])
-    if name:
-        parts.append(name.strip().rstrip(','))
-    for line in addr_lines:
-        parts.append(line)
-    parts.append("")
-
-    parts.append(lbl['to'])
-    if authority:
-        parts.append(authority.strip().rstrip(','))
-    if auth_loc:
-        auth_loc_normalized = auth_loc.strip().rstrip(',')
-        if '\n' in auth_loc_normalized:
-            loc_lines = [l.strip().rstrip(',') for l in auth_loc_normalized.split('\n') if l.strip()]
-        elif auth_loc_normalized.count(',') >= 2:
-            loc_lines = [p.strip().rstrip(',') for p in auth_loc_normalized.split(',') if p.strip()]
-        else:
-            loc_lines = [auth_loc_normalized]
-        for loc_line in loc_lines:
-            if loc_line and loc_line != authority.strip():
-                parts.append(loc_line)
-    parts.append("")
-    parts.append(f"{lbl['sub']} {subject}")
-    parts.append("")
-    parts.append(lbl['respected'])
-    parts.append("")
-
-    paragraphs = [p.strip() for p in re.split(r'\n{2,}', body_paragraphs) if p.strip()]
-    parts.append("\n\n".join(paragraphs))
-    parts.append("")
-
-    if applicable_laws:
-        parts.append(lbl['legal_provs'])
-        for law in applicable_laws:
-            parts.append(f"  \u2022 {law}")
-        parts.append("")
-
-    parts.append(lbl['attachments'])
-    for line in documents_list.splitlines():
-        stripped = re.sub(r'^\d+\.\s*', '', line.strip())
-        if stripped:
-            parts.append(f"  \u2022 {stripped}")
-    parts.append("")
-    parts.append(lbl['thank_you'])
-    parts.append("")
-    parts.append(lbl['faithfully'])
-    parts.append("")
-    parts.append("")
-    parts.append("________________________")
-    parts.append(lbl['signature'])
-    parts.append("")
-    if name:
-        parts.append(f"{lbl['name']} {name}")
-    if phone:
-        parts.append(f"{lbl['contact']} {phone}")
-    place = district_raw or state_raw or ""
-    if place:
-        parts.append(f"{lbl['place']} {place}")
-    parts.append(f"{lbl['date']} {today_str}")
-    if disclaimer:
-        parts.append("")
-        parts.append("DISCLAIMER")
-        parts.append("")
-        parts.append(disclaimer)
-
-    return "\n".join(parts).strip()
+    return TEMPLATES["petition"].render(scalars.get("user_language", "en"), values)
 
 
-# ---------------------------------------------------------------------------
-# STEP 4B - Assemble demand letter to other party
-# ---------------------------------------------------------------------------
 def _assemble_demand_letter(scalars: dict, body_paragraphs: str, documents_list: str,
                             other_party: str, other_party_location: str,
                             today_str: str, doc_type: str, facts: dict,
                             disclaimer: str = "", reference_number: str = "") -> str:
-    lbl = DOC_LABELS.get(scalars.get("user_language", "en"), DOC_LABELS["en"])
-    if scalars.get("user_language") == "en": lbl = DOC_LABELS["en"] # fallback
+    values = _layout_values(scalars, body_paragraphs, documents_list, other_party,
+                            today_str, doc_type, facts, disclaimer)
 
-    name     = scalars.get("full_name",    "")
-    address  = scalars.get("full_address", "")
-    phone    = scalars.get("phone",        "")
-    subject  = scalars.get("subject",      "")
-    district_raw = scalars.get("district_raw", "")
-    state_raw    = scalars.get("state_raw",    "")
-
-    # Format date with regional day name if Tamil
-    today = datetime.now()
-    day_name = today.strftime('%A')
-    if scalars.get("user_language") == "ta":
-        day_name = TAMIL_DAYS.get(day_name, day_name)
-    date_str = today.strftime(f'%d/%m/%Y ({day_name})')
-
-    addr_clean = re.sub(r'[\s,\-\u2013\u2014]+$', '', address).strip() if address else ""
-    salutation = f"{lbl['dear']} {other_party}," if other_party else lbl['respected']
-
-    applicable_laws = get_applicable_laws(doc_type, facts)
-    addr_lines      = _split_address_lines(addr_clean)
-
-    parts = []
-    parts.append(f"{lbl['date']} {date_str}")
-    parts.append("")
-
-    parts.append(lbl['from'])
-    if name:
-        parts.append(name.strip().rstrip(','))
-    for line in addr_lines:
-        parts.append(line)
-    parts.append("")
-
-    parts.append(lbl['to'])
-    if other_party:
-        parts.append(other_party.strip().rstrip(','))
-    if other_party_location:
-        for p in other_party_location.split(','):
-            loc_part = p.strip().rstrip(',')
-            if loc_part:
-                parts.append(loc_part)
-    parts.append("")
-    parts.append(f"{lbl['sub']} {subject}")
-    parts.append("")
-    parts.append(salutation)
-    parts.append("")
-
-    paragraphs = [p.strip() for p in re.split(r'\n{2,}', body_paragraphs) if p.strip()]
-    parts.append("\n\n".join(paragraphs))
-    parts.append("")
-
-    if applicable_laws:
-        parts.append(lbl['legal_provs'])
-        for law in applicable_laws:
-            parts.append(f"  \u2022 {law}")
-        parts.append("")
-
-    has_real_docs = any(
+    values["recipient_lines"] = [p.strip().rstrip(',') for p in (other_party_location or "").split(',')
+                                 if p.strip().rstrip(',')]
+    values["other_party"]     = other_party
+    values["has_documents"]   = any(
         line.strip() and not line.strip().lower().startswith("relevant documents and evidence will be submitted")
-        for line in documents_list.splitlines() if re.match(r'^\d+\.', line.strip())
+        for line in documents_list.splitlines() if _NUMBERED_LINE.match(line.strip())
     )
-    if has_real_docs:
-        parts.append(lbl['enclosures'])
-        for line in documents_list.splitlines():
-            stripped = re.sub(r'^\d+\.\s*', '', line.strip())
-            if stripped:
-                parts.append(f"  \u2022 {stripped}")
-        parts.append("")
-
-    parts.append(lbl['thank_you'])
-    parts.append("")
-    parts.append(lbl['faithfully'])
-    parts.append("")
-    parts.append("")
-    parts.append("________________________")
-    parts.append(lbl['signature'])
-    parts.append("")
-    if name:
-        parts.append(f"{lbl['name']} {name}")
-    if phone:
-        parts.append(f"{lbl['contact']} {phone}")
-    place = district_raw or state_raw or ""
-    if place:
-        parts.append(f"{lbl['place']} {place}")
-    parts.append(f"{lbl['date']} {today_str}")
-    if disclaimer:
-        parts.append("")
-        parts.append("DISCLAIMER")
-        parts.append("")
-        parts.append(disclaimer)
-
-    return "\n".join(parts).strip()
+
+    return TEMPLATES["demand_letter"].render(scalars.get("user_language", "en"), values)
 
 
 # ---------------------------------------------------------------------------
 # STEP 5 - Readiness score
 # ---------------------------------------------------------------------------
-def _calculate_readiness(intent: str, facts: dict) -> int:
-    clean = _clean_facts(facts)
-    prompt = (
-        f"Score the evidence readiness of this Indian legal complaint from 0 to 100.\n\n"
-        f"Legal issue: {intent}\nFacts:\n{_facts_text(clean)}\n\n"
-        "Scoring:\n"
-        "- 90-100: Strong documentary evidence\n"
-        "- 60-89:  Some evidence but gaps\n"
-        "- 30-59:  Limited evidence, mostly verbal\n"
-        "- 0-29:   No evidence at all\n\n"
-        "Return ONLY an integer. No text."
-    )
+def _calculate_readiness(intent: str, facts: dict, interview_plan: Optional[list] = None,
+                         answered_keys: Optional[list] = None) -> int:
+    """Local score from the evidence answers and plan coverage (readiness.py)."""
+    return readiness_score(_category(intent), _clean_facts(facts), interview_plan, answered_keys)
+
+
+# ---------------------------------------------------------------------------
+# STEP 6 - Pre-translate header info/facts for bilingual consistency
+# ---------------------------------------------------------------------------
+TRANSLATED_CLASSIFICATION_FIELDS = ["authority", "authority_location", "other_party", "other_party_location"]
+
+
+async def _translate_classification(classification: dict, user_language: str) -> dict:
+    """Translate the To-block fields of the classification into the user's language."""
+    translated = classification.copy()
+    text_to_translate = " | ".join(str(classification.get(f, "")) for f in TRANSLATED_CLASSIFICATION_FIELDS)
+
+    prompt = f"""Translate these Indian legal entity names/locations into {reference().language_name(user_language, 'Tamil')}.
+Keep original meaning. Return as piped list.
+
+Text: {text_to_translate}
+"""
     try:
-        resp  = llm.invoke([HumanMessage(content=prompt)])
-        score = int(re.search(r'\d+', resp.content).group())
-        return max(0, min(100, score))
+        resp = await llm.ainvoke([HumanMessage(content=prompt)])
+        vals = [v.strip() for v in resp.content.split("|")]
+        for i, f in enumerate(TRANSLATED_CLASSIFICATION_FIELDS):
+            if i < len(vals): translated[f] = vals[i]
     except Exception:
-        return min(100, len(clean) * 10)
+        record_fallback("entity_translation")
+    return translated
+
+
+async def _translate_facts_to_english(facts: dict) -> dict:
+    """Translate the facts used in From/To or Body into English (for the English copy),
+    and the evidence answers, which the readiness score reads for English keywords."""
+    translated = facts.copy()
+    facts_to_translate = {k: v for k, v in facts.items()
+                          if k in EVIDENCE_KEYS or any(x in k for x in ["name", "address", "location", "details", "subject"])}
+    if facts_to_translate:
+        prompt = f"Translate these factual details into English. Return as JSON. Details: {json.dumps(facts_to_translate)}"
+        try:
+            trans_facts = await ainvoke_json([HumanMessage(content=prompt)])
+            for k, v in trans_facts.items(): translated[k] = _strip_md(v)
+        except Exception:
+            record_fallback("fact_translation")
+    return translated
 
 
 # ---------------------------------------------------------------------------
 # PUBLIC ENTRY POINT
 # ---------------------------------------------------------------------------
-def generate_bilingual_document(intent: str, facts: dict,
-                                user_language: str = "en") -> dict:
+async def agenerate_bilingual_document(intent: str, facts: dict,
+                                       user_language: str = "en",
+                                       max_concurrency: int = PIPELINE_CONCURRENCY,
+                                       emit: Optional[Callable[[dict], None]] = None,
+                                       interview_plan: Optional[list] = None,
+                                       answered_keys: Optional[list] = None) -> dict:
+    """Generate the English and user-language documents.
+
+    The LLM calls run as a dependency graph: classification and fact
+    translation start together, and each body is written as soon as the
+    classification (and translation) it needs is ready. Subject lines are
+    composed without the LLM unless SUBJECT_LLM_REFINE is set, in which case
+    each is refined alongside its body. A user language with no subject
+    phrases in data/reference.json always gets its subject from the LLM.
+    The readiness score is computed locally from the English facts
+    (readiness.py), with plan coverage taken from interview_plan /
+    answered_keys when the caller has them. Step timings go to
+    legal_document_step_duration_seconds and into the result.
+
+    If emit is given, progress is reported as it happens: "classified" and
+    "readiness" events when those steps finish, and the letter bodies are
+    streamed as "token" events (stage body_en / body_user) followed by
+    "body_done".
+    """
     today_str    = date.today().strftime("%d/%m/%Y")
     generated_at = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+    bilingual    = user_language != "en"
+
+    def _tokens(stage: str):
+        if emit is None:
+            return None
+        return lambda text: emit({"event": "token", "stage": stage, "text": text})
+
+    def _on_result(name: str, value) -> None:
+        if name == "classify":
+            emit({"event": "classified", "document_type": value["doc_type"],
+                  "authority": value["authority"], "other_party": value["other_party"],
+                  "is_demand_letter": value["is_demand_letter"]})
+        elif name == "readiness":
+            emit({"event": "readiness", "readiness_score": value})
+        elif name in ("body_en", "body_user"):
+            emit({"event": "body_done", "stage": name})
+
+    # English copy uses translated facts (mostly English now) and original English classification.
+    # User lang copy uses original user facts and translated classification.
+    steps = [
+        Step("classify",  lambda r: _classify_intent(intent, facts)),
+        Step("readiness",
+             lambda r: _identity(_calculate_readiness(intent, r["facts_en"], interview_plan, answered_keys)),
+             deps=["facts_en"]),
+        Step("body_en",
+             lambda r: _generate_body(
+                 intent, r["facts_en"], "en",
+                 is_demand_letter=r["classify"]["is_demand_letter"],
+                 other_party=r["classify"]["other_party"],
+                 on_token=_tokens("body_en"),
+             ),
+             deps=["classify", "facts_en"]),
+    ]
+    if bilingual:
+        steps += [
+            Step("facts_en",  lambda r: _translate_facts_to_english(facts)),
+            Step("classify_user",
+                 lambda r: _translate_classification(r["classify"], user_language),
+                 deps=["classify"]),
+            Step("body_user",
+                 lambda r: _generate_body(
+                     intent, facts, user_language,
+                     is_demand_letter=r["classify"]["is_demand_letter"],
+                     other_party=r["classify_user"]["other_party"],
+                     on_token=_tokens("body_user"),
+                 ),
+                 deps=["classify", "classify_user"]),
+        ]
+    else:
+        steps.append(Step("facts_en", lambda r: _identity(facts)))
+    if SUBJECT_LLM_REFINE:
+        steps.append(Step("subject_en",
+                          lambda r: _refine_subject(intent, r["facts_en"], "en",
+                                                    _compose_subject(intent, r["classify"], "en")),
+                          deps=["classify", "facts_en"]))
+    if bilingual and _subject_by_llm(user_language):
+        if reference().has_subjects(user_language):
+            draft = lambda r: _compose_subject(intent, r["classify_user"], user_language)
+        else:
+            draft = lambda r: _compose_subject(intent, r["classify"], "en")
+        steps.append(Step("subject_user",
+                          lambda r: _refine_subject(intent, facts, user_language, draft(r)),
+                          deps=["classify", "classify_user"]))
+
+    results, timings = await run_steps(steps, max_concurrency=max_concurrency,
+                                       on_result=_on_result if emit is not None else None)
 
-    classification     = _classify_intent(intent, facts)
+    classification     = results["classify"]
     doc_type           = classification["doc_type"]
-    authority          = classification["authority"]
-    authority_location = classification.get("authority_location", "India")
-    other_party        = classification["other_party"]
-    other_party_loc    = classification["other_party_location"]
     ref_prefix         = classification["ref_prefix"]
     is_demand_letter   = classification["is_demand_letter"]
     ref_number         = f"SV/{ref_prefix}/{date.today().year}/{date.today().strftime('%m%d')}/001"
 
-    readiness_score = _calculate_readiness(intent, facts)
-
-    # ── Pre-translate header info/facts for bilingual consistency ───────────
-    translated_classification = classification.copy()
-    translated_facts          = facts.copy()
-
-    if user_language != "en":
-        # 1. Translate Classification fields to User Language
-        fields_to_translate = ["authority", "authority_location", "other_party", "other_party_location"]
-        text_to_translate   = " | ".join(str(classification.get(f, "")) for f in fields_to_translate)
-        
-        prompt = f"""Translate these Indian legal entity names/locations into {LANGUAGE_NAMES.get(user_language, 'Tamil')}.
-Keep original meaning. Return as piped list.
-
-Text: {text_to_translate}
-"""
-        try:
-            resp = llm.invoke([HumanMessage(content=prompt)])
-            vals = [v.strip() for v in resp.content.split("|")]
-            for i, f in enumerate(fields_to_translate):
-                if i < len(vals): translated_classification[f] = vals[i]
-        except Exception: pass
-
-        # 2. Translate Facts to English (for the English copy)
-        # We only really need to translate the ones likely used in From/To or Body
-        facts_to_translate = {k: v for k, v in facts.items() if any(x in k for x in ["name", "address", "location", "details", "subject"])}
-        if facts_to_translate:
-            prompt = f"Translate these factual details into English. Return as JSON. Details: {json.dumps(facts_to_translate)}"
-            try:
-                resp = llm.invoke([HumanMessage(content=prompt)])
-                trans_facts = _parse_json(strip_markdown(resp.content))
-                for k, v in trans_facts.items(): translated_facts[k] = v
-            except Exception: pass
-
-    def _build(lang: str, disc: str, current_facts: dict, cur_class: dict) -> str:
-        # Use lang-specific scalars and body
-        # Pass the desired document language to LLM prompts
-        scalars    = _extract_scalars(intent, current_facts, lang)
-        scalars["user_language"] = lang # To help assembly function pick labels
-        
-        body, docs = _generate_body(
-            intent, current_facts, lang,
-            is_demand_letter=is_demand_letter,
-            other_party=cur_class["other_party"],
-        )
+    def _build(lang: str, disc: str, current_facts: dict, cur_class: dict,
+               subject: Optional[str], body: str, docs: str) -> str:
+        scalars = _extract_scalars(current_facts)
+        scalars["user_language"] = lang  # To help assembly function pick labels
+        scalars["subject"]       = subject or _compose_subject(intent, cur_class, lang)
         if is_demand_letter:
             return _assemble_demand_letter(
                 scalars, body, docs,
@@ -949,20 +753,35 @@ Text: {text_to_translate}
                 reference_number=ref_number,
             )
 
-    # English copy uses translated facts (mostly English now) and original English classification
-    english_content   = _build("en", "", translated_facts, classification)
+    english_content   = _build("en", "", results["facts_en"], classification,
+                               results.get("subject_en"), *results["body_en"])
     disc_user         = ""
-    # User lang copy uses original user facts and translated classification
-    user_lang_content = english_content if user_language == "en" else _build(user_language, "", facts, translated_classification)
+    user_lang_content = english_content if not bilingual else _build(
+        user_language, "", facts, results["classify_user"],
+        results.get("subject_user"), *results["body_user"],
+    )
+
+    record_document_steps(timings)
 
     return {
         "user_language_content": user_lang_content,
         "english_content":       english_content,
         "document_type":         doc_type,
-        "readiness_score":       readiness_score,
+        "readiness_score":       results["readiness"],
         "user_language":         user_language,
-        "disclaimer_en":         DISCLAIMER_EN,
+        "disclaimer_en":         get_disclaimer("en"),
         "disclaimer_user_lang":  disc_user,
         "reference_number":      ref_number,
         "generated_at":          generated_at,
+        "step_timings_ms":       timings,
     }
+
+
+async def _identity(value):
+    return value
+
+
+def generate_bilingual_document(intent: str, facts: dict,
+                                user_language: str = "en") -> dict:
+    """Synchronous wrapper for callers outside an event loop."""
+    return asyncio.run(agenerate_bilingual_document(intent, facts, user_language))
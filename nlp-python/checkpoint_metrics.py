@@ -0,0 +1,96 @@
+"""
+checkpoint_metrics.py — Call counting around a LangGraph checkpointer.
+
+CountingCheckpointer wraps any checkpoint saver (Postgres or in-memory) and
+counts what each turn costs in storage round trips: checkpoint reads
+(get_tuple), checkpoint writes (put), pending-write batches (put_writes) and
+history listings (list). process_message reports each finished turn so the
+stats can be expressed per turn.
+"""
+
+import threading
+from typing import Any, Dict
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
+
+COUNTERS = ("reads", "writes", "pending_writes", "lists")
+
+
+class CountingCheckpointer(BaseCheckpointSaver):
+    def __init__(self, inner: BaseCheckpointSaver):
+        super().__init__(serde=inner.serde)
+        self.inner     = inner
+        self._lock     = threading.Lock()
+        self._counts   = dict.fromkeys(COUNTERS + ("turns",), 0)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def note_turn(self) -> None:
+        self._count("turns")
+
+    # ── reads ─────────────────────────────────────────────────────────────
+    def get_tuple(self, config):
+        self._count("reads")
+        return self.inner.get_tuple(config)
+
+    async def aget_tuple(self, config):
+        self._count("reads")
+        return await self.inner.aget_tuple(config)
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        self._count("lists")
+        return self.inner.list(config, filter=filter, before=before, limit=limit)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        self._count("lists")
+        async for item in self.inner.alist(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    # ── writes ────────────────────────────────────────────────────────────
+    def put(self, config, checkpoint, metadata, new_versions):
+        self._count("writes")
+        return self.inner.put(config, checkpoint, metadata, new_versions)
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        self._count("writes")
+        return await self.inner.aput(config, checkpoint, metadata, new_versions)
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        self._count("pending_writes")
+        return self.inner.put_writes(config, writes, task_id, task_path)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        self._count("pending_writes")
+        return await self.inner.aput_writes(config, writes, task_id, task_path)
+
+    # ── pass-through ──────────────────────────────────────────────────────
+    def get_next_version(self, current, channel):
+        return self.inner.get_next_version(current, channel)
+
+    def delete_thread(self, thread_id: str) -> None:
+        return self.inner.delete_thread(thread_id)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return await self.inner.adelete_thread(thread_id)
+
+    @property
+    def config_specs(self):
+        return self.inner.config_specs
+
+    def __getattr__(self, name):
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    # ── introspection ─────────────────────────────────────────────────────
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        turns = counts["turns"]
+        out   = {"backend": type(self.inner).__name__, **counts}
+        for name in COUNTERS:
+            out[f"{name}_per_turn"] = round(counts[name] / turns, 3) if turns else 0.0
+        return out
@@ -0,0 +1,211 @@
+"""
+doc_templates.py — Document layouts from data/templates/*.txt, parsed once.
+
+A template is the document line by line. Text is copied as is, and braces
+mark the parts that change:
+
+  {#sub}             document label, from doc_labels in data/reference.json
+  {subject}          a value passed to render()
+  {phone?}           the same, but the whole line is left out when it is empty
+  {laws*}            a list: the line is repeated once per item, with the text
+                     around the slot ("  • {laws*}"); no items, no line
+  #if disclaimer     the lines up to #else / #end are kept only when the value
+  #else              is non-empty (blocks may nest)
+  #end
+  {{ }}              literal braces
+
+Each file is parsed once at import into a list of lines. The first render
+for a language resolves that list with the language's labels: every line
+becomes its text with the label text already in it and the value slots
+between, and runs of lines that are kept or dropped together are merged into
+one. The resolved list is kept until the reference data is reloaded, so a
+render walks a couple of dozen entries, fills in the values and ends in one
+join, with no parsing or label lookups; the English and the user-language
+copy of a document come from the same parsed template.
+
+Adding a layout is a new file in data/templates (TEMPLATES_DIR); the file
+name without .txt is the template name.
+"""
+
+import os
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from reference_data import ReferenceData, reference
+
+
+TEMPLATES_DIR = os.getenv("TEMPLATES_DIR",
+                          os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                       "data", "templates"))
+
+_SLOT_RE = re.compile(r"\{\{|\}\}|\{(#?)([A-Za-z_][A-Za-z0-9_]*)([?*]?)\}")
+_IF_RE   = re.compile(r"#if\s+([A-Za-z_][A-Za-z0-9_]*)\s*$")
+
+_When = Tuple[Tuple[str, bool], ...]          # (value, must be non-empty) for each enclosing #if / #else
+
+
+class _Line(NamedTuple):
+    when:     _When
+    pieces:   Tuple[Tuple[str, str], ...]     # ("text" | "label" | "value", name or text)
+    optional: Tuple[str, ...]                 # values that drop the line when empty
+    each:     Optional[str]                   # list value the line repeats over
+
+
+_Text = Tuple[str, Tuple[Tuple[str, str], ...]]   # head text, then (value, text after it) pairs
+
+
+class _Resolved(NamedTuple):
+    needs:  _When                             # the #if conditions plus the line's "?" values
+    each:   Optional[str]                     # list value the line repeats over
+    text:   _Text                             # labels filled in; up to the list slot on list lines
+    after:  _Text                             # after the list slot, on list lines
+
+
+def _holds(needs: _When, values: dict) -> bool:
+    for name, positive in needs:
+        if (not values[name]) is positive:
+            return False
+    return True
+
+
+def _fill(text: _Text, values: dict) -> str:
+    out, pairs = text
+    for name, tail in pairs:
+        out = f"{out}{values[name]}{tail}"
+    return out
+
+
+class DocumentTemplate:
+    """One parsed layout; render(lang, values) gives the document text."""
+
+    def __init__(self, name: str, source: str):
+        self.name   = name
+        self._lines = self._parse(source)
+        self.labels = frozenset(n for line in self._lines for kind, n in line.pieces if kind == "label")
+        self.values = frozenset([n for line in self._lines for kind, n in line.pieces if kind == "value"] +
+                                [n for line in self._lines for n, _ in line.when])
+        self._resolved:     Dict[str, Tuple[_Resolved, ...]] = {}
+        self._resolved_for: Optional[ReferenceData]          = None
+
+    def _parse(self, source: str) -> Tuple[_Line, ...]:
+        lines: List[_Line] = []
+        blocks: List[Tuple[str, bool]] = []
+        for number, raw in enumerate(source.split("\n"), 1):
+            where = f"{self.name}:{number}"
+            directive = raw.strip()
+            if directive.startswith("#if"):
+                match = _IF_RE.fullmatch(directive)
+                if not match:
+                    raise ValueError(f"{where}: expected '#if <value>'")
+                blocks.append((match.group(1), True))
+                continue
+            if directive in ("#else", "#end"):
+                if not blocks:
+                    raise ValueError(f"{where}: {directive} without #if")
+                name, positive = blocks.pop()
+                if directive == "#else":
+                    blocks.append((name, not positive))
+                continue
+
+            pieces, optional, each, pos = [], [], None, 0
+            for match in _SLOT_RE.finditer(raw):
+                if match.start() > pos:
+                    pieces.append(("text", raw[pos:match.start()]))
+                pos = match.end()
+                if match.group(0) in ("{{", "}}"):
+                    pieces.append(("text", match.group(0)[0]))
+                    continue
+                label, name, flag = match.groups()
+                if label and flag:
+                    raise ValueError(f"{where}: label {{#{name}}} cannot be marked {flag!r}")
+                pieces.append(("label" if label else "value", name))
+                if flag == "?":
+                    optional.append(name)
+                elif flag == "*":
+                    if each:
+                        raise ValueError(f"{where}: only one list value per line")
+                    each = name
+            if pos < len(raw):
+                pieces.append(("text", raw[pos:]))
+            lines.append(_Line(tuple(blocks), tuple(pieces), tuple(optional), each))
+        if blocks:
+            raise ValueError(f"{self.name}: #if {blocks[-1][0]} is never closed")
+        # A trailing newline in the file is not an extra empty line.
+        if lines and not lines[-1].pieces and not lines[-1].when:
+            lines.pop()
+        return tuple(lines)
+
+    def _resolve(self, ref: ReferenceData, lang: str) -> Tuple[_Resolved, ...]:
+        labels  = ref.labels(lang)
+        missing = self.labels - labels.keys()
+        if missing:
+            raise ValueError(f"template {self.name!r} uses unknown labels: {', '.join(sorted(missing))}")
+
+        resolved: List[_Resolved] = []
+        for line in self._lines:
+            texts = [["", []], ["", []]]          # before / after the list slot
+            side  = texts[0]
+            for kind, n in line.pieces:
+                if kind == "value" and n == line.each:
+                    side = texts[1]
+                elif kind == "value":
+                    side[1].append([n, ""])
+                elif side[1]:
+                    side[1][-1][1] += labels[n] if kind == "label" else n
+                else:
+                    side[0] += labels[n] if kind == "label" else n
+
+            needs = line.when + tuple((n, True) for n in line.optional)
+            last  = resolved[-1] if resolved else None
+            if last is not None and not (line.each or last.each) and last.needs == needs:
+                # Consecutive lines kept or dropped together become one text.
+                head, pairs = last.text
+                if pairs:
+                    pairs = pairs[:-1] + ((pairs[-1][0], f"{pairs[-1][1]}\n{texts[0][0]}"),)
+                else:
+                    head = f"{head}\n{texts[0][0]}"
+                resolved[-1] = last._replace(text=(head, pairs + tuple(map(tuple, texts[0][1]))))
+            else:
+                resolved.append(_Resolved(needs, line.each,
+                                          *((head, tuple(map(tuple, pairs))) for head, pairs in texts)))
+        return tuple(resolved)
+
+    def resolved(self, lang: str) -> Tuple[_Resolved, ...]:
+        """The lines resolved for lang, on first use per reference-data version."""
+        ref = reference()
+        if ref is not self._resolved_for:
+            self._resolved, self._resolved_for = {}, ref
+        lines = self._resolved.get(lang)
+        if lines is None:
+            lines = self._resolved[lang] = self._resolve(ref, lang)
+        return lines
+
+    def render(self, lang: str, values: dict) -> str:
+        missing = self.values - values.keys()
+        if missing:
+            raise ValueError(f"template {self.name!r} needs values: {', '.join(sorted(missing))}")
+        out = []
+        for needs, each, text, after in self.resolved(lang):
+            if needs and not _holds(needs, values):
+                continue
+            line = _fill(text, values) if text[1] else text[0]
+            if each:
+                rest = _fill(after, values) if after[1] else after[0]
+                out += [f"{line}{item}{rest}" for item in values[each]]
+            else:
+                out.append(line)
+        return "\n".join(out).strip()
+
+
+def load_templates(directory: str = TEMPLATES_DIR) -> Dict[str, DocumentTemplate]:
+    templates = {}
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".txt"):
+            with open(os.path.join(directory, filename), encoding="utf-8") as f:
+                templates[filename[:-4]] = DocumentTemplate(filename[:-4], f.read())
+    for template in templates.values():
+        template.resolved("en")       # unknown labels fail at startup, not on a request
+    return templates
+
+
+TEMPLATES = load_templates()
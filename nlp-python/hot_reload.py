@@ -0,0 +1,97 @@
+"""
+hot_reload.py — A value built from a data file, rebuilt when the file changes.
+
+Used for the statute table (statutes.py) and the reference data
+(reference_data.py). get() stats the file at most every interval_s seconds
+(0 = on every call) and rebuilds the value when its mtime changed; reload()
+checks right away (POST /admin/reload). Each worker process does this on its
+own, so an edited file reaches all workers within one interval without a
+restart.
+
+The new value is built completely before it replaces the old one with a
+single assignment, so readers see one version or the other, never a mix.
+on_load, if given, is called with each new value, so a module can keep it in
+a global of its own and read that on hot paths without going through get(). A
+file that fails to build is reported once per file version and the current
+value stays in use (last_error says why); only the first load raises.
+"""
+
+import os
+import time
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+BUILD_ERRORS = (OSError, ValueError, KeyError, TypeError, AttributeError)
+
+
+class ReloadableFile(Generic[T]):
+    def __init__(self, name: str, path: str, build: Callable[[str], T], interval_s: float,
+                 on_load: Optional[Callable[[T], None]] = None):
+        self.name       = name
+        self.path       = path
+        self.build      = build
+        self.interval_s = interval_s
+        self.on_load    = on_load
+        self.last_error: Optional[str] = None
+        self.loaded_at:  Optional[float] = None
+
+        self._value:      Optional[T]   = None
+        self._mtime_ns:   Optional[int] = None
+        self._checked_at: float         = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        """The current value, rebuilt first if the file changed since the last check."""
+        now = time.monotonic()
+        if self._value is not None and now - self._checked_at < self.interval_s:
+            return self._value
+        with self._lock:
+            if self._value is None or now - self._checked_at >= self.interval_s:
+                self._refresh()
+                self._checked_at = now
+        return self._value
+
+    def reload(self) -> T:
+        """Check the file now instead of waiting for the interval."""
+        with self._lock:
+            self._refresh()
+            self._checked_at = time.monotonic()
+        return self._value
+
+    def status(self) -> dict:
+        return {
+            "version":   getattr(self._value, "version", None),
+            "path":      self.path,
+            "loaded_at": self.loaded_at,
+            "error":     self.last_error,
+        }
+
+    def _refresh(self) -> None:
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except OSError as e:
+            if self._value is None:
+                raise
+            self._failed(-1, str(e))
+            return
+        if mtime_ns == self._mtime_ns and self._value is not None:
+            return
+        try:
+            value = self.build(self.path)
+        except BUILD_ERRORS as e:
+            if self._value is None:
+                raise
+            self._failed(mtime_ns, f"{self.path} failed to load: {e}")
+            return
+        self._value, self._mtime_ns, self.loaded_at, self.last_error = value, mtime_ns, time.time(), None
+        if self.on_load is not None:
+            self.on_load(value)
+        print(f"[{self.name}] loaded version {getattr(value, 'version', '')!r} from {self.path}")
+
+    def _failed(self, mtime_ns: int, error: str) -> None:
+        if mtime_ns != self._mtime_ns:           # once per file version, not on every check
+            print(f"[{self.name}] WARNING: keeping version {getattr(self._value, 'version', '')!r}; {error}")
+        self._mtime_ns, self.last_error = mtime_ns, error
@@ -0,0 +1,151 @@
+"""
+language_detect.py — Local language detection for the first user message.
+
+Every supported language except English has its own Unicode script block
+(Hindi and Marathi share Devanagari), so a per-script character histogram
+identifies native-script text almost for free. Latin-script text is either
+English or a romanised Indian language ("en phone thirudi poitanga"); a small
+keyword model scores those. Each detection carries a confidence, and the
+caller falls back to the LLM only when it is low.
+"""
+
+import re
+from collections import Counter
+from typing import NamedTuple
+
+
+SUPPORTED_LANGUAGES = {"en", "ta", "hi", "te", "kn", "ml", "mr", "bn", "gu"}
+
+# (first code point, last code point, script)
+SCRIPT_BLOCKS = [
+    (0x0900, 0x097F, "devanagari"),
+    (0x0980, 0x09FF, "bengali"),
+    (0x0A80, 0x0AFF, "gujarati"),
+    (0x0B80, 0x0BFF, "tamil"),
+    (0x0C00, 0x0C7F, "telugu"),
+    (0x0C80, 0x0CFF, "kannada"),
+    (0x0D00, 0x0D7F, "malayalam"),
+]
+SCRIPT_LANGUAGE = {
+    "bengali": "bn", "gujarati": "gu", "tamil": "ta",
+    "telugu": "te", "kannada": "kn", "malayalam": "ml",
+}
+
+# Devanagari: Marathi vs Hindi function words. 'ळ' is (nearly) Marathi-only.
+MARATHI_MARKERS = {"आहे", "आहेत", "आणि", "माझा", "माझी", "माझे", "मला", "नाही", "झाले", "झाला",
+                   "केले", "आम्ही", "त्याने", "तिने", "पण", "काय", "होतो", "होती", "येथे", "व"}
+HINDI_MARKERS   = {"है", "हैं", "और", "मेरा", "मेरी", "मेरे", "मुझे", "नहीं", "था", "थी", "गया",
+                   "गई", "में", "का", "की", "के", "को", "से", "ने", "कि", "लेकिन", "क्या"}
+
+# Romanised keyword model — common function words and case vocabulary as
+# typed in Latin script. Words shared by several languages are listed under
+# each of them and so only add to the total, not the margin.
+ROMANISED_KEYWORDS = {
+    "ta": {"naan", "nan", "enna", "ennoda", "enakku", "en", "illa", "illai", "irukku", "iruku",
+           "vanakkam", "panni", "pannanum", "pannunga", "romba", "sollunga", "veedu", "veetla",
+           "kaasu", "panam", "thirudi", "thiruttu", "poitanga", "pochu", "aamam", "sari",
+           "kudukkala", "tharala", "kitta", "avanga", "ivanga", "nalla", "vela", "sambalam"},
+    "hi": {"mera", "meri", "mere", "mujhe", "hai", "hain", "nahi", "nahin", "kya", "aur", "paisa",
+           "paise", "kar", "karo", "raha", "rahi", "gaya", "gayi", "namaste", "kripya", "bhai",
+           "hua", "tha", "thi", "ke", "ki", "ko", "se", "mein", "maine", "unhone", "chori", "wapas"},
+    "te": {"naa", "nenu", "ledu", "undi", "cheyyandi", "dabbulu", "meeru", "emi", "ela", "kavali",
+           "namaskaram", "chesaru", "ivvaledu", "intlo", "vallu", "atanu", "aame", "jeetham"},
+    "kn": {"nanna", "naanu", "ide", "maadi", "hana", "namaskara", "beku", "yenu", "illa",
+           "kodalilla", "avaru", "mane", "sambala", "madidru", "agide", "kalavu"},
+    "ml": {"ente", "njan", "aanu", "cheyyu", "entha", "vendi", "undu", "illa", "ayi", "paranju",
+           "veedu", "panam", "kittiyilla", "avan", "aval", "sheriyanu", "namaskaram"},
+    "mr": {"maza", "mazi", "maze", "mala", "aahe", "ahe", "nahi", "ani", "kay", "paise", "zhala",
+           "zhali", "namaskar", "kela", "keli", "tyane", "amhi", "tumhi", "pagar"},
+    "bn": {"ami", "amar", "amake", "ache", "achhe", "taka", "kore", "korechi", "hoyeche", "nomoskar",
+           "apni", "kichu", "na", "ebong", "theke", "kintu", "churi", "dichhe", "bari"},
+    "gu": {"maru", "mari", "mara", "che", "chhe", "nathi", "kem", "thay", "tame", "hu", "ane",
+           "paisa", "karyu", "malya", "aapo", "ghar", "chori", "kharab"},
+}
+
+ENGLISH_WORDS = {
+    "i", "my", "me", "the", "a", "an", "is", "was", "were", "are", "and", "or", "to", "of", "in",
+    "on", "at", "for", "from", "with", "have", "has", "had", "not", "did", "do", "he", "she",
+    "they", "it", "this", "that", "someone", "please", "help", "want", "need", "money", "phone",
+    "stolen", "landlord", "deposit", "salary", "complaint", "police", "bank", "company", "hello",
+    "hi", "hey", "yes", "no", "am", "been", "by", "about", "his", "her", "their", "our", "we",
+}
+
+# Indic vowel signs are combining marks, not letters, so words are split on
+# whitespace/punctuation rather than matched with \w.
+_WORD_RE = re.compile(r"[^\s\d.,;:!?()\[\]{}\"'\u0964\u0965/\\|_-]+")
+
+
+class Detection(NamedTuple):
+    language:   str
+    confidence: float
+    method:     str     # script | keywords | default
+
+
+def script_histogram(text: str) -> Counter:
+    counts = Counter()
+    for ch in text:
+        cp = ord(ch)
+        if cp >= 0x0900:
+            for lo, hi, script in SCRIPT_BLOCKS:
+                if lo <= cp <= hi:
+                    counts[script] += 1
+                    break
+            else:
+                if ch.isalpha():
+                    counts["other"] += 1
+        elif ch.isalpha():
+            counts["latin"] += 1
+    return counts
+
+
+def _detect_devanagari(words, share: float) -> Detection:
+    mr = sum(w in MARATHI_MARKERS for w in words)
+    hi = sum(w in HINDI_MARKERS   for w in words)
+    if any("ळ" in w for w in words):
+        mr += 2
+    if mr == hi:
+        # No signal either way — Hindi is by far the likelier, but not certain.
+        return Detection("hi", round(share * 0.6, 3), "script")
+    lang   = "mr" if mr > hi else "hi"
+    margin = abs(mr - hi) / (mr + hi)
+    return Detection(lang, round(share * (0.7 + 0.3 * margin), 3), "script")
+
+
+def _detect_latin(words) -> Detection:
+    if not words:
+        return Detection("en", 0.0, "default")
+
+    scores  = {lang: sum(w in vocab for w in words) for lang, vocab in ROMANISED_KEYWORDS.items()}
+    english = sum(w in ENGLISH_WORDS for w in words)
+    ranked  = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+    (best, best_hits), (_, second_hits) = ranked[0], ranked[1]
+
+    if best_hits > english and best_hits >= 2 and best_hits > second_hits:
+        margin = (best_hits - second_hits) / best_hits
+        return Detection(best, round(min(0.95, 0.5 + 0.45 * margin + 0.05 * best_hits), 3), "keywords")
+
+    if english and english >= best_hits:
+        ratio = english / len(words)
+        return Detection("en", round(min(0.98, 0.55 + ratio), 3), "keywords")
+
+    return Detection("en", 0.3, "default")
+
+
+def detect_language(text: str) -> Detection:
+    histogram = script_histogram(text or "")
+    letters   = sum(histogram.values())
+    if not letters:
+        return Detection("en", 0.0, "default")
+
+    script, count = histogram.most_common(1)[0]
+    share = count / letters
+    words = [w.lower() for w in _WORD_RE.findall(text)]
+
+    if script in SCRIPT_LANGUAGE:
+        return Detection(SCRIPT_LANGUAGE[script], round(share, 3), "script")
+    if script == "devanagari":
+        return _detect_devanagari(words, share)
+    if script == "latin":
+        d = _detect_latin(words)
+        return d._replace(confidence=round(d.confidence * share, 3))
+    return Detection("en", 0.0, "default")
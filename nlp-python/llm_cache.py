@@ -0,0 +1,238 @@
+"""
+llm_cache.py — Content-addressed response cache around the shared chat model.
+
+Entries are keyed on (model, temperature, message types + contents), so the
+same prompt from any user hits the same entry. Two tiers:
+
+  1. In-process LRU (always on, bounded by LLM_CACHE_MAX_ENTRIES)
+  2. Optional SQLite file (LLM_CACHE_SQLITE_PATH) shared by all workers on a
+     host and surviving restarts
+
+Identical cacheable prompts that arrive while the first is still waiting on
+the provider share that one call instead of each missing the cache (bulk
+imports send the same translation and classification prompts from many
+threads at once).
+
+Each prompt type (see prompt_types.py) has its own TTL in seconds; a TTL of 0
+disables caching for that type. Override with LLM_CACHE_TTL_<TYPE>, e.g.
+LLM_CACHE_TTL_NEXT_STEPS=600.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+
+from prompt_types import PROMPT_TYPES, UNKNOWN, infer_prompt_type
+from single_flight import SingleFlight
+from llm_usage import record_cache_hit
+from telemetry import record_cache_lookup
+
+
+HOUR = 3600
+DAY  = 24 * HOUR
+
+# Letter bodies are the one creative step users expect to vary between
+# regenerations, so they are never cached by default.
+DEFAULT_TTLS = {
+    "language":           DAY,
+    "classification":     HOUR,
+    "extraction":         10 * 60,
+    "address_parse":      DAY,
+    "confirmation":       10 * 60,
+    "translation":        DAY,
+    "next_steps":         HOUR,
+    "doc_classification": HOUR,
+    "subject":            HOUR,
+    "body":               0,
+    "readiness":          HOUR,
+    "entity_translation": DAY,
+    "fact_translation":   DAY,
+    UNKNOWN:              0,
+}
+
+
+def load_ttls() -> Dict[str, int]:
+    ttls = dict(DEFAULT_TTLS)
+    for prompt_type in PROMPT_TYPES + [UNKNOWN]:
+        env = os.getenv(f"LLM_CACHE_TTL_{prompt_type.upper()}")
+        if env is not None:
+            ttls[prompt_type] = int(env)
+    return ttls
+
+
+def cache_key(model: str, temperature: Any, messages: List[BaseMessage]) -> str:
+    payload = json.dumps(
+        [model, temperature, [[m.type, m.content] for m in messages]],
+        ensure_ascii=False, separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _SqliteTier:
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY, prompt_type TEXT, value TEXT, expires_at REAL)"
+        )
+
+    def get(self, key: str, now: float) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] <= now:
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            return None
+        return row[0]
+
+    def put(self, key: str, prompt_type: str, value: str, expires_at: float) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, prompt_type, value, expires_at) VALUES (?, ?, ?, ?)",
+            (key, prompt_type, value, expires_at),
+        )
+
+
+class CachedLLM:
+    """Wraps a LangChain chat model; invoke/ainvoke/astream are served from cache when possible.
+
+    A cached reply is streamed back as a single chunk. Everything else (stream,
+    bind, with_structured_output, ...) is delegated to the wrapped model uncached.
+    """
+
+    def __init__(self, inner, max_entries: int = 2048, sqlite_path: str = "",
+                 ttls: Optional[Dict[str, int]] = None):
+        self._inner       = inner
+        self._max_entries = max_entries
+        self._ttls        = ttls if ttls is not None else load_ttls()
+        self._lru: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock        = threading.Lock()
+        self._sqlite      = _SqliteTier(sqlite_path) if sqlite_path else None
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._in_flight   = SingleFlight()
+        self._model       = str(getattr(inner, "model_name", None) or getattr(inner, "model", "") or type(inner).__name__)
+        self._temperature = getattr(inner, "temperature", None)
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+    # ── lookup / store ────────────────────────────────────────────────────
+    def _count(self, prompt_type: str, outcome: str) -> None:
+        bucket = self._counters.setdefault(prompt_type, {"memory_hits": 0, "sqlite_hits": 0, "misses": 0})
+        bucket[outcome] += 1
+        record_cache_lookup(prompt_type, outcome)
+
+    def _lookup(self, messages: List[BaseMessage]):
+        prompt_type = infer_prompt_type(messages)
+        ttl         = self._ttls.get(prompt_type, 0)
+        if ttl <= 0:
+            return prompt_type, None, None
+
+        key = cache_key(self._model, self._temperature, messages)
+        now = time.time()
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._lru.move_to_end(key)
+                    self._count(prompt_type, "memory_hits")
+                    return prompt_type, key, entry[1]
+                del self._lru[key]
+
+            if self._sqlite is not None:
+                value = self._sqlite.get(key, now)
+                if value is not None:
+                    self._remember(key, value, now + ttl)
+                    self._count(prompt_type, "sqlite_hits")
+                    return prompt_type, key, value
+
+            self._count(prompt_type, "misses")
+        return prompt_type, key, None
+
+    def _remember(self, key: str, value: str, expires_at: float) -> None:
+        self._lru[key] = (expires_at, value)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self._max_entries:
+            self._lru.popitem(last=False)
+
+    def _store(self, prompt_type: str, key: Optional[str], response) -> None:
+        if key is None or not isinstance(getattr(response, "content", None), str):
+            return
+        expires_at = time.time() + self._ttls[prompt_type]
+        with self._lock:
+            self._remember(key, response.content, expires_at)
+            if self._sqlite is not None:
+                self._sqlite.put(key, prompt_type, response.content, expires_at)
+
+    # ── chat model interface ──────────────────────────────────────────────
+    def invoke(self, messages, config=None, **kwargs):
+        prompt_type, key, cached = self._lookup(messages)
+        if cached is not None:
+            record_cache_hit(prompt_type)
+            return AIMessage(content=cached)
+        response = self._inner.invoke(messages, config=config, **kwargs)
+        self._store(prompt_type, key, response)
+        return response
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+        prompt_type, key, cached = self._lookup(messages)
+        if cached is not None:
+            record_cache_hit(prompt_type)
+            return AIMessage(content=cached)
+        if key is None:
+            return await self._inner.ainvoke(messages, config=config, **kwargs)
+        if self._in_flight.joining(key):
+            record_cache_hit(prompt_type)
+
+        async def call():
+            response = await self._inner.ainvoke(messages, config=config, **kwargs)
+            self._store(prompt_type, key, response)
+            return response
+        return await self._in_flight.do(key, call)
+
+    async def astream(self, messages, config=None, **kwargs):
+        prompt_type, key, cached = self._lookup(messages)
+        if cached is not None:
+            record_cache_hit(prompt_type)
+            yield AIMessageChunk(content=cached)
+            return
+        parts = []
+        async for chunk in self._inner.astream(messages, config=config, **kwargs):
+            if isinstance(chunk.content, str):
+                parts.append(chunk.content)
+            yield chunk
+        self._store(prompt_type, key, AIMessage(content="".join(parts)))
+
+    # ── introspection ─────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        with self._lock:
+            by_type = {t: dict(c) for t, c in self._counters.items()}
+            entries = len(self._lru)
+        totals = {"memory_hits": 0, "sqlite_hits": 0, "misses": 0}
+        for counts in by_type.values():
+            for k in totals:
+                totals[k] += counts[k]
+        for counts in list(by_type.values()) + [totals]:
+            lookups = counts["memory_hits"] + counts["sqlite_hits"] + counts["misses"]
+            counts["hit_rate"] = round((lookups - counts["misses"]) / lookups, 4) if lookups else 0.0
+        return {
+            "model":          self._model,
+            "memory_entries": entries,
+            "sqlite_enabled": self._sqlite is not None,
+            "in_flight":      self._in_flight.stats(),
+            "totals":         totals,
+            "by_prompt_type": by_type,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
@@ -0,0 +1,235 @@
+"""
+llm_json.py — Structured LLM replies: per-prompt schemas and one targeted re-ask.
+
+    data = await ainvoke_json([SystemMessage(...), HumanMessage(...)])
+
+The prompt type (prompt_types.py) selects the schema in REPLY_SCHEMAS. A reply
+goes through three steps before the caller sees it:
+
+  1. text_utils.extract_json takes the first complete JSON value, repairing
+     quotes, trailing commas, fences and truncation if needed.
+  2. The value is validated. Errors inside optional fields or list items are
+     salvaged by dropping just that part (an address block with a null
+     pincode, one interview question without text), so the rest is kept.
+  3. Only when a required part is missing or invalid does the model get a
+     re-ask: the original messages, its own reply, and a short note naming
+     what was wrong. One re-ask by default (LLM_JSON_REASKS).
+
+If the reply is still unusable, LLMReplyError is raised and the caller falls
+back to its defaults as before. Outcomes are counted per prompt type in
+legal_llm_json_replies_total (telemetry.py).
+"""
+
+import os
+from typing import Annotated, Any, Dict, List, Literal, Optional, Tuple, Type, get_origin
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from pydantic import (BaseModel, ConfigDict, Field, RootModel, ValidationError,
+                      field_validator, model_validator)
+
+from llm_provider import llm
+from prompt_types import infer_prompt_type
+from telemetry import record_json_reply
+from text_utils import extract_json
+
+
+LLM_JSON_REASKS = int(os.getenv("LLM_JSON_REASKS", "1"))
+
+REASK_PROMPT = ("Your previous reply could not be used: {problem}. "
+                "Reply again with only the corrected JSON, same fields, no markdown and no explanation.")
+
+_MAX_SALVAGE_ROUNDS = 3
+_MAX_ERRORS_SHOWN   = 5
+
+
+class LLMReplyError(ValueError):
+    """The reply had no usable JSON for its schema, even after re-asking."""
+
+
+# ============================================================
+# SCHEMAS
+# ============================================================
+
+_LENIENT = ConfigDict(extra="allow", str_strip_whitespace=True, coerce_numbers_to_str=True)
+
+NonEmptyStr = Annotated[str, Field(min_length=1)]
+
+DOC_TYPES = Literal[
+    "police_complaint_fir", "cyber_fraud_complaint", "consumer_complaint", "legal_notice",
+    "workplace_complaint", "family_petition", "banking_complaint", "rti_application",
+    "property_dispute", "insurance_complaint", "civil_petition", "general_petition",
+]
+
+
+class PlanStep(BaseModel):
+    model_config = _LENIENT
+
+    key:      NonEmptyStr
+    label:    str = ""
+    question: NonEmptyStr
+
+    @model_validator(mode="after")
+    def _default_label(self):
+        if not self.label:
+            self.label = self.key.replace("_", " ").title()
+        return self
+
+
+class ClassificationReply(BaseModel):
+    model_config = _LENIENT
+
+    category:       NonEmptyStr
+    policy_action:  str = "allow"          # checked by the caller; never defaulted on a bad value
+    policy_message: str = ""
+    initial_facts:  Dict[str, Any] = {}
+    interview_plan: List[PlanStep] = Field(min_length=1)
+
+
+class AddressReply(BaseModel):
+    model_config = _LENIENT
+
+    district: str = ""
+    state:    str = ""
+    pincode:  str = ""
+
+
+class ExtractionReply(BaseModel):
+    model_config = _LENIENT
+
+    extracted:                Dict[str, Any]
+    address:                  Optional[AddressReply] = None
+    next_question_translated: Optional[str] = None
+
+
+class DocClassificationReply(BaseModel):
+    model_config = _LENIENT
+
+    doc_type:             DOC_TYPES
+    authority:            str = ""
+    other_party:          str = ""
+    other_party_location: str = ""
+    ref_prefix:           str = ""
+    reasoning:            str = ""
+
+    @field_validator("doc_type", mode="before")
+    @classmethod
+    def _normalise_doc_type(cls, v):
+        return v.strip().lower().replace(" ", "_") if isinstance(v, str) else v
+
+
+class SubjectReply(BaseModel):
+    model_config = _LENIENT
+
+    subject: NonEmptyStr
+
+
+class NextStepsReply(RootModel[Annotated[List[NonEmptyStr], Field(min_length=1)]]):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+
+class FactTranslationReply(RootModel[Dict[str, str]]):
+    model_config = ConfigDict(str_strip_whitespace=True, coerce_numbers_to_str=True)
+
+
+REPLY_SCHEMAS: Dict[str, Type[BaseModel]] = {
+    "classification":     ClassificationReply,
+    "extraction":         ExtractionReply,
+    "address_parse":      AddressReply,
+    "doc_classification": DocClassificationReply,
+    "subject":            SubjectReply,
+    "next_steps":         NextStepsReply,
+    "fact_translation":   FactTranslationReply,
+}
+
+
+# ============================================================
+# VALIDATION WITH SALVAGE
+# ============================================================
+
+def _expects_array(schema: Type[BaseModel]) -> bool:
+    if not issubclass(schema, RootModel):
+        return False
+    annotation = schema.model_fields["root"].annotation
+    return get_origin(annotation) is list or get_origin(getattr(annotation, "__origin__", None)) is list
+
+
+def _optional_part(schema: Type[BaseModel], value: Any, loc: Tuple) -> Optional[Tuple[Any, Any]]:
+    """(container, key) of the smallest part at loc that can be dropped, if any.
+
+    Droppable: a top-level field with a default, an item of a list, an entry
+    of a free-form dict (a root model's entries count as such)."""
+    if not loc:
+        return None
+    if issubclass(schema, RootModel):
+        return (value, loc[0]) if isinstance(value, (list, dict)) else None
+    field = schema.model_fields.get(loc[0])
+    if field is None or not isinstance(value, dict) or loc[0] not in value:
+        return None
+    inner = value[loc[0]]
+    if len(loc) > 1 and isinstance(inner, list) and isinstance(loc[1], int):
+        return inner, loc[1]
+    return (value, loc[0]) if not field.is_required() else None
+
+
+def validate_reply(schema: Type[BaseModel], value: Any) -> Tuple[Any, bool]:
+    """Validate value against schema, dropping invalid optional parts.
+
+    Returns (plain data, whether anything was dropped); raises ValidationError
+    when a required part is wrong."""
+    salvaged = False
+    for _ in range(_MAX_SALVAGE_ROUNDS):
+        try:
+            return schema.model_validate(value).model_dump(exclude_unset=True), salvaged
+        except ValidationError as e:
+            parts = [_optional_part(schema, value, tuple(err["loc"])) for err in e.errors()]
+            if not parts or None in parts:
+                raise
+            # Delete list items from the back so earlier indexes stay valid.
+            for container, key in sorted({(id(c), k): (c, k) for c, k in parts}.values(),
+                                         key=lambda p: p[1] if isinstance(p[1], int) else -1,
+                                         reverse=True):
+                del container[key]
+            salvaged = True
+    return schema.model_validate(value).model_dump(exclude_unset=True), salvaged
+
+
+def parse_reply(raw: str, schema: Type[BaseModel]) -> Tuple[Any, str]:
+    """(data, outcome) for one reply; outcome is clean, repaired or salvaged."""
+    value, repaired = extract_json(raw, array=_expects_array(schema))
+    data, salvaged  = validate_reply(schema, value)
+    return data, "salvaged" if salvaged else "repaired" if repaired else "clean"
+
+
+def _describe(error: ValueError) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(f"{'.'.join(str(p) for p in err['loc']) or 'reply'}: {err['msg']}"
+                         for err in error.errors()[:_MAX_ERRORS_SHOWN])
+    return f"the reply was not valid JSON ({error})"
+
+
+# ============================================================
+# CALLING THE MODEL
+# ============================================================
+
+async def ainvoke_json(messages: List[BaseMessage], schema: Type[BaseModel] = None,
+                       reasks: int = None) -> Any:
+    """Call the shared LLM and return its reply validated against the prompt's schema."""
+    prompt_type = infer_prompt_type(messages)
+    schema      = schema or REPLY_SCHEMAS[prompt_type]
+    reasks      = LLM_JSON_REASKS if reasks is None else reasks
+
+    for attempt in range(reasks + 1):
+        resp = await llm.ainvoke(messages)
+        try:
+            data, outcome = parse_reply(resp.content, schema)
+        except ValueError as e:
+            problem = _describe(e)
+            print(f"[llm_json/{prompt_type}] attempt {attempt + 1}: {problem}")
+            messages = [*messages, AIMessage(content=resp.content),
+                        HumanMessage(content=REASK_PROMPT.format(problem=problem))]
+            continue
+        record_json_reply(prompt_type, "reasked" if attempt else outcome)
+        return data
+
+    record_json_reply(prompt_type, "failed")
+    raise LLMReplyError(f"{prompt_type}: {problem}")
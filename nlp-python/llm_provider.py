@@ -1,7 +1,11 @@
 import os
-from langchain_groq import ChatGroq
+import threading
 from dotenv import load_dotenv
 
+from llm_usage import record_call
+from prompt_types import infer_prompt_type
+from telemetry import observe_llm_call
+
 # Load env variables
 load_dotenv(dotenv_path="../.env")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
@@ -11,13 +15,142 @@ if not GROQ_API_KEY:
     load_dotenv()
     GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
-if not GROQ_API_KEY:
-    print("WARNING: GROQ_API_KEY not found. Please set it in .env file.")
-
-# Initialize Groq LLM
-# Model options: llama-3.3-70b-versatile (recommended), llama-3.1-8b-instant (fast/cheap), mixtral-8x7b-32768
-llm = ChatGroq(
-    temperature=0.2,
-    model_name="llama-3.3-70b-versatile",  # Upgraded: far better JSON accuracy for legal reasoning
-    groq_api_key=GROQ_API_KEY
-)
+# Provider selection
+#   LLM_PROVIDER     groq (default) | stub
+#   LLM_MODEL        model name for the selected provider
+#   LLM_TEMPERATURE  sampling temperature (default 0.2)
+# Stub-only settings: STUB_LLM_LATENCY_MS, STUB_LLM_JITTER_MS, STUB_LLM_SEED,
+# STUB_LLM_FIXTURES (JSON file of per-prompt-type replies, see stub_llm.py).
+LLM_PROVIDER    = os.getenv("LLM_PROVIDER", "groq").strip().lower()
+LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.2"))
+
+# Response cache (see llm_cache.py)
+#   LLM_CACHE_ENABLED      1 (default) | 0
+#   LLM_CACHE_MAX_ENTRIES  in-process LRU size (default 2048)
+#   LLM_CACHE_SQLITE_PATH  optional on-disk tier shared across workers
+#   LLM_CACHE_TTL_<TYPE>   per-prompt-type TTL in seconds, 0 disables
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1").strip().lower() not in {"0", "false", "no"}
+
+PROVIDERS = {}
+
+
+def register_provider(name: str):
+    """Register a factory returning a LangChain chat model for LLM_PROVIDER=name."""
+    def decorator(factory):
+        PROVIDERS[name] = factory
+        return factory
+    return decorator
+
+
+@register_provider("groq")
+def _groq_provider():
+    from langchain_groq import ChatGroq
+
+    if not GROQ_API_KEY:
+        print("WARNING: GROQ_API_KEY not found. Please set it in .env file.")
+
+    # Model options: llama-3.3-70b-versatile (recommended), llama-3.1-8b-instant (fast/cheap), mixtral-8x7b-32768
+    return ChatGroq(
+        temperature=LLM_TEMPERATURE,
+        model_name=os.getenv("LLM_MODEL", "llama-3.3-70b-versatile"),  # Upgraded: far better JSON accuracy for legal reasoning
+        groq_api_key=GROQ_API_KEY
+    )
+
+
+@register_provider("stub")
+def _stub_provider():
+    from stub_llm import StubChatModel, load_fixtures
+
+    fixtures_path = os.getenv("STUB_LLM_FIXTURES", "")
+    return StubChatModel(
+        model_name=os.getenv("LLM_MODEL", "stub-legal-v1"),
+        temperature=LLM_TEMPERATURE,
+        latency_ms=float(os.getenv("STUB_LLM_LATENCY_MS", "0")),
+        jitter_ms=float(os.getenv("STUB_LLM_JITTER_MS", "0")),
+        seed=int(os.getenv("STUB_LLM_SEED", "0")),
+        fixtures=load_fixtures(fixtures_path) if fixtures_path else {},
+    )
+
+
+def get_llm(provider: str = None):
+    name = (provider or LLM_PROVIDER).strip().lower()
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown LLM_PROVIDER '{name}'. Available: {', '.join(sorted(PROVIDERS))}")
+    return PROVIDERS[name]()
+
+
+def build_llm(provider: str = None):
+    model = get_llm(provider)
+    if not LLM_CACHE_ENABLED:
+        return model
+    from llm_cache import CachedLLM
+    return CachedLLM(
+        model,
+        max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2048")),
+        sqlite_path=os.getenv("LLM_CACHE_SQLITE_PATH", ""),
+    )
+
+
+class LazyLLM:
+    """Stands in for the shared model and builds it on first use.
+
+    Importing this module stays cheap (no provider SDK import, no client);
+    the app lifespan calls get() at startup so the first request does not pay
+    for it either.
+    """
+
+    def __init__(self, provider: str = None):
+        self._provider = provider
+        self._model    = None
+        self._lock     = threading.Lock()
+
+    @property
+    def initialised(self) -> bool:
+        return self._model is not None
+
+    def get(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = build_llm(self._provider)
+        return self._model
+
+    # Calls go through here so llm_usage can attribute them to the current task
+    # and telemetry can time them by prompt type.
+    def invoke(self, messages, *args, **kwargs):
+        prompt_type = infer_prompt_type(messages)
+        record_call(prompt_type)
+        with observe_llm_call(prompt_type) as call:
+            response = self.get().invoke(messages, *args, **kwargs)
+            call.response(response)
+        return response
+
+    async def ainvoke(self, messages, *args, **kwargs):
+        prompt_type = infer_prompt_type(messages)
+        record_call(prompt_type)
+        with observe_llm_call(prompt_type) as call:
+            response = await self.get().ainvoke(messages, *args, **kwargs)
+            call.response(response)
+        return response
+
+    async def astream(self, messages, *args, **kwargs):
+        prompt_type = infer_prompt_type(messages)
+        record_call(prompt_type)
+        with observe_llm_call(prompt_type) as call:
+            async for chunk in self.get().astream(messages, *args, **kwargs):
+                call.chunk(chunk)
+                yield chunk
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+def llm_cache_stats() -> dict:
+    if not llm.initialised:
+        return {"enabled": LLM_CACHE_ENABLED, "initialised": False}
+    model = llm.get()
+    return model.stats() if hasattr(model, "stats") else {"enabled": False}
+
+
+# Shared LLM for the configured provider, built on first use
+llm = LazyLLM()
@@ -0,0 +1,57 @@
+"""
+llm_usage.py — Per-task accounting of LLM calls.
+
+    with track_llm_usage() as usage:
+        await agenerate_bilingual_document(...)
+    usage.as_dict()   # {"calls": 5, "provider_calls": 4, "cache_hits": 1, "by_prompt_type": {...}}
+
+The tracker lives in a context variable, so it follows the work into the
+asyncio tasks it spawns (pipeline steps) and does not mix with concurrent
+work elsewhere in the process. Calls are recorded by the shared LLM handle
+(llm_provider.LazyLLM); the response cache marks the ones it answered.
+"""
+
+import contextvars
+from collections import Counter
+from contextlib import contextmanager
+from typing import Optional
+
+
+class LLMUsage:
+    def __init__(self):
+        self.calls      = Counter()    # prompt type -> calls made by the code
+        self.cache_hits = Counter()    # prompt type -> answered by cache / a joined in-flight call
+
+    def as_dict(self) -> dict:
+        calls, hits = sum(self.calls.values()), sum(self.cache_hits.values())
+        return {
+            "calls":          calls,
+            "provider_calls": calls - hits,
+            "cache_hits":     hits,
+            "by_prompt_type": dict(self.calls),
+        }
+
+
+_current: contextvars.ContextVar[Optional[LLMUsage]] = contextvars.ContextVar("llm_usage", default=None)
+
+
+@contextmanager
+def track_llm_usage():
+    usage = LLMUsage()
+    token = _current.set(usage)
+    try:
+        yield usage
+    finally:
+        _current.reset(token)
+
+
+def record_call(prompt_type: str) -> None:
+    usage = _current.get()
+    if usage is not None:
+        usage.calls[prompt_type] += 1
+
+
+def record_cache_hit(prompt_type: str) -> None:
+    usage = _current.get()
+    if usage is not None:
+        usage.cache_hits[prompt_type] += 1
@@ -1,10 +1,43 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from graph import process_message
+from typing import List, Optional
+from contextlib import asynccontextmanager
+from fastapi.responses import JSONResponse, Response
+from graph import (process_message, stream_message, checkpoint_stats, checkpointer_health,
+                   get_graph_app, close_graph_app, CHECKPOINTER_FALLBACK, WEB_CONCURRENCY)
+from thread_lock import ThreadBusy
+from batch import run_batch, BATCH_MAX_CONCURRENCY, BATCH_MAX_CONVERSATIONS
+from llm_provider import llm, llm_cache_stats
+from telemetry import metrics_payload
+from statutes import STATUTES, reload_statutes, statute_table
+from reference_data import REFERENCE, reload_reference
 import uvicorn
 import os
+import hmac
+import json
+import sys
+import asyncio
 
-app = FastAPI(title="Legal AI LangGraph Service", version="3.0")
+# psycopg's async driver cannot run on the default Proactor loop on Windows.
+if sys.platform == "win32":
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Connect the checkpointer and build the LLM client in the background, so the
+    # server accepts connections immediately; a request arriving before they are
+    # ready simply waits for the same initialisation. With CHECKPOINTER_FALLBACK=fail
+    # the checkpointer is awaited here, so a missing database stops startup.
+    if CHECKPOINTER_FALLBACK == "fail":
+        await get_graph_app()
+    warmup = asyncio.gather(get_graph_app(), asyncio.to_thread(llm.get),
+                            asyncio.to_thread(statute_table), return_exceptions=True)
+    yield
+    await warmup
+    await close_graph_app()
+
+app = FastAPI(title="Legal AI LangGraph Service", version="3.0", lifespan=lifespan)
 
 class ProcessRequest(BaseModel):
     thread_id: str
@@ -13,6 +46,15 @@ class ProcessRequest(BaseModel):
 class ProcessResponse(BaseModel):
     result: dict
 
+class BatchConversation(BaseModel):
+    thread_id: str
+    messages: List[str] = []
+    message: Optional[str] = None   # shorthand for a single-turn conversation
+
+class BatchRequest(BaseModel):
+    conversations: List[BatchConversation]
+    concurrency: int = BATCH_MAX_CONCURRENCY
+
 import logging
 import traceback
 
@@ -24,12 +66,97 @@ logger = logging.getLogger(__name__)
 async def process_endpoint(request: ProcessRequest):
     try:
         logger.info(f"Processing message for thread_id: {request.thread_id}")
-        response_data = process_message(request.thread_id, request.message)
+        response_data = await process_message(request.thread_id, request.message)
         return {"result": response_data}
+    except ThreadBusy:
+        raise HTTPException(status_code=409, detail="Another message for this conversation is still being processed.")
     except Exception as e:
         logger.error(f"Error processing message: {str(e)}")
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/process/stream")
+async def process_stream_endpoint(request: ProcessRequest):
+    """Server-Sent Events version of /process.
+
+    Each event is `event: <name>` plus a JSON `data:` line (see
+    graph.stream_message); the last one is `done` with the /process result.
+    """
+    logger.info(f"Streaming message for thread_id: {request.thread_id}")
+
+    async def events():
+        try:
+            async for event in stream_message(request.thread_id, request.message):
+                yield f"event: {event['event']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            logger.error(f"Error streaming message: {str(e)}")
+            traceback.print_exc()
+            yield f"event: error\ndata: {json.dumps({'event': 'error', 'detail': str(e)})}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.post("/process/batch")
+async def process_batch_endpoint(request: BatchRequest):
+    """Run many conversations; responds with NDJSON, one line per finished turn
+    (in completion order) and a final {"summary": ...} line."""
+    conversations = [
+        {"thread_id": c.thread_id, "messages": c.messages or ([c.message] if c.message else [])}
+        for c in request.conversations
+    ]
+    if len(conversations) > BATCH_MAX_CONVERSATIONS:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_CONVERSATIONS} conversations per batch.")
+    if len({c["thread_id"] for c in conversations}) != len(conversations):
+        raise HTTPException(status_code=422, detail="Each thread_id may appear only once per batch.")
+    if any(not c["messages"] for c in conversations):
+        raise HTTPException(status_code=422, detail="Every conversation needs at least one message.")
+    logger.info(f"Batch of {len(conversations)} conversations, concurrency {request.concurrency}")
+
+    async def lines():
+        async for item in run_batch(conversations, request.concurrency):
+            yield json.dumps(item, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@app.get("/health")
+async def health_endpoint():
+    checkpointer = checkpointer_health()
+    code = 503 if checkpointer["status"] == "unavailable" else 200
+    return JSONResponse({"status": checkpointer["status"], "checkpointer": checkpointer}, status_code=code)
+
+@app.get("/stats")
+async def stats_endpoint():
+    return {"llm_cache": llm_cache_stats(), "checkpoint": checkpoint_stats(),
+            "data_files": {"reference": REFERENCE.status(), "statutes": STATUTES.status()}}
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus exposition of node / LLM latency, tokens, errors and fallbacks (see telemetry.py)."""
+    body, content_type = metrics_payload()
+    return Response(content=body, media_type=content_type)
+
+# Disabled unless ADMIN_TOKEN is set; callers send it in X-Admin-Token.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+@app.post("/admin/reload")
+async def admin_reload_endpoint(x_admin_token: str = Header(default="")):
+    """Reload data/reference.json and data/statutes.json in this worker now.
+
+    Other workers pick the files up within their reload interval. A file that
+    fails to validate is not applied (422), and the version in use is kept."""
+    if not ADMIN_TOKEN or not hmac.compare_digest(x_admin_token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Set ADMIN_TOKEN and send it in the X-Admin-Token header.")
+    await asyncio.to_thread(reload_reference)
+    await asyncio.to_thread(reload_statutes)
+    files = {"reference": REFERENCE.status(), "statutes": STATUTES.status()}
+    if any(f["error"] for f in files.values()):
+        raise HTTPException(status_code=422, detail=files)
+    return {"pid": os.getpid(), **files}
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # WEB_CONCURRENCY > 1 runs several worker processes on the same port; this
+    # needs the Postgres checkpointer (see graph.py / GUIDE_TO_RUN.md).
+    if WEB_CONCURRENCY > 1:
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, workers=WEB_CONCURRENCY)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8000)
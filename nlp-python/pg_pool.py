@@ -0,0 +1,100 @@
+"""
+pg_pool.py — Configuration and saturation metrics for the Postgres connection pools.
+
+Each worker opens two pools: "checkpoints" for the checkpointer's reads and
+writes, and, with Postgres thread locks (thread_lock.py), a small "thread_locks"
+pool whose connections each hold one conversation's advisory lock for a whole
+turn. Keeping them apart means a turn never waits for a checkpoint connection
+held by another turn's lock. All limits come from the environment so the pools
+can be sized to the worker count (total connections =
+workers x (PG_POOL_MAX_SIZE + PG_LOCK_POOL_MAX_SIZE) must stay under the
+server's max_connections):
+
+  PG_POOL_MIN_SIZE       connections kept open (default 2)
+  PG_POOL_MAX_SIZE       upper bound per worker process (default 20)
+  PG_POOL_TIMEOUT        seconds a request waits for a free connection before failing (default 10)
+  PG_POOL_MAX_WAITING    requests allowed to queue for a connection, 0 = unbounded (default 0)
+  PG_POOL_MAX_IDLE       seconds an idle connection above min size is kept (default 300)
+  PG_POOL_MAX_LIFETIME   seconds before a connection is recycled (default 3600)
+  PG_POOL_OPEN_TIMEOUT   seconds to wait for min size connections at startup (default 10)
+  PG_CONNECT_TIMEOUT     seconds for a single connection attempt (default 5)
+  PG_LOCK_POOL_MAX_SIZE  lock connections per worker = conversations with a turn in
+                         progress at once; further turns queue for one (default 20)
+
+pool_stats() turns psycopg_pool's counters into the gauges worth watching:
+connections in use, requests waiting, average / cumulative checkout wait and
+checkout failures (timeouts and errors). They are served under
+checkpoint.pool in /stats and as the legal_pg_pool_* gauges on /metrics
+(telemetry.py).
+"""
+
+import os
+from typing import Any, Dict
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+POOL_MIN_SIZE     = int(os.getenv("PG_POOL_MIN_SIZE", "2"))
+POOL_MAX_SIZE     = int(os.getenv("PG_POOL_MAX_SIZE", "20"))
+POOL_TIMEOUT      = _env_float("PG_POOL_TIMEOUT", 10.0)
+POOL_MAX_WAITING  = int(os.getenv("PG_POOL_MAX_WAITING", "0"))
+POOL_MAX_IDLE     = _env_float("PG_POOL_MAX_IDLE", 300.0)
+POOL_MAX_LIFETIME = _env_float("PG_POOL_MAX_LIFETIME", 3600.0)
+POOL_OPEN_TIMEOUT = _env_float("PG_POOL_OPEN_TIMEOUT", 10.0)
+CONNECT_TIMEOUT   = int(_env_float("PG_CONNECT_TIMEOUT", 5))
+LOCK_POOL_MAX_SIZE = int(os.getenv("PG_LOCK_POOL_MAX_SIZE", "20"))
+
+
+def pool_settings() -> Dict[str, Any]:
+    return {
+        "min_size":     min(POOL_MIN_SIZE, POOL_MAX_SIZE),
+        "max_size":     POOL_MAX_SIZE,
+        "timeout":      POOL_TIMEOUT,
+        "max_waiting":  POOL_MAX_WAITING,
+        "max_idle":     POOL_MAX_IDLE,
+        "max_lifetime": POOL_MAX_LIFETIME,
+    }
+
+
+def lock_pool_settings() -> Dict[str, Any]:
+    # thread_lock.py checks lock connections out with THREAD_LOCK_TIMEOUT_S, so a
+    # turn waits for one as long as it would wait for a busy thread.
+    return dict(pool_settings(), min_size=min(1, LOCK_POOL_MAX_SIZE), max_size=LOCK_POOL_MAX_SIZE)
+
+
+async def open_pool(db_url: str, name: str = "checkpoints", settings: Dict[str, Any] = None):
+    from psycopg_pool import AsyncConnectionPool
+
+    pool = AsyncConnectionPool(
+        conninfo=db_url, open=False, name=name,
+        kwargs={"autocommit": True, "prepare_threshold": 0, "connect_timeout": CONNECT_TIMEOUT},
+        **(settings or pool_settings()),
+    )
+    await pool.open(wait=True, timeout=POOL_OPEN_TIMEOUT)
+    return pool
+
+
+def pool_stats(pool) -> Dict[str, Any]:
+    raw       = pool.get_stats()
+    size      = raw.get("pool_size", 0)
+    available = raw.get("pool_available", 0)
+    queued    = raw.get("requests_queued", 0)
+    wait_ms   = raw.get("requests_wait_ms", 0)
+    return {
+        "min_size":           raw.get("pool_min", 0),
+        "max_size":           raw.get("pool_max", 0),
+        "size":               size,
+        "in_use":             size - available,
+        "available":          available,
+        "requests_waiting":   raw.get("requests_waiting", 0),
+        "checkouts":          raw.get("requests_num", 0),
+        "checkouts_queued":   queued,
+        "checkout_wait_ms":   wait_ms,
+        "avg_queued_wait_ms": round(wait_ms / queued, 2) if queued else 0.0,
+        "checkout_failures":  raw.get("requests_errors", 0),
+        "connect_failures":   raw.get("connections_errors", 0),
+        "connections_lost":   raw.get("connections_lost", 0),
+        "returns_bad":        raw.get("returns_bad", 0),
+    }
@@ -0,0 +1,43 @@
+"""
+prompt_types.py — Identify which prompt a list of chat messages belongs to.
+
+Every LLM call site in graph.py and bilingual_generator.py uses a fixed system
+message or opening line. Matching on those markers lets the stub backend,
+the response cache and metrics agree on a prompt type without threading an
+extra tag through each call.
+"""
+
+from typing import List
+from langchain_core.messages import BaseMessage, SystemMessage
+
+
+# (prompt_type, marker) — first match wins, system messages are checked first.
+PROMPT_TYPE_MARKERS = [
+    ("language",           "Detect the ISO 639-1 language code"),
+    ("classification",     "Legal intake planner"),
+    ("extraction",         "Fact extractor"),
+    ("address_parse",      "Indian address parser"),
+    ("confirmation",       "Write a confirmation message"),
+    ("translation",        "Professional legal translator"),
+    ("next_steps",         "Next steps advisor"),
+    ("doc_classification", "Indian legal classifier"),
+    ("subject",            "Subject line writer"),
+    ("body",               "Legal letter writer"),
+    ("readiness",          "Score the evidence readiness"),
+    ("entity_translation", "Translate these Indian legal entity names"),
+    ("fact_translation",   "Translate these factual details into English"),
+]
+
+PROMPT_TYPES = [t for t, _ in PROMPT_TYPE_MARKERS]
+UNKNOWN      = "other"
+
+
+def infer_prompt_type(messages: List[BaseMessage]) -> str:
+    ordered = ([m for m in messages if isinstance(m, SystemMessage)] +
+               [m for m in messages if not isinstance(m, SystemMessage)])
+    for m in ordered:
+        text = str(m.content)
+        for prompt_type, marker in PROMPT_TYPE_MARKERS:
+            if marker in text:
+                return prompt_type
+    return UNKNOWN
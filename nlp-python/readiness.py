@@ -0,0 +1,169 @@
+"""
+readiness.py — Evidence readiness score (0–100) computed locally, without the LLM.
+
+    score = 100 × (w_evidence × E + w_coverage × C × (s + (1 − s) × E))
+
+  E  evidence strength, from the answers to the evidence questions
+     (EVIDENCE_KEYS). Each kind of evidence named in them (EVIDENCE_WEIGHTS:
+     receipt, screenshot, bank statement, ...) adds its weight with
+     diminishing returns, E = 1 − Π(1 − w); an answer that names none still
+     counts a little, and one that says there is none ("no", "nil", "I have
+     no ...", "I don't have ...") counts nothing.
+  C  coverage: the share of the interview plan that was answered, or, without
+     a plan, the number of case facts against EXPECTED_CASE_FACTS.
+  w  per-category weights (CATEGORY_WEIGHTS): documents carry more weight in a
+     consumer or banking complaint than in an RTI application.
+  s  NO_EVIDENCE_SHARE: the part of the coverage credit given without any
+     evidence. A document is only generated once the interview is done, so C
+     is about 1 there; scaling its credit by the evidence keeps a case with
+     none at or below 100 × w_coverage × s, under 30 for every category.
+
+The bands follow the rubric the LLM was given — 90+ strong documentary
+evidence, 60–89 some evidence with gaps, 30–59 limited, under 30 none.
+benchmarks/calibrate_readiness.py checks the scripted answers land in their
+band and reports how the local score compares with LLM scores on a sample
+and which category weights that sample suggests.
+
+The same facts always give the same score, in a few microseconds. The
+keywords are English: bilingual documents are scored on the facts after
+translation to English.
+"""
+
+import re
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from text_utils import KeywordMatcher
+
+
+# ============================================================
+# MODEL
+# ============================================================
+
+# Fact keys that hold the user's description of their evidence.
+EVIDENCE_KEYS = ["evidence_available", "evidence_details",
+                 "documents_available", "proof_available"]
+
+# Kind of evidence → how much it adds on its own (0–1). Documents issued by a
+# third party weigh most, the user's own messages and photos less, and the
+# generic words least.
+EVIDENCE_WEIGHTS: Dict[str, float] = {
+    "receipt":  0.50, "bill":        0.50, "invoice":  0.50, "agreement": 0.55,
+    "contract": 0.55, "certificate": 0.50, "report":   0.50, "statement": 0.45,
+    "bank":     0.40, "record":      0.40, "document": 0.30, "cctv":      0.50,
+    "video":    0.40, "screenshot":  0.40, "photo":    0.35, "email":     0.35,
+    "sms":      0.35, "whatsapp":    0.35, "message":  0.30, "policy":    0.45,
+    "medical":  0.50, "witness":     0.30, "proof":    0.20, "evidence":  0.15,
+}
+UNNAMED_EVIDENCE_WEIGHT = 0.25       # an answer that names no kind of evidence ("my neighbour saw it")
+
+EVIDENCE_KEYWORDS = KeywordMatcher(list(EVIDENCE_WEIGHTS))
+
+# An answer saying there is none — "No", "nil", "I have no documentary evidence
+# at this time" (the wording graph.py suggests), "I don't have any" — unless it
+# goes on with "but ...".
+_NO_EVIDENCE = re.compile(
+    r"^\s*(?:i\s+)?(?:no|none|nothing|nil|not yet|not available|there\s+is\s+no|"
+    r"ha(?:ve|d)\s+no(?:thing)?|ha(?:ve|d)\s*n[o']?t(?:\s+got)?|d(?:o|id)\s*n[o']?t\s+have)\b(?!.*\bbut\b)",
+    re.IGNORECASE | re.DOTALL)
+
+
+class Weights(NamedTuple):
+    evidence: float
+    coverage: float
+
+
+DEFAULT_WEIGHTS = Weights(0.60, 0.40)
+
+NO_EVIDENCE_SHARE = 0.35             # keep max(w_coverage) × this below 0.30
+
+CATEGORY_WEIGHTS: Dict[str, Weights] = {
+    "Theft / Robbery":             Weights(0.45, 0.55),
+    "Assault":                     Weights(0.50, 0.50),
+    "Harassment / Threat":         Weights(0.50, 0.50),
+    "Cyber crime":                 Weights(0.60, 0.40),
+    "Cheating / Fraud":            Weights(0.60, 0.40),
+    "Consumer complaint":          Weights(0.70, 0.30),
+    "Banking issue":               Weights(0.70, 0.30),
+    "Insurance dispute":           Weights(0.70, 0.30),
+    "Property dispute":            Weights(0.70, 0.30),
+    "Salary / Employment dispute": Weights(0.65, 0.35),
+    "Workplace Complaints":        Weights(0.65, 0.35),
+    "Landlord / Tenant dispute":   Weights(0.65, 0.35),
+    "Family / Matrimonial":        Weights(0.50, 0.50),
+    "RTI Application":             Weights(0.20, 0.80),
+    "Other civil complaint":       DEFAULT_WEIGHTS,
+}
+
+# Without an interview plan, this many case facts count as full coverage.
+EXPECTED_CASE_FACTS = 6
+
+# Facts about the user rather than the case; they do not count towards coverage.
+_PERSONAL_PREFIXES = ("user_", "complainant_")
+
+_MISSING = {"", "null", "unknown", "not available", "none", "n/a", "na"}
+
+
+# ============================================================
+# SCORING
+# ============================================================
+
+class Readiness(NamedTuple):
+    score:    int
+    evidence: float
+    coverage: float
+    weights:  Weights
+    kinds:    Tuple[str, ...]           # kinds of evidence named
+
+
+def _present(value) -> bool:
+    return value is not None and str(value).strip().lower() not in _MISSING
+
+
+def evidence_strength(answers: Iterable[str]) -> Tuple[float, Tuple[str, ...]]:
+    """(E, kinds of evidence named) for the evidence answers."""
+    kinds, missing, unnamed = set(), 1.0, 0
+    for answer in answers:
+        if _NO_EVIDENCE.match(answer):
+            continue
+        found = EVIDENCE_KEYWORDS.findall(answer)
+        if found:
+            kinds |= found
+        else:
+            unnamed += 1
+    for kind in kinds:
+        missing *= 1.0 - EVIDENCE_WEIGHTS[kind]
+    missing *= (1.0 - UNNAMED_EVIDENCE_WEIGHT) ** unnamed
+    return 1.0 - missing, tuple(sorted(kinds))
+
+
+def plan_coverage(facts: dict, interview_plan: Optional[list] = None,
+                  answered_keys: Optional[Iterable[str]] = None) -> float:
+    if interview_plan:
+        answered = set(answered_keys or ())
+        plan_keys = {step["key"] for step in interview_plan}
+        done = sum(1 for k in plan_keys if k in answered or _present(facts.get(k)))
+        return done / len(plan_keys)
+    case_facts = sum(1 for k, v in facts.items()
+                     if not k.startswith(_PERSONAL_PREFIXES) and _present(v))
+    return min(1.0, case_facts / EXPECTED_CASE_FACTS)
+
+
+def coverage_credit(coverage: float, evidence: float) -> float:
+    """C × (s + (1 − s) × E): full coverage counts fully only with evidence."""
+    return coverage * (NO_EVIDENCE_SHARE + (1.0 - NO_EVIDENCE_SHARE) * evidence)
+
+
+def assess(category: str, facts: dict, interview_plan: Optional[list] = None,
+           answered_keys: Optional[Iterable[str]] = None) -> Readiness:
+    answers  = [str(facts[k]) for k in EVIDENCE_KEYS if _present(facts.get(k))]
+    evidence, kinds = evidence_strength(answers)
+    coverage = plan_coverage(facts, interview_plan, answered_keys)
+    weights  = CATEGORY_WEIGHTS.get(category, DEFAULT_WEIGHTS)
+    score    = round(100 * (weights.evidence * evidence +
+                            weights.coverage * coverage_credit(coverage, evidence)))
+    return Readiness(max(0, min(100, score)), evidence, coverage, weights, kinds)
+
+
+def readiness_score(category: str, facts: dict, interview_plan: Optional[list] = None,
+                    answered_keys: Optional[Iterable[str]] = None) -> int:
+    return assess(category, facts, interview_plan, answered_keys).score
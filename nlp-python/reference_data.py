@@ -0,0 +1,226 @@
+"""
+reference_data.py — Labels, disclaimers, hints and category questions from data/reference.json.
+
+Everything the conversation and document code looks up by language, fact key
+or category:
+
+  languages            code → language name used in prompts
+  doc_labels           per-language document labels (missing keys fall back to "en")
+  day_names            per-language weekday names for the date line
+  disclaimers          per-language disclaimer ("en" required)
+  example_hints        format hint appended to a question, by fact key
+  personal_keys        questions appended at the end of every interview plan
+  prefilled_keys       personal keys filled by the backend, never asked
+  evidence_question    template plus examples per category
+  authority_questions  location / other-party questions added per category
+  subjects             per-language subject line phrases by doc_type and category;
+                       languages without them get an LLM-written subject
+                       (bilingual_generator.py)
+
+Adding a language or a category is an edit to the JSON file: each worker
+picks it up within REFERENCE_RELOAD_INTERVAL_S seconds (default 5) of its
+next conversation turn, or at once with POST /admin/reload (hot_reload.py).
+Lookups go through reference(), which returns the version held in a module
+global; the file check runs once per turn (check_reference, called by
+graph.py), not on every lookup.
+
+A version is built once into read-only structures — MappingProxyType over
+dicts, tuples, interned strings — and
+never modified afterwards, so requests share it without locks or copies and a
+lookup is a dict get, whatever the number of languages and categories. It is
+loaded at import, so worker processes forked from a preloading master
+(gunicorn --preload) inherit it instead of each building their own. Plan
+steps (authority, evidence and personal questions, the evidence question
+already formatted) are kept privately as plain dicts in plain dicts and handed
+out as copies, since the caller stores them in conversation state.
+"""
+
+import os
+import sys
+import json
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple
+
+from hot_reload import ReloadableFile
+
+
+REFERENCE_PATH              = os.getenv("REFERENCE_PATH",
+                                        os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                     "data", "reference.json"))
+REFERENCE_RELOAD_INTERVAL_S = float(os.getenv("REFERENCE_RELOAD_INTERVAL_S", "5"))
+
+SECTIONS = ("languages", "doc_labels", "day_names", "disclaimers", "example_hints",
+            "personal_keys", "prefilled_keys", "evidence_question", "authority_questions", "subjects")
+
+SUBJECT_PARTY_MAX_LEN = 40        # longer other-party values are left out of the subject
+SUBJECT_MAX_WORDS     = 10        # the limit the LLM was given; phrases are checked against it
+
+_INTERN_MAX_LEN = 64
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only copy: dicts → MappingProxyType, lists → tuples, short strings interned."""
+    if isinstance(value, dict):
+        return MappingProxyType({sys.intern(str(k)): _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, str) and len(value) <= _INTERN_MAX_LEN:
+        return sys.intern(value)
+    return value
+
+
+def _steps(where: str, steps: Any) -> Tuple[Dict[str, str], ...]:
+    """Plan steps as plain dicts, private to ReferenceData and copied on the way out
+    (dict.copy is several times cheaper than copying a MappingProxyType)."""
+    if not isinstance(steps, list):
+        raise ValueError(f"{where}: expected a list of questions")
+    for step in steps:
+        if not all(isinstance(step.get(f), str) and step.get(f) for f in ("key", "label", "question")):
+            raise ValueError(f"{where}: every question needs 'key', 'label' and 'question'")
+    return tuple({sys.intern(k): _freeze(v) for k, v in step.items()} for step in steps)
+
+
+def _evidence_step(question: str) -> Dict[str, str]:
+    return {"key": "evidence_available", "label": "Evidence Available", "question": question}
+
+
+def _subject_phrases(lang: str, phrases: Any) -> dict:
+    where = f"subjects[{lang!r}]"
+    for field in ("doc_types", "default", "matters", "default_matter", "against"):
+        if field not in phrases:
+            raise ValueError(f"{where}: missing {field!r}")
+    try:
+        for template in [phrases["default"], *phrases["doc_types"].values()]:
+            template.format(matter="", against="")
+        phrases["against"].format(other_party="")
+    except (KeyError, IndexError) as e:
+        raise ValueError(f"{where}: unknown placeholder {e}") from None
+    if "{other_party}" not in phrases["against"]:
+        raise ValueError(f"{where}: 'against' needs {{other_party}}")
+    for template in [phrases["default"], *phrases["doc_types"].values()]:
+        for matter in [phrases["default_matter"], *phrases["matters"].values()]:
+            words = len(template.format(matter=matter, against="").split())
+            if words > SUBJECT_MAX_WORDS:
+                raise ValueError(f"{where}: {template!r} with {matter!r} is {words} words "
+                                 f"(max {SUBJECT_MAX_WORDS})")
+    return phrases
+
+
+class ReferenceData:
+    """One loaded version of data/reference.json."""
+
+    def __init__(self, raw: dict, source: str = ""):
+        missing = [s for s in SECTIONS if s not in raw]
+        if missing:
+            raise ValueError(f"missing sections: {', '.join(missing)}")
+        if "en" not in raw["doc_labels"] or "en" not in raw["disclaimers"]:
+            raise ValueError("doc_labels and disclaimers need an 'en' entry")
+
+        self.version = str(raw.get("version", ""))
+        self.source  = source
+
+        en_labels = raw["doc_labels"]["en"]
+        self.language_names = _freeze(raw["languages"])
+        self.doc_labels     = _freeze({lang: {**en_labels, **labels}
+                                       for lang, labels in raw["doc_labels"].items()})
+        self.day_names      = _freeze(raw["day_names"])
+        self.disclaimers    = _freeze(raw["disclaimers"])
+        self.example_hints  = _freeze(raw["example_hints"])
+
+        self._personal        = _steps("personal_keys", raw["personal_keys"])
+        self.personal_key_set = frozenset([s["key"] for s in self._personal] +
+                                          list(raw["prefilled_keys"]))
+
+        evidence = raw["evidence_question"]
+        template = evidence["template"]
+        if "{examples}" not in template:
+            raise ValueError("evidence_question.template needs an {examples} placeholder")
+        self._evidence         = {sys.intern(category): _evidence_step(template.format(examples=examples))
+                                  for category, examples in evidence["examples"].items()}
+        self._evidence_default = _evidence_step(template.format(examples=evidence["default_examples"]))
+
+        self._authority = {
+            sys.intern(category): _steps(f"authority_questions[{category!r}]", steps)
+            for category, steps in raw["authority_questions"].items()}
+
+        if "en" not in raw["subjects"]:
+            raise ValueError("subjects needs an 'en' entry")
+        self._subjects = _freeze({lang: _subject_phrases(lang, phrases)
+                                  for lang, phrases in raw["subjects"].items()})
+
+    def labels(self, lang: str) -> Mapping[str, str]:
+        return self.doc_labels.get(lang) or self.doc_labels["en"]
+
+    def disclaimer(self, lang: str) -> str:
+        return self.disclaimers.get(lang) or self.disclaimers["en"]
+
+    def language_name(self, lang: str, default: str = "English") -> str:
+        return self.language_names.get(lang, default)
+
+    def day_name(self, lang: str, english_day: str) -> str:
+        return self.day_names.get(lang, {}).get(english_day, english_day)
+
+    def has_subjects(self, lang: str) -> bool:
+        return lang in self._subjects
+
+    def subject(self, lang: str, doc_type: str, category: str, other_party: str = "") -> str:
+        """Subject line for the document: the doc_type's phrase with the category's
+        {matter} filled in and {against} naming the other party, if there is a
+        short one and the line stays within SUBJECT_MAX_WORDS (phrases for
+        documents addressed to that party leave it out). Languages without
+        phrases get the English line."""
+        phrases     = self._subjects.get(lang) or self._subjects["en"]
+        template    = phrases["doc_types"].get(doc_type, phrases["default"])
+        matter      = phrases["matters"].get(category, phrases["default_matter"])
+        other_party = other_party.strip().rstrip(",") if other_party else ""
+        if other_party and len(other_party) <= SUBJECT_PARTY_MAX_LEN:
+            subject = template.format(matter=matter,
+                                      against=phrases["against"].format(other_party=other_party)).split()
+            if len(subject) <= SUBJECT_MAX_WORDS:
+                return " ".join(subject)
+        return " ".join(template.format(matter=matter, against="").split())
+
+    def evidence_question(self, category: str) -> dict:
+        return self._evidence.get(category, self._evidence_default).copy()
+
+    def authority_questions(self, category: str) -> List[dict]:
+        return [step.copy() for step in self._authority.get(category, ())]
+
+    def personal_questions(self) -> List[dict]:
+        return [step.copy() for step in self._personal]
+
+
+def load_reference(path: str = REFERENCE_PATH) -> ReferenceData:
+    with open(path, encoding="utf-8") as f:
+        return ReferenceData(json.load(f), source=path)
+
+
+# ============================================================
+# CURRENT VERSION (hot reload)
+# ============================================================
+
+_current: ReferenceData
+
+
+def _install(value: ReferenceData) -> None:
+    global _current
+    _current = value
+
+
+REFERENCE = ReloadableFile("reference_data", REFERENCE_PATH, load_reference, REFERENCE_RELOAD_INTERVAL_S,
+                           on_load=_install)
+REFERENCE.get()
+
+
+def reference() -> ReferenceData:
+    """The current version."""
+    return _current
+
+
+def check_reference() -> ReferenceData:
+    """Reload if the file changed since the last check (at most every REFERENCE_RELOAD_INTERVAL_S)."""
+    return REFERENCE.get()
+
+
+def reload_reference() -> ReferenceData:
+    return REFERENCE.reload()
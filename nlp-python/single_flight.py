@@ -0,0 +1,36 @@
+"""
+single_flight.py — Coalesce identical concurrent calls onto one execution.
+
+While a call for a key is in flight, further calls with the same key do not
+start their own; they await the first one and receive the same result (or
+exception). The shared execution is shielded, so a caller that goes away
+(client disconnect, request timeout) does not cancel it for the others.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.started   = 0
+        self.coalesced = 0
+
+    def joining(self, key: Hashable) -> bool:
+        """True if do(key, ...) would join a call already in flight."""
+        return key in self._calls
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(fn())
+            self._calls[key] = call
+            call.add_done_callback(lambda _: self._calls.pop(key, None))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(call)
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._calls), "started": self.started, "coalesced": self.coalesced}
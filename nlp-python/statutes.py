@@ -0,0 +1,126 @@
+"""
+statutes.py — Applicable laws per document type, from data/statutes.json.
+
+  - Table: for each doc_type, named triggers (fact keywords, matched as
+    case-insensitive substrings) and an ordered list of laws. A law with
+    "if": [...] is cited only when every listed trigger occurs in the facts;
+    one without is always cited. Adding a law or a keyword is a data change.
+  - Index: compiled once per load. Every distinct keyword of a doc_type maps
+    to a bitmask of the triggers it belongs to, and every law to the mask it
+    needs, so matching is one substring check per keyword (skipped once its
+    triggers have all hit) and then one integer test per law — adding laws
+    that reuse triggers adds no work on the facts text.
+  - Reload: an edited file is compiled and swapped in by each worker within
+    STATUTES_RELOAD_INTERVAL_S seconds (default 5), or at once with
+    POST /admin/reload; a file that fails to validate leaves the table in use
+    (hot_reload.py).
+
+Keywords are matched one `in` check at a time, for the reason given in
+text_utils.py (KeywordMatcher).
+"""
+
+import os
+import json
+from typing import Dict, List, NamedTuple, Tuple
+
+from hot_reload import ReloadableFile
+
+
+STATUTES_PATH              = os.getenv("STATUTES_PATH",
+                                       os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                    "data", "statutes.json"))
+STATUTES_RELOAD_INTERVAL_S = float(os.getenv("STATUTES_RELOAD_INTERVAL_S", "5"))
+
+
+# ============================================================
+# COMPILED TABLE
+# ============================================================
+
+class _DocTypeIndex(NamedTuple):
+    keywords: Tuple[Tuple[str, int], ...]     # (keyword, mask of triggers it belongs to)
+    laws:     Tuple[Tuple[str, int], ...]     # (citation, mask of triggers it needs)
+
+
+class StatuteTable:
+    """One loaded version of the statute table."""
+
+    def __init__(self, raw: dict, source: str = ""):
+        self.version  = str(raw.get("version", ""))
+        self.source   = source
+        self.triggers: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        self._index:   Dict[str, _DocTypeIndex] = {}
+
+        doc_types = raw.get("doc_types")
+        if not isinstance(doc_types, dict):
+            raise ValueError("'doc_types' must be an object")
+        for doc_type, spec in doc_types.items():
+            self._compile(doc_type, spec)
+
+    def _compile(self, doc_type: str, spec: dict) -> None:
+        triggers = {name: tuple(k.lower() for k in kws)
+                    for name, kws in (spec.get("triggers") or {}).items()}
+        bit      = {name: 1 << i for i, name in enumerate(triggers)}
+
+        keyword_masks: Dict[str, int] = {}
+        for name, kws in triggers.items():
+            if not kws or not all(kws):
+                raise ValueError(f"{doc_type}: trigger {name!r} needs non-empty keywords")
+            for k in kws:
+                keyword_masks[k] = keyword_masks.get(k, 0) | bit[name]
+
+        laws = []
+        for law in spec.get("laws") or []:
+            cite = law.get("cite", "")
+            if not isinstance(cite, str) or not cite.strip():
+                raise ValueError(f"{doc_type}: every law needs a 'cite'")
+            need = 0
+            for name in law.get("if", []):
+                if name not in bit:
+                    raise ValueError(f"{doc_type}: law {cite!r} uses unknown trigger {name!r}")
+                need |= bit[name]
+            laws.append((cite.strip(), need))
+
+        self.triggers[doc_type] = triggers
+        self._index[doc_type]   = _DocTypeIndex(tuple(keyword_masks.items()), tuple(laws))
+
+    def trigger_mask(self, doc_type: str, text: str) -> int:
+        index = self._index.get(doc_type)
+        if index is None or not index.keywords:
+            return 0
+        text, hits = text.lower(), 0
+        for keyword, mask in index.keywords:
+            if mask & ~hits and keyword in text:
+                hits |= mask
+        return hits
+
+    def applicable(self, doc_type: str, facts: dict) -> List[str]:
+        """Citations for doc_type given the collected facts, in table order, without repeats."""
+        index = self._index.get(doc_type)
+        if index is None:
+            return []
+        hits = self.trigger_mask(doc_type, " ".join(str(v) for v in facts.values() if v)) \
+            if index.keywords else 0
+        seen = set()
+        return [cite for cite, need in index.laws
+                if need & hits == need and not (cite in seen or seen.add(cite))]
+
+
+def load_statutes(path: str = STATUTES_PATH) -> StatuteTable:
+    with open(path, encoding="utf-8") as f:
+        return StatuteTable(json.load(f), source=path)
+
+
+# ============================================================
+# CURRENT TABLE (hot reload)
+# ============================================================
+
+STATUTES = ReloadableFile("statutes", STATUTES_PATH, load_statutes, STATUTES_RELOAD_INTERVAL_S)
+
+
+def statute_table() -> StatuteTable:
+    """The current table, reloaded if the file changed since the last check."""
+    return STATUTES.get()
+
+
+def reload_statutes() -> StatuteTable:
+    return STATUTES.reload()
@@ -0,0 +1,82 @@
+"""
+step_executor.py — Dependency-aware runner for small async pipelines.
+
+A pipeline is a list of Steps. Each step names the steps it depends on and
+receives the results of everything finished so far. A step starts as soon as
+all of its dependencies have finished, subject to a global concurrency cap, so
+independent LLM calls overlap instead of running back to back.
+"""
+
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class Step:
+    def __init__(self, name: str, fn: Callable[[Dict[str, Any]], Awaitable[Any]],
+                 deps: Iterable[str] = ()):
+        self.name = name
+        self.fn   = fn
+        self.deps = tuple(deps)
+
+
+def _check_graph(steps: List[Step]) -> None:
+    names = {s.name for s in steps}
+    if len(names) != len(steps):
+        raise ValueError("duplicate step names in pipeline")
+    for s in steps:
+        unknown = [d for d in s.deps if d not in names]
+        if unknown:
+            raise ValueError(f"step '{s.name}' depends on unknown step(s): {unknown}")
+
+    # Kahn's algorithm — anything left over is part of a cycle.
+    pending = {s.name: set(s.deps) for s in steps}
+    while pending:
+        ready = [n for n, deps in pending.items() if not deps]
+        if not ready:
+            raise ValueError(f"dependency cycle between steps: {sorted(pending)}")
+        for n in ready:
+            del pending[n]
+        for deps in pending.values():
+            deps.difference_update(ready)
+
+
+async def run_steps(steps: List[Step], max_concurrency: int = 0,
+                    on_result: Optional[Callable[[str, Any], None]] = None,
+                    ) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """Run the pipeline and return (results, timings_ms) keyed by step name.
+
+    max_concurrency <= 0 means no cap. Timings measure only the step body,
+    not the time spent waiting for dependencies or a concurrency slot.
+    on_result(name, result) is called as each step finishes, in completion order.
+    """
+    _check_graph(steps)
+
+    sem     = asyncio.Semaphore(max_concurrency if max_concurrency > 0 else len(steps) or 1)
+    results: Dict[str, Any]   = {}
+    timings: Dict[str, float] = {}
+    tasks:   Dict[str, asyncio.Task] = {}
+
+    async def _run(step: Step):
+        if step.deps:
+            await asyncio.gather(*(tasks[d] for d in step.deps))
+        async with sem:
+            start = time.perf_counter()
+            try:
+                results[step.name] = await step.fn(results)
+            finally:
+                timings[step.name] = round((time.perf_counter() - start) * 1000, 1)
+        if on_result is not None:
+            on_result(step.name, results[step.name])
+
+    for step in steps:
+        tasks[step.name] = asyncio.ensure_future(_run(step))
+
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for t in tasks.values():
+            t.cancel()
+        raise
+
+    return results, timings
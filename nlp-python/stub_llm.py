@@ -0,0 +1,414 @@
+"""
+stub_llm.py — Deterministic offline chat model for benchmarks, load tests and CI.
+
+StubChatModel is a drop-in LangChain chat model. It recognises each prompt
+used by the service (see prompt_types.py) and answers with a realistic reply
+in the shape the caller parses — JSON plans, extracted facts, address parts,
+letter bodies, subject lines, readiness integers, next-step arrays.
+
+Replies are a pure function of the prompt, so runs are reproducible. Latency
+is simulated with a fixed delay plus seeded jitter; when streamed, a fifth of
+the delay passes before the first token and the rest is spread across the
+remaining word-sized chunks. A fixtures file can
+override the scripted reply for any prompt type:
+
+    {"doc_classification": {"doc_type": "legal_notice", ...},
+     "subject": ["{\"subject\": \"First\"}", "{\"subject\": \"Second\"}"]}
+
+Non-string values are serialised to JSON; lists are replayed in order and
+cycle when exhausted.
+
+Responses carry usage_metadata with word counts standing in for token
+counts, so token metrics can be exercised offline.
+"""
+
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+import itertools
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+from prompt_types import infer_prompt_type
+
+
+# ============================================================
+# SCRIPTED CASE DATA
+# ============================================================
+
+# category → (trigger keywords, doc_type, case-specific interview plan)
+CATEGORY_SCRIPTS = {
+    "Theft / Robbery": (
+        ["stole", "stolen", "theft", "robbed", "robbery", "snatch", "burglary"],
+        "police_complaint_fir",
+        [("incident_date_time", "Date and Time of Theft", "When did the theft happen? Please give the date and approximate time."),
+         ("incident_location",  "Place of Theft",         "Where exactly did the theft take place?"),
+         ("stolen_items",       "Stolen Items and Value", "What items were stolen and what is their approximate value?")],
+    ),
+    "Assault": (
+        ["assault", "beat", "attacked", "hit me", "punched", "injured"],
+        "police_complaint_fir",
+        [("incident_date_time", "Date and Time",    "When did the assault happen?"),
+         ("incident_location",  "Location",         "Where did the assault take place?"),
+         ("assailant_details",  "Assailant",        "Who attacked you? Give the name if known."),
+         ("injuries_suffered",  "Injuries",         "What injuries did you suffer and did you receive treatment?")],
+    ),
+    "Cyber crime": (
+        ["upi", "otp", "online fraud", "phishing", "hacked", "cyber", "fake link"],
+        "cyber_fraud_complaint",
+        [("transaction_date",   "Date of Transaction",     "On what date did the fraudulent transaction happen?"),
+         ("amount_lost",        "Amount Lost",             "How much money was debited?"),
+         ("transaction_id",     "Transaction Reference",   "What is the UPI or transaction reference number?"),
+         ("fraud_method",       "How the Fraud Happened",  "How did the fraudster contact you and what did they ask you to do?")],
+    ),
+    "Consumer complaint": (
+        ["defective", "product", "refund", "warranty", "seller", "e-commerce", "not working"],
+        "consumer_complaint",
+        [("product_name",       "Product",           "Which product did you buy and from whom?"),
+         ("purchase_date_price","Purchase Date and Price", "When did you buy it and how much did you pay?"),
+         ("defect_description", "Defect",            "What is wrong with the product?")],
+    ),
+    "Salary / Employment dispute": (
+        ["salary", "wages", "employer", "unpaid", "terminated", "company"],
+        "workplace_complaint",
+        [("designation_joining", "Designation and Joining Date", "What was your designation and when did you join?"),
+         ("unpaid_months",       "Unpaid Period",                "For which months has your salary not been paid?"),
+         ("amount_due",          "Amount Due",                   "What is the total amount due to you?")],
+    ),
+    "Landlord / Tenant dispute": (
+        ["landlord", "tenant", "deposit", "rent", "evict", "lease"],
+        "legal_notice",
+        [("tenancy_period",     "Tenancy Period",     "From when to when did you stay in the rented house?"),
+         ("deposit_amount",     "Deposit Amount",     "How much security deposit did you pay?"),
+         ("vacated_date",       "Date Vacated",       "On what date did you vacate the premises?")],
+    ),
+    "Property dispute": (
+        ["property", "land", "encroach", "boundary", "builder", "plot"],
+        "property_dispute",
+        [("property_details",   "Property Details",  "Please describe the property and how you own it."),
+         ("dispute_nature",     "Nature of Dispute", "What exactly is the dispute about?"),
+         ("dispute_since",      "Dispute Since",     "Since when has this dispute been going on?")],
+    ),
+    "Harassment / Threat": (
+        ["threat", "threaten", "harass", "blackmail", "extort", "intimidat"],
+        "police_complaint_fir",
+        [("threat_dates",       "Dates of Threats",   "On which dates did you receive the threats?"),
+         ("threat_mode",        "Mode of Threat",     "Were the threats by phone, message or in person?"),
+         ("threat_content",     "What Was Said",      "What exactly did the person say or demand?"),
+         ("accused_details",    "Accused Details",    "Do you know who is threatening you?")],
+    ),
+    "Cheating / Fraud": (
+        ["cheat", "cheated", "fraud", "scam", "duped", "fake job"],
+        "police_complaint_fir",
+        [("transaction_details","Money Paid",         "How much did you pay, when, and how?"),
+         ("promise_made",       "Promise Made",       "What did the person promise you in return?"),
+         ("accused_details",    "Accused Details",    "What is the name and contact of the person who cheated you?")],
+    ),
+    "Family / Matrimonial": (
+        ["husband", "wife", "maintenance", "divorce", "dowry", "in-laws"],
+        "family_petition",
+        [("marriage_date",      "Date of Marriage",   "When did you get married?"),
+         ("separation_details", "Separation",         "Since when are you living separately, and why?"),
+         ("relief_sought",      "Relief Sought",      "What are you asking for — maintenance, custody or something else?")],
+    ),
+    "Banking issue": (
+        ["bank", "loan", "emi", "atm", "cheque", "account"],
+        "banking_complaint",
+        [("account_type",       "Account Type",       "What type of account or loan is this about?"),
+         ("issue_description",  "Issue",              "What is the problem with the bank?"),
+         ("complaint_history",  "Earlier Complaints", "Have you already complained to the bank? Give the reference number if any.")],
+    ),
+    "RTI Application": (
+        ["rti", "right to information", "information from", "government office"],
+        "rti_application",
+        [("information_sought", "Information Sought", "What information do you want from the department?"),
+         ("period_covered",     "Period",             "Which period should the information cover?")],
+    ),
+    "Insurance dispute": (
+        ["insurance", "claim", "policy", "premium", "insurer"],
+        "insurance_complaint",
+        [("policy_number",      "Policy Number",      "What is your policy number and type?"),
+         ("claim_details",      "Claim Details",      "When did you file the claim and for how much?"),
+         ("rejection_reason",   "Rejection Reason",   "What reason did the insurer give for rejecting the claim?")],
+    ),
+}
+DEFAULT_CATEGORY = "Other civil complaint"
+DEFAULT_SCRIPT   = (
+    [], "general_petition",
+    [("incident_date_time",   "Date and Time",  "When did this happen?"),
+     ("incident_description", "What Happened",  "Please briefly describe what happened."),
+     ("loss_suffered",        "Loss or Harm",   "What loss or harm have you suffered?")],
+)
+
+REF_PREFIXES = {
+    "police_complaint_fir": "FIR", "cyber_fraud_complaint": "CYB", "consumer_complaint": "CC",
+    "legal_notice": "LN", "workplace_complaint": "WC", "family_petition": "FP",
+    "banking_complaint": "BC", "rti_application": "RTI", "property_dispute": "PD",
+    "insurance_complaint": "IC", "general_petition": "GEN",
+}
+
+SCRIPT_RANGES = [
+    ("ta", 0x0B80, 0x0BFF), ("hi", 0x0900, 0x097F), ("te", 0x0C00, 0x0C7F),
+    ("kn", 0x0C80, 0x0CFF), ("ml", 0x0D00, 0x0D7F), ("bn", 0x0980, 0x09FF),
+    ("gu", 0x0A80, 0x0AFF),
+]
+
+STATES = ["Tamil Nadu", "Karnataka", "Kerala", "Andhra Pradesh", "Telangana",
+          "Maharashtra", "Gujarat", "West Bengal", "Delhi", "Uttar Pradesh"]
+
+FILLER_PREFIXES = re.compile(
+    r"^(my name is|i am|i'm|i live at|my address is|it is|it was|the answer is)\s+",
+    re.IGNORECASE,
+)
+
+
+def classify_text(text: str) -> str:
+    lower = text.lower()
+    for category, (keywords, _, _) in CATEGORY_SCRIPTS.items():
+        if any(k in lower for k in keywords):
+            return category
+    return DEFAULT_CATEGORY
+
+
+def _between(text: str, start: str, end: str = '"') -> str:
+    i = text.find(start)
+    if i < 0:
+        return ""
+    i += len(start)
+    j = text.find(end, i)
+    return text[i:j] if j >= 0 else text[i:]
+
+
+# ============================================================
+# SCRIPTED REPLIES — one per prompt type
+# ============================================================
+
+def _reply_language(prompt: str) -> str:
+    text = _between(prompt, 'Text: "', '"\n') or prompt
+    for ch in text:
+        cp = ord(ch)
+        for code, lo, hi in SCRIPT_RANGES:
+            if lo <= cp <= hi:
+                return code
+    return "en"
+
+
+def _reply_classification(prompt: str) -> str:
+    message  = _between(prompt, 'USER MESSAGE: "', '"\n')
+    category = classify_text(message)
+    _, _, plan = CATEGORY_SCRIPTS.get(category, DEFAULT_SCRIPT)
+    return json.dumps({
+        "category": category,
+        "policy_action": "allow",
+        "policy_message": "",
+        "initial_facts": {},
+        "interview_plan": [{"key": k, "label": l, "question": q} for k, l, q in plan],
+    })
+
+
+def _reply_extraction(prompt: str) -> str:
+    key    = _between(prompt, 'Question: "')
+    answer = _between(prompt, 'User replied: "', '"\n').strip()
+    answer = FILLER_PREFIXES.sub("", answer).strip().rstrip(".")
+    if answer.lower() in {"no", "none", "don't know", "dont know", "nothing"}:
+        answer = "Not available"
+    reply = {"extracted": {key: answer}}
+    if '"address": {' in prompt:
+        reply["address"] = json.loads(_reply_address_parse(f'address: "{answer}"'))
+    if '"next_question_translated"' in prompt:
+        lang = _between(prompt, "Translate this text into language code: ", "\n").strip()
+        reply["next_question_translated"] = f"[{lang}] " + _between(prompt, 'TEXT: "', '"\n- RESPONSE')
+    return json.dumps(reply, ensure_ascii=False)
+
+
+def _reply_address_parse(prompt: str) -> str:
+    addr    = _between(prompt, 'address: "')
+    pincode = (re.search(r"\b\d{6}\b", addr) or [""])[0]
+    state   = next((s for s in STATES if s.lower() in addr.lower()), "")
+    parts   = [p.strip() for p in re.sub(r"\b\d{6}\b", "", addr).split(",") if p.strip()]
+    parts   = [p for p in parts if p != state and not p.isdigit()]
+    return json.dumps({"district": parts[-1] if parts else "", "state": state, "pincode": pincode},
+                      ensure_ascii=False)
+
+
+def _reply_confirmation(prompt: str) -> str:
+    items = _between(prompt, "before the colon):\n\n", "\n\n4.").strip() or "(No details collected yet.)"
+    return ("Thank you for providing all the details.\n"
+            "Please review the information below. If everything is correct, reply YES to generate your document.\n\n"
+            f"{items}\n\n"
+            "If anything needs to be changed, please let me know what to correct.")
+
+
+def _reply_translation(prompt: str) -> str:
+    lang = _between(prompt, "language code: ", "\n").strip()
+    text = _between(prompt, 'TEXT: "', '"\n\nRULES')
+    return f"[{lang}] {text}"
+
+
+def _reply_next_steps(prompt: str) -> str:
+    category = _between(prompt, "Category: ", "\n").strip() or DEFAULT_CATEGORY
+    return json.dumps([
+        f"Submit the signed {category.lower()} document to the concerned office and collect an acknowledgement.",
+        "Keep copies of all evidence listed in the document in a safe place.",
+        "Call the National Legal Services Authority helpline 15100 for free legal aid if needed.",
+    ])
+
+
+def _reply_doc_classification(prompt: str) -> str:
+    issue    = _between(prompt, "LEGAL ISSUE: ", "\n")
+    category = issue.split(" — ", 1)[0].strip()
+    if category not in CATEGORY_SCRIPTS:
+        category = classify_text(issue)
+    _, doc_type, _ = CATEGORY_SCRIPTS.get(category, DEFAULT_SCRIPT)
+    other_party = _between(prompt, "Other Party Name: ", "\n").strip()
+    return json.dumps({
+        "doc_type":             doc_type,
+        "authority":            "" if other_party else "The Station House Officer",
+        "other_party":          other_party,
+        "other_party_location": "",
+        "ref_prefix":           REF_PREFIXES.get(doc_type, "SV"),
+        "reasoning":            f"stub classification for {category}",
+    }, ensure_ascii=False)
+
+
+def _reply_subject(prompt: str) -> str:
+    issue    = _between(prompt, "Legal issue: ", "\n")
+    category = issue.split(" — ", 1)[0].strip() or "the matter"
+    return json.dumps({"subject": f"Complaint regarding {category} and request for action"})
+
+
+def _reply_body(prompt: str) -> str:
+    evidence = _between(prompt, 'Evidence from facts: "').strip()
+    items    = [e.strip() for e in re.split(r"[|,;]", evidence) if e.strip()]
+    docs     = "\n".join(f"{i}. {e}" for i, e in enumerate(items, 1)) or \
+               "1. Relevant documents and evidence will be submitted upon request."
+    return ("I am writing to bring the following incident to your notice. "
+            "The facts are as stated in the details provided below.\n\n"
+            "As a result I have suffered financial loss and mental distress. "
+            "The other party is responsible for this loss.\n\n"
+            "I request that appropriate action be taken within 15 days. "
+            "Kindly acknowledge receipt of this letter.\n\n"
+            "---DOCUMENTS---\n" + docs)
+
+
+def _reply_readiness(prompt: str) -> str:
+    facts = re.findall(r"^  [^:\n]+: .+$", prompt, re.MULTILINE)
+    return str(min(95, 30 + 8 * len(facts)))
+
+
+def _reply_entity_translation(prompt: str) -> str:
+    return _between(prompt, "Text: ", "\n").strip()
+
+
+def _reply_fact_translation(prompt: str) -> str:
+    return prompt.split("Details: ", 1)[-1].strip()
+
+
+SCRIPTED_REPLIES = {
+    "language":           _reply_language,
+    "classification":     _reply_classification,
+    "extraction":         _reply_extraction,
+    "address_parse":      _reply_address_parse,
+    "confirmation":       _reply_confirmation,
+    "translation":        _reply_translation,
+    "next_steps":         _reply_next_steps,
+    "doc_classification": _reply_doc_classification,
+    "subject":            _reply_subject,
+    "body":               _reply_body,
+    "readiness":          _reply_readiness,
+    "entity_translation": _reply_entity_translation,
+    "fact_translation":   _reply_fact_translation,
+}
+
+
+def load_fixtures(path: str) -> Dict[str, List[str]]:
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    fixtures = {}
+    for prompt_type, value in raw.items():
+        values = value if isinstance(value, list) else [value]
+        fixtures[prompt_type] = [v if isinstance(v, str) else json.dumps(v, ensure_ascii=False)
+                                 for v in values]
+    return fixtures
+
+
+# ============================================================
+# CHAT MODEL
+# ============================================================
+
+class StubChatModel(BaseChatModel):
+    model_name:  str   = "stub-legal-v1"
+    temperature: float = 0.0
+    latency_ms:  float = 0.0
+    jitter_ms:   float = 0.0
+    seed:        int   = 0
+    fixtures:    Dict[str, List[str]] = {}
+
+    _replay: Dict[str, Any] = PrivateAttr(default_factory=dict)
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name, "temperature": self.temperature}
+
+    def reply_for(self, messages: List[BaseMessage]) -> str:
+        prompt_type = infer_prompt_type(messages)
+        if prompt_type in self.fixtures:
+            if prompt_type not in self._replay:
+                self._replay[prompt_type] = itertools.cycle(self.fixtures[prompt_type])
+            return next(self._replay[prompt_type])
+        prompt = "\n".join(str(m.content) for m in messages)
+        scripted = SCRIPTED_REPLIES.get(prompt_type)
+        return scripted(prompt) if scripted else "OK"
+
+    def _delay_s(self, messages: List[BaseMessage]) -> float:
+        if not self.latency_ms and not self.jitter_ms:
+            return 0.0
+        digest = hashlib.sha256("".join(str(m.content) for m in messages).encode()).digest()
+        rng    = random.Random(self.seed ^ int.from_bytes(digest[:8], "big"))
+        return max(0.0, self.latency_ms + rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+
+    @staticmethod
+    def _usage(messages: List[BaseMessage], content: str) -> Dict[str, int]:
+        prompt     = sum(len(str(m.content).split()) for m in messages)
+        completion = len(content.split())
+        return {"input_tokens": prompt, "output_tokens": completion, "total_tokens": prompt + completion}
+
+    def _result(self, messages: List[BaseMessage], content: str) -> ChatResult:
+        message = AIMessage(content=content, usage_metadata=self._usage(messages, content))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self._delay_s(messages))
+        return self._result(messages, self.reply_for(messages))
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self._delay_s(messages))
+        return self._result(messages, self.reply_for(messages))
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        delay  = self._delay_s(messages)
+        reply  = self.reply_for(messages)
+        chunks = re.findall(r"\S+\s*|\s+", reply) or [""]
+        await asyncio.sleep(delay * 0.2)
+        for i, text in enumerate(chunks):
+            if i:
+                await asyncio.sleep(delay * 0.8 / len(chunks))
+            usage = self._usage(messages, reply) if i == len(chunks) - 1 else None
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text, usage_metadata=usage))
+            if run_manager:
+                await run_manager.on_llm_new_token(text, chunk=chunk)
+            yield chunk
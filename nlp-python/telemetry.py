@@ -0,0 +1,275 @@
+"""
+telemetry.py — Prometheus metrics and optional OpenTelemetry spans.
+
+Every graph node (instrument_node) and every call through the shared LLM
+handle (observe_llm_call, used by llm_provider.LazyLLM) is timed and counted;
+LLM metrics are labelled with the prompt type (see prompt_types.py), so the
+extraction, translation and eight document-pipeline prompts show up
+separately. Places that swallow an LLM or parse error and carry on with a
+default call record_fallback(site).
+
+  legal_node_duration_seconds{node}                      histogram
+  legal_node_errors_total{node}                          counter
+  legal_llm_call_duration_seconds{prompt_type}           histogram (cache hits included)
+  legal_llm_time_to_first_token_seconds{prompt_type}     histogram (streamed calls)
+  legal_llm_calls_total{prompt_type, outcome}            counter, outcome = ok | error
+  legal_llm_errors_total{prompt_type, error}             counter, error = exception class
+  legal_llm_tokens_total{prompt_type, kind}              counter, kind = prompt | completion
+  legal_llm_cache_lookups_total{prompt_type, outcome}    counter, memory_hits | sqlite_hits | misses
+  legal_llm_json_replies_total{prompt_type, outcome}     counter, clean | repaired | salvaged | reasked | failed
+  legal_fallbacks_total{site}                            counter
+  legal_document_step_duration_seconds{step}             histogram, document pipeline steps (bilingual_generator.py)
+  legal_language_detections_total{language, method}      counter, method = script | keywords | llm | default
+  legal_language_detect_confidence{method}               histogram of the local detector's confidence
+
+Postgres pool gauges (pg_pool.pool_stats), labelled pool = checkpoints |
+thread_locks, summed over live workers; the cumulative ones count since the
+worker started:
+
+  legal_pg_pool_size{pool}                               open connections
+  legal_pg_pool_max_size{pool}                           PG_POOL_MAX_SIZE / PG_LOCK_POOL_MAX_SIZE
+  legal_pg_pool_in_use{pool}                             connections checked out
+  legal_pg_pool_requests_waiting{pool}                   checkouts queued right now
+  legal_pg_pool_checkouts{pool}                          checkouts (cumulative)
+  legal_pg_pool_checkout_wait_seconds{pool}              time queued checkouts waited (cumulative)
+  legal_pg_pool_checkout_failures{pool}                  checkouts that timed out or failed (cumulative)
+  legal_pg_pool_connect_failures{pool}                   failed connection attempts (cumulative)
+
+They are read from the pools when /metrics is scraped (on_scrape) and after
+every turn.
+
+metrics_payload() renders them for GET /metrics. With several worker
+processes, set PROMETHEUS_MULTIPROC_DIR to a shared empty directory so the
+endpoint aggregates all workers.
+
+Tracing is off unless OTEL_EXPORTER_OTLP_ENDPOINT is set (e.g.
+http://localhost:4318 for a local collector); it then needs
+opentelemetry-sdk and opentelemetry-exporter-otlp-proto-http installed.
+Node spans are the parents of the LLM spans made inside them.
+OTEL_SERVICE_NAME names the service (default legal-ai-langgraph).
+"""
+
+import os
+import time
+import functools
+from contextlib import contextmanager, nullcontext
+
+from prometheus_client import (CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram,
+                               REGISTRY, generate_latest)
+
+
+OTEL_EXPORTER_OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "").strip()
+OTEL_SERVICE_NAME           = os.getenv("OTEL_SERVICE_NAME", "legal-ai-langgraph")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+# ============================================================
+# PROMETHEUS METRICS
+# ============================================================
+
+NODE_DURATION = Histogram("legal_node_duration_seconds", "Graph node wall time",
+                          ["node"], buckets=LATENCY_BUCKETS)
+NODE_ERRORS   = Counter("legal_node_errors_total", "Graph node runs that raised", ["node"])
+
+LLM_DURATION  = Histogram("legal_llm_call_duration_seconds", "LLM call wall time",
+                          ["prompt_type"], buckets=LATENCY_BUCKETS)
+LLM_FIRST_TOKEN = Histogram("legal_llm_time_to_first_token_seconds",
+                            "Time to the first chunk of a streamed LLM call",
+                            ["prompt_type"], buckets=LATENCY_BUCKETS)
+LLM_CALLS     = Counter("legal_llm_calls_total", "LLM calls", ["prompt_type", "outcome"])
+LLM_ERRORS    = Counter("legal_llm_errors_total", "LLM calls that raised", ["prompt_type", "error"])
+LLM_TOKENS    = Counter("legal_llm_tokens_total", "Tokens reported by the provider",
+                        ["prompt_type", "kind"])
+LLM_CACHE_LOOKUPS = Counter("legal_llm_cache_lookups_total", "LLM response cache lookups",
+                            ["prompt_type", "outcome"])
+LLM_JSON_REPLIES = Counter("legal_llm_json_replies_total",
+                           "Structured LLM replies by how they were made usable (see llm_json.py)",
+                           ["prompt_type", "outcome"])
+FALLBACKS     = Counter("legal_fallbacks_total",
+                        "Times a default was used because an LLM call or its parsing failed",
+                        ["site"])
+DOC_STEP_DURATION = Histogram("legal_document_step_duration_seconds",
+                              "Document pipeline step wall time, dependency waits excluded",
+                              ["step"], buckets=LATENCY_BUCKETS)
+LANG_DETECTIONS = Counter("legal_language_detections_total", "Conversation languages detected",
+                          ["language", "method"])
+LANG_DETECT_CONFIDENCE = Histogram("legal_language_detect_confidence",
+                                   "Local language detector confidence, by the method finally used",
+                                   ["method"], buckets=(0.2, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0))
+
+
+# pool_stats() key → gauge; multiprocess_mode only matters with PROMETHEUS_MULTIPROC_DIR.
+PG_POOL_GAUGES = {
+    key: Gauge(f"legal_pg_pool_{name}", doc, ["pool"], multiprocess_mode="livesum")
+    for key, name, doc in [
+        ("size",              "size",                  "Open connections"),
+        ("max_size",          "max_size",              "Connection limit"),
+        ("in_use",            "in_use",                "Connections checked out"),
+        ("requests_waiting",  "requests_waiting",      "Checkouts waiting for a connection"),
+        ("checkouts",         "checkouts",             "Checkouts since the worker started"),
+        ("checkout_wait_ms",  "checkout_wait_seconds", "Total time queued checkouts waited"),
+        ("checkout_failures", "checkout_failures",     "Checkouts that timed out or failed"),
+        ("connect_failures",  "connect_failures",      "Failed connection attempts"),
+    ]
+}
+
+_scrape_hooks = []
+
+
+def on_scrape(fn) -> None:
+    """Call fn() before each /metrics render, to refresh gauges read from elsewhere."""
+    _scrape_hooks.append(fn)
+
+
+def record_pool_stats(pool: str, stats: dict) -> None:
+    for key, gauge in PG_POOL_GAUGES.items():
+        value = stats.get(key, 0)
+        gauge.labels(pool=pool).set(value / 1000 if key.endswith("_ms") else value)
+
+
+def record_fallback(site: str) -> None:
+    FALLBACKS.labels(site=site).inc()
+
+
+def record_document_steps(timings_ms: dict) -> None:
+    for step, ms in timings_ms.items():
+        DOC_STEP_DURATION.labels(step=step).observe(ms / 1000)
+
+
+def record_language_detection(language: str, method: str, confidence: float) -> None:
+    LANG_DETECTIONS.labels(language=language, method=method).inc()
+    LANG_DETECT_CONFIDENCE.labels(method=method).observe(confidence)
+
+
+def record_cache_lookup(prompt_type: str, outcome: str) -> None:
+    LLM_CACHE_LOOKUPS.labels(prompt_type=prompt_type, outcome=outcome).inc()
+
+
+def record_json_reply(prompt_type: str, outcome: str) -> None:
+    LLM_JSON_REPLIES.labels(prompt_type=prompt_type, outcome=outcome).inc()
+
+
+def metrics_payload():
+    """(body, content type) for the /metrics endpoint."""
+    for hook in _scrape_hooks:
+        try:
+            hook()
+        except Exception as e:
+            print(f"[telemetry] scrape hook {getattr(hook, '__name__', hook)} failed: {e}")
+    registry = REGISTRY
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+# ============================================================
+# OPENTELEMETRY (optional)
+# ============================================================
+
+def _init_tracer():
+    if not OTEL_EXPORTER_OTLP_ENDPOINT:
+        return None
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    except ImportError as e:
+        print(f"[telemetry] WARNING: OTEL_EXPORTER_OTLP_ENDPOINT is set but tracing is disabled ({e}); "
+              f"pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http")
+        return None
+
+    # The exporter reads OTEL_EXPORTER_OTLP_ENDPOINT / _HEADERS itself.
+    provider = TracerProvider(resource=Resource.create({"service.name": OTEL_SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    print(f"[telemetry] exporting spans to {OTEL_EXPORTER_OTLP_ENDPOINT} as {OTEL_SERVICE_NAME}")
+    return trace.get_tracer("legal-ai-langgraph")
+
+
+_tracer = _init_tracer()
+
+
+def _span(name: str, **attributes):
+    if _tracer is None:
+        return nullcontext()
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+
+# ============================================================
+# INSTRUMENTATION
+# ============================================================
+
+def instrument_node(name: str, fn):
+    """Wrap an async graph node with timing, an error counter and a span.
+
+    functools.wraps keeps the node's signature visible to LangGraph, which
+    passes `config` only to nodes that declare it.
+    """
+    duration, errors = NODE_DURATION.labels(node=name), NODE_ERRORS.labels(node=name)
+
+    @functools.wraps(fn)
+    async def wrapped(*args, **kwargs):
+        start = time.perf_counter()
+        with _span(f"node {name}", **{"langgraph.node": name}):
+            try:
+                return await fn(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                duration.observe(time.perf_counter() - start)
+    return wrapped
+
+
+class LLMCall:
+    """Handle yielded by observe_llm_call; feed it the response or stream chunks."""
+
+    def __init__(self, prompt_type: str):
+        self.prompt_type       = prompt_type
+        self.start             = time.perf_counter()
+        self.first_token       = None
+        self.prompt_tokens     = 0
+        self.completion_tokens = 0
+
+    def _usage(self, message) -> None:
+        usage = getattr(message, "usage_metadata", None) or {}
+        self.prompt_tokens     += usage.get("input_tokens", 0) or 0
+        self.completion_tokens += usage.get("output_tokens", 0) or 0
+
+    def response(self, message) -> None:
+        self._usage(message)
+
+    def chunk(self, chunk) -> None:
+        if self.first_token is None:
+            self.first_token = time.perf_counter() - self.start
+        self._usage(chunk)
+
+
+@contextmanager
+def observe_llm_call(prompt_type: str):
+    with _span(f"llm {prompt_type}", **{"llm.prompt_type": prompt_type}) as span:
+        call = LLMCall(prompt_type)
+        try:
+            yield call
+        except Exception as e:
+            LLM_CALLS.labels(prompt_type=prompt_type, outcome="error").inc()
+            LLM_ERRORS.labels(prompt_type=prompt_type, error=type(e).__name__).inc()
+            raise
+        else:
+            LLM_CALLS.labels(prompt_type=prompt_type, outcome="ok").inc()
+        finally:
+            LLM_DURATION.labels(prompt_type=prompt_type).observe(time.perf_counter() - call.start)
+            if call.first_token is not None:
+                LLM_FIRST_TOKEN.labels(prompt_type=prompt_type).observe(call.first_token)
+            if call.prompt_tokens:
+                LLM_TOKENS.labels(prompt_type=prompt_type, kind="prompt").inc(call.prompt_tokens)
+            if call.completion_tokens:
+                LLM_TOKENS.labels(prompt_type=prompt_type, kind="completion").inc(call.completion_tokens)
+            if span is not None:
+                span.set_attribute("gen_ai.usage.input_tokens", call.prompt_tokens)
+                span.set_attribute("gen_ai.usage.output_tokens", call.completion_tokens)
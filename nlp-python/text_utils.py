@@ -0,0 +1,259 @@
+"""
+text_utils.py — Shared text helpers with patterns compiled once at import.
+
+  strip_markdown / parse_llm_json   cleanup of LLM replies (graph.py, bilingual_generator.py)
+  extract_json / repair_json        first complete JSON value in a reply, fixing common defects
+  redact_phone_numbers              phone numbers leaked into a letter body
+  KeywordMatcher                    which keywords of a fixed list occur in a text
+  parse_prefill / is_phone_number   fields injected by the Java backend, phone answers
+
+KeywordMatcher holds a fixed keyword list with the semantics of
+`keyword in text` (substring, so "hit" matches "hitting"). It checks each
+keyword with str's substring search, which runs in C. For a few dozen
+keywords over a few hundred characters of facts, that is faster than a
+single pass with a pure-Python Aho–Corasick automaton or with one combined
+regex, which pay interpreter or regex-engine overhead per character. This
+also holds for the statute index in statutes.py, which matches the same way
+(benchmarks/bench_text_utils.py and bench_statutes.py compare them).
+
+extract_json takes the first complete JSON object (or array) in a reply and
+ignores whatever follows it, instead of regex-matching from the first "{" to
+the last "}" (which breaks on a second object or a stray brace in trailing
+prose). Well-formed JSON goes through json's C decoder; only when that fails
+does repair_json rewrite the candidate in one pass: single or curly quotes,
+unquoted keys, Python literals, trailing commas, // comments, and a reply cut
+off mid-object (open strings and brackets are closed, a dangling key is
+dropped). Schema checks and re-asks on top of this live in llm_json.py.
+"""
+
+import re
+import json
+from typing import Any, Dict, Iterable, List, Mapping, Set, Tuple, Union
+
+
+# ============================================================
+# LLM REPLY CLEANUP
+# ============================================================
+
+_MD_BOLD       = re.compile(r'\*\*(.+?)\*\*')
+_MD_UNDERLINE  = re.compile(r'__(.+?)__')
+_MD_HEADING    = re.compile(r'#{1,6}\s+')
+_MD_HASHES     = re.compile(r'#{1,6}\s*')
+_FENCE_OPEN    = re.compile(r'^```(?:json)?\s*', re.MULTILINE)
+_FENCE_CLOSE   = re.compile(r'\s*```\s*$', re.MULTILINE)
+
+# Indian mobile numbers (optionally +91) and STD-code landlines.
+_PHONE_MOBILE   = re.compile(r'\b(?:\+91[\s\-]?)?[6-9]\d{9}\b')
+_PHONE_LANDLINE = re.compile(r'\b0\d{2,4}[\s\-]?\d{6,8}\b')
+
+# key=value or key="multi word value" in a __PREFILL__ header; a phone answer.
+_PREFILL_FIELD  = re.compile(r'(\w+)=([^"\s]+|"[^"]+")')
+_PHONE_ANSWER   = re.compile(r'\d{10}')
+
+
+def strip_markdown(text: str, all_hashes: bool = False) -> str:
+    """Drop bold/underline markers, heading hashes and code fences.
+
+    all_hashes also removes '#' runs not followed by whitespace, as the
+    document pipeline always has; chat replies keep them ("Flat #4")."""
+    text = _MD_BOLD.sub(r'\1', text)
+    text = _MD_UNDERLINE.sub(r'\1', text)
+    text = (_MD_HASHES if all_hashes else _MD_HEADING).sub('', text)
+    return text.replace("```", "").strip()
+
+
+def strip_code_fences(raw: str) -> str:
+    raw = raw.strip()
+    raw = _FENCE_OPEN.sub('', raw)
+    return _FENCE_CLOSE.sub('', raw)
+
+
+def parse_llm_json(raw: str) -> dict:
+    """Parse the JSON object in an LLM reply, ignoring fences and surrounding prose."""
+    return extract_json(raw)[0]
+
+
+def redact_phone_numbers(text: str, replacement: str = "[number redacted]") -> str:
+    text = _PHONE_MOBILE.sub(replacement, text)
+    return _PHONE_LANDLINE.sub(replacement, text)
+
+
+def parse_prefill(header: str) -> List[Tuple[str, str]]:
+    """(key, value) pairs of a __PREFILL__ header, quotes removed."""
+    return [(k, v.strip('"')) for k, v in _PREFILL_FIELD.findall(header)]
+
+
+def is_phone_number(value: str) -> bool:
+    """True for exactly ten digits, the form the interview accepts."""
+    return _PHONE_ANSWER.fullmatch(value) is not None
+
+
+# ============================================================
+# JSON EXTRACTION AND REPAIR
+# ============================================================
+
+_JSON_DECODER  = json.JSONDecoder(strict=False)     # strict=False: raw newlines inside strings
+_JSON_NUMBER   = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?')
+_BAREWORD      = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+_BARE_LITERALS = {"true": "true", "false": "false", "null": "null",
+                  "True": "true", "False": "false", "None": "null"}
+_STRING_QUOTES = {'"': '"', "'": "'", "\u201c": "\u201d", "\u2018": "\u2019"}   # opener -> closer
+_MAX_CANDIDATES = 3
+
+
+def _read_string(text: str, i: int, out: List[str]) -> int:
+    """Copy the string opening at text[i] to out as a double-quoted JSON string.
+
+    Returns the index after the closing quote (len(text) if it never closes)."""
+    close, j, n = _STRING_QUOTES[text[i]], i + 1, len(text)
+    buf = ['"']
+    while j < n:
+        c = text[j]
+        if c == close:
+            break
+        if c == "\\" and j + 1 < n:
+            buf.append("'" if text[j + 1] == "'" else text[j:j + 2])      # \' is not valid JSON
+            j += 2
+            continue
+        buf.append('\\"' if c == '"' else c)
+        j += 1
+    buf.append('"')
+    out.append("".join(buf))
+    return j + 1
+
+
+def _drop_trailing_comma(out: List[str]) -> None:
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+
+def _drop_dangling(out: List[str], stack: List[str]) -> None:
+    """Before closing a truncated reply: drop a trailing comma, `"key":` or bare key."""
+    _drop_trailing_comma(out)
+    if out and out[-1] == ":":
+        out.pop()
+        while out and out[-1].isspace():
+            out.pop()
+        if out and out[-1].startswith('"'):
+            out.pop()
+    elif stack and stack[-1] == "}" and out and out[-1].startswith('"'):
+        prev = next((t for t in reversed(out[:-1]) if not t.isspace()), "")
+        if prev in ("{", ","):
+            out.pop()
+    _drop_trailing_comma(out)
+
+
+def repair_json(text: str) -> str:
+    """Rewrite the JSON value starting at text[0] into valid JSON, as far as possible.
+
+    Stops at the bracket that closes the first value; anything after it is
+    ignored. Closing brackets are taken from the nesting, so a mismatched
+    "]" for "}" is corrected too.
+    """
+    out: List[str]   = []
+    stack: List[str] = []
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i]
+        if ch in _STRING_QUOTES:
+            i = _read_string(text, i, out)
+            continue
+        if ch == "{" or ch == "[":
+            stack.append("}" if ch == "{" else "]")
+            out.append(ch)
+        elif ch == "}" or ch == "]":
+            _drop_trailing_comma(out)
+            if stack:
+                out.append(stack.pop())
+            if not stack:
+                break
+        elif ch == "-" or ch.isdigit():
+            m = _JSON_NUMBER.match(text, i)
+            if m:
+                out.append(m.group(0))
+                i = m.end()
+                continue
+            out.append(ch)
+        elif ch.isascii() and (ch.isalpha() or ch == "_"):
+            word = _BAREWORD.match(text, i).group(0)
+            out.append(_BARE_LITERALS.get(word) or json.dumps(word))
+            i += len(word)
+            continue
+        elif ch == "/" and text.startswith("//", i):
+            nl = text.find("\n", i)
+            i  = n if nl < 0 else nl
+            continue
+        else:
+            out.append(ch)
+        i += 1
+
+    if stack:                                    # reply was cut off mid-value
+        _drop_dangling(out, stack)
+        while stack:
+            out.append(stack.pop())
+    return "".join(out)
+
+
+def extract_json(raw: str, array: bool = False) -> Tuple[Any, bool]:
+    """The first complete JSON object (or array) in an LLM reply, and whether it needed repair.
+
+    Raises ValueError if no candidate parses even after repair_json."""
+    opener, kind = ("[", list) if array else ("{", dict)
+    raw   = strip_code_fences(raw)
+    pos   = raw.find(opener)
+    error = None
+    for _ in range(_MAX_CANDIDATES):
+        if pos < 0:
+            break
+        try:
+            value, _end = _JSON_DECODER.raw_decode(raw, pos)
+            if isinstance(value, kind):
+                return value, False
+        except ValueError as e:
+            error = e
+        try:
+            value = _JSON_DECODER.decode(repair_json(raw[pos:]))
+            if isinstance(value, kind):
+                return value, True
+        except ValueError as e:
+            error = error or e
+        pos = raw.find(opener, pos + 1)
+    raise ValueError(f"no JSON {kind.__name__} in reply" + (f" ({error})" if error else ""))
+
+
+# ============================================================
+# MULTI-KEYWORD MATCHING
+# ============================================================
+
+class KeywordMatcher:
+    """Which of a fixed set of keywords occur in a text, as substrings.
+
+    Built from a list of keywords, or from {label: [keywords]} to get back
+    the labels whose keywords occur. Matching is case-insensitive; the text
+    is lowercased once per call rather than once per keyword.
+    """
+
+    def __init__(self, keywords: Union[Iterable[str], Mapping[str, Iterable[str]]]):
+        if isinstance(keywords, Mapping):
+            self.by_label: Dict[str, Tuple[str, ...]] = {
+                label: tuple(k.lower() for k in kws) for label, kws in keywords.items()}
+        else:
+            self.by_label = {k.lower(): (k.lower(),) for k in keywords}
+        self.keywords = tuple(dict.fromkeys(k for kws in self.by_label.values() for k in kws))
+
+    def findall(self, text: str) -> Set[str]:
+        """Every keyword that occurs in text."""
+        text = text.lower()
+        return {k for k in self.keywords if k in text}
+
+    def groups(self, text: str) -> Set[str]:
+        """Labels with at least one keyword in text."""
+        text = text.lower()
+        return {label for label, kws in self.by_label.items() if any(k in text for k in kws)}
+
+    def search(self, text: str) -> bool:
+        """True if any keyword occurs in text (stops at the first)."""
+        text = text.lower()
+        return any(k in text for k in self.keywords)
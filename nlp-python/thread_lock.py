@@ -0,0 +1,159 @@
+"""
+thread_lock.py — Serialises concurrent turns of the same conversation.
+
+Two requests for one thread_id that run at the same time would both read the
+same checkpoint and write diverging interview_plan / answered_keys. Every turn
+therefore holds a per-thread lock from the moment it reads state until its
+checkpoint is written:
+
+  LocalThreadLocks     asyncio locks — enough when one process serves everything
+  PostgresThreadLocks  the local lock plus a transaction-scoped Postgres advisory
+                       lock, so turns are serialised across worker processes and
+                       hosts. The lock is released when the transaction ends,
+                       including when the worker dies mid-turn.
+
+The advisory lock lives in a transaction on a connection from its own pool
+(pg_pool.lock_pool_settings), held for the whole turn including the LLM calls.
+Were it taken from the checkpoint pool, PG_POOL_MAX_SIZE turns in flight would
+hold every connection while their checkpoint reads and writes wait for one.
+
+The Postgres variant also reports the thread's latest checkpoint id at lock
+time, which lets a worker tell whether its cached view of the thread is still
+current or another worker has moved it on.
+
+  THREAD_LOCK            auto (default: postgres when the Postgres checkpointer is
+                         active, else local) | local | postgres
+  THREAD_LOCK_TIMEOUT_S  seconds to wait for a busy thread before giving up (default 120)
+"""
+
+import os
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+
+THREAD_LOCK           = os.getenv("THREAD_LOCK", "auto").strip().lower()
+THREAD_LOCK_TIMEOUT_S = float(os.getenv("THREAD_LOCK_TIMEOUT_S", "120"))
+
+if THREAD_LOCK not in {"auto", "local", "postgres"}:
+    raise ValueError(f"Unknown THREAD_LOCK '{THREAD_LOCK}'. Available: auto, local, postgres")
+
+LATEST_CHECKPOINT_SQL = (
+    "SELECT checkpoint_id FROM checkpoints "
+    "WHERE thread_id = %s AND checkpoint_ns = '' ORDER BY checkpoint_id DESC LIMIT 1"
+)
+
+
+class ThreadBusy(Exception):
+    """Another turn for this thread did not finish within THREAD_LOCK_TIMEOUT_S."""
+
+
+def advisory_key(thread_id: str) -> int:
+    """Stable signed 64-bit key for pg_advisory_xact_lock."""
+    digest = hashlib.blake2b(thread_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class TurnGuard:
+    """Handed to the caller while the lock is held.
+
+    versioned is False for local locks: the caller's own cache is then the
+    only writer and always current.
+    """
+
+    versioned = False
+
+    def __init__(self, checkpoint_id: Optional[str] = None):
+        self.checkpoint_id = checkpoint_id
+
+    async def refresh(self) -> Optional[str]:
+        return self.checkpoint_id
+
+
+class LocalThreadLocks:
+    versioned = False
+
+    def __init__(self, timeout: float = THREAD_LOCK_TIMEOUT_S):
+        self.timeout = timeout
+        self._locks: Dict[str, List] = {}      # thread_id -> [lock, holders + waiters]
+
+    @asynccontextmanager
+    async def _local(self, thread_id: str):
+        entry = self._locks.setdefault(thread_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            try:
+                await asyncio.wait_for(entry[0].acquire(), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                raise ThreadBusy(thread_id) from None
+            try:
+                yield
+            finally:
+                entry[0].release()
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[thread_id]
+
+    @asynccontextmanager
+    async def hold(self, thread_id: str):
+        async with self._local(thread_id):
+            yield TurnGuard()
+
+    def stats(self) -> dict:
+        return {"backend": "local", "threads_locked": len(self._locks)}
+
+
+class _PostgresTurnGuard(TurnGuard):
+    versioned = True
+
+    def __init__(self, conn, thread_id: str, checkpoint_id: Optional[str]):
+        super().__init__(checkpoint_id)
+        self._conn      = conn
+        self._thread_id = thread_id
+
+    async def refresh(self) -> Optional[str]:
+        cur = await self._conn.execute(LATEST_CHECKPOINT_SQL, (self._thread_id,))
+        row = await cur.fetchone()
+        self.checkpoint_id = row[0] if row else None
+        return self.checkpoint_id
+
+
+class PostgresThreadLocks(LocalThreadLocks):
+    versioned = True
+
+    def __init__(self, lock_pool, checkpoint_pool, timeout: float = THREAD_LOCK_TIMEOUT_S):
+        super().__init__(timeout)
+        self._pool            = lock_pool
+        self._checkpoint_pool = checkpoint_pool
+
+    async def latest_checkpoint_id(self, thread_id: str) -> Optional[str]:
+        """Current checkpoint id of the thread, without taking the lock."""
+        async with self._checkpoint_pool.connection() as conn:
+            cur = await conn.execute(LATEST_CHECKPOINT_SQL, (thread_id,))
+            row = await cur.fetchone()
+        return row[0] if row else None
+
+    @asynccontextmanager
+    async def hold(self, thread_id: str):
+        # Waiters in this process queue on the local lock, so a busy thread ties
+        # up at most one lock connection per worker.
+        async with self._local(thread_id):
+            async with self._pool.connection(timeout=self.timeout) as conn:
+                async with conn.transaction():
+                    await conn.execute(f"SET LOCAL lock_timeout = '{int(self.timeout * 1000)}ms'")
+                    try:
+                        await conn.execute("SELECT pg_advisory_xact_lock(%s)", (advisory_key(thread_id),))
+                    except Exception as e:
+                        if getattr(e, "sqlstate", "") == "55P03":    # lock_not_available
+                            raise ThreadBusy(thread_id) from None
+                        raise
+                    guard = _PostgresTurnGuard(conn, thread_id, None)
+                    await guard.refresh()
+                    yield guard
+
+    def stats(self) -> dict:
+        from pg_pool import pool_stats
+
+        return {"backend": "postgres", "threads_locked": len(self._locks), "pool": pool_stats(self._pool)}